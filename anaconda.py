@@ -96,6 +96,9 @@ def exitHandler(rebootData, storage):
 
     anaconda.dbus_launcher.stop()
 
+    # Write all queued log records before the system goes down.
+    anaconda_logging.logger.stop_writer()
+
     if conf.system.can_reboot:
         from pykickstart.constants import KS_SHUTDOWN, KS_WAIT
 
@@ -285,7 +288,8 @@ if __name__ == "__main__":
     # Set up logging as early as possible.
     from pyanaconda import anaconda_logging
     from pyanaconda import anaconda_loggers
-    anaconda_logging.init(write_to_journal=conf.target.is_hardware)
+    anaconda_logging.init(write_to_journal=conf.target.is_hardware,
+                          asynchronous=conf.anaconda.async_logging)
     anaconda_logging.logger.setupVirtio(opts.virtiolog)
 
     # Load the product configuration after a logging is set up.
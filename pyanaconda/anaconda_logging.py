@@ -19,11 +19,15 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
+import atexit
 import logging
-from logging.handlers import SysLogHandler, SocketHandler
+from logging.handlers import SysLogHandler, SocketHandler, QueueHandler
 from systemd.journal import JournalHandler
 import os
+import queue
 import sys
+import threading
+import time
 import warnings
 
 from pyanaconda.core import constants
@@ -45,6 +49,12 @@ SENSITIVE_INFO_LOG_FILE = "/tmp/sensitive-info.log"
 ANACONDA_SYSLOG_FACILITY = SysLogHandler.LOG_LOCAL1
 ANACONDA_SYSLOG_IDENTIFIER = "anaconda"
 
+# the asynchronous logging
+LOG_QUEUE_SIZE = 100000
+LOG_BATCH_SIZE = 512
+LOG_SYNC_INTERVAL = 1  # in seconds
+LOG_FLUSH_TIMEOUT = 10  # in seconds
+
 from threading import Lock
 program_log_lock = Lock()
 
@@ -138,7 +148,233 @@ class AnacondaSocketHandler(_AnacondaLogFixer, SocketHandler):
 
 
 class AnacondaFileHandler(_AnacondaLogFixer, logging.FileHandler):
-    pass
+    """File handler that can write records in batches.
+
+    If the handler is batched, the stream is not flushed after every
+    record, but only after a batch of records is written.
+    """
+
+    batched = False
+
+    def flush(self):
+        if not self.batched:
+            self.flush_batch()
+
+    def flush_batch(self):
+        """Flush the stream after a batch of records."""
+        logging.FileHandler.flush(self)
+
+    def sync(self):
+        """Synchronize the log file with the storage device."""
+        self.acquire()
+        try:
+            if self._stream:
+                os.fsync(self._stream.fileno())
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.release()
+
+
+class AnacondaLogWriter(object):
+    """Writer of log records in a dedicated thread.
+
+    The records are queued by the logging calls and written by the
+    handlers in the writer thread in batches. The batched file handlers
+    are flushed after every batch and synchronized periodically.
+
+    If the queue is full, the record is dropped. If the writer is not
+    running, the record is written in the calling thread.
+    """
+
+    def __init__(self, max_size=LOG_QUEUE_SIZE, batch_size=LOG_BATCH_SIZE,
+                 sync_interval=LOG_SYNC_INTERVAL):
+        self._queue = queue.Queue(max_size)
+        self._batch_size = batch_size
+        self._sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._thread = None
+        self._running = False
+        self._handlers = set()
+        self._unsynced = set()
+        self._synced = time.monotonic()
+        self.queued = 0
+        self.dropped = 0
+        self.written = 0
+
+    @property
+    def running(self):
+        """Is the writer running?"""
+        return self._running
+
+    def add_handler(self, handler):
+        """Write the records of the handler in batches if possible."""
+        if isinstance(handler, AnacondaFileHandler):
+            handler.batched = self._running
+            self._handlers.add(handler)
+
+    def start(self):
+        """Start the writer thread."""
+        with self._lock:
+            if self._running:
+                return
+
+            self._running = True
+            self._set_batched(True)
+            self._thread = threading.Thread(name=constants.THREAD_LOG_WRITER,
+                                            target=self._run, daemon=True)
+            self._thread.start()
+
+    def put(self, handler, record):
+        """Queue a record for the handler.
+
+        :param handler: a handler of the record
+        :param record: a log record
+        :return: False if the writer is not running, otherwise True
+        """
+        with self._lock:
+            if not self._running:
+                return False
+
+            try:
+                self._queue.put_nowait((handler, record))
+                self.queued += 1
+            except queue.Full:
+                self.dropped += 1
+
+        return True
+
+    def flush(self, timeout=LOG_FLUSH_TIMEOUT):
+        """Wait until the queued records are written.
+
+        :param timeout: a timeout in seconds
+        :return: True if the records are written, otherwise False
+        """
+        if not self._running or threading.current_thread() is self._thread:
+            return True
+
+        marker = threading.Event()
+        try:
+            self._queue.put((None, marker), timeout=timeout)
+        except queue.Full:
+            return False
+
+        return marker.wait(timeout)
+
+    def stop(self, timeout=LOG_FLUSH_TIMEOUT):
+        """Write the queued records and stop the writer thread.
+
+        The records logged after the stop are written in the calling
+        thread.
+
+        :param timeout: a timeout in seconds
+        """
+        with self._lock:
+            if not self._running:
+                return
+
+            self._running = False
+
+            try:
+                self._queue.put((None, None), timeout=timeout)
+            except queue.Full:
+                pass
+
+        self._thread.join(timeout)
+        self._set_batched(False)
+
+    def _set_batched(self, batched):
+        """Set the batched mode of the handlers."""
+        for handler in self._handlers:
+            handler.batched = batched
+
+            if not batched:
+                handler.flush_batch()
+
+    def _run(self):
+        """Write the queued records until the writer is stopped."""
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self._sync_interval)]
+            except queue.Empty:
+                self._sync()
+                continue
+
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if not self._write(batch):
+                self._sync(force=True)
+                return
+
+            self._sync()
+
+    def _write(self, batch):
+        """Write a batch of records.
+
+        :return: False if the writer should stop, otherwise True
+        """
+        handlers = set()
+        markers = []
+        running = True
+
+        for handler, record in batch:
+            if handler is None and record is None:
+                running = False
+            elif handler is None:
+                markers.append(record)
+            else:
+                handler.handle(record)
+                handlers.add(handler)
+                self.written += 1
+
+        for handler in handlers & self._handlers:
+            handler.flush_batch()
+            self._unsynced.add(handler)
+
+        for marker in markers:
+            marker.set()
+
+        return running
+
+    def _sync(self, force=False):
+        """Synchronize the log files periodically."""
+        if not force and time.monotonic() - self._synced < self._sync_interval:
+            return
+
+        for handler in self._unsynced:
+            handler.sync()
+
+        self._unsynced = set()
+        self._synced = time.monotonic()
+
+
+class AnacondaQueueHandler(QueueHandler):
+    """Handler that passes the records of a handler to the log writer.
+
+    The record is prepared in the calling thread and handled by the
+    target handler in the writer thread.
+    """
+
+    def __init__(self, target, writer):
+        super().__init__(None)
+        self.target = target
+        self.writer = writer
+        self.level = target.level
+
+        if hasattr(target, "autoSetLevel"):
+            autoSetLevel(self, target.autoSetLevel)
+
+    def setLevel(self, level):
+        super().setLevel(level)
+        self.target.setLevel(level)
+
+    def enqueue(self, record):
+        if not self.writer.put(self.target, record):
+            self.target.handle(record)
 
 
 class AnacondaStreamHandler(_AnacondaLogFixer, logging.StreamHandler):
@@ -168,10 +404,17 @@ class AnacondaPrefixFilter(logging.Filter):
 class AnacondaLog(object):
     SYSLOG_CFGFILE = "/etc/rsyslog.conf"
 
-    def __init__(self, write_to_journal=False):
+    def __init__(self, write_to_journal=False, asynchronous=False):
         self.loglevel = DEFAULT_LEVEL
         self.remote_syslog = None
         self.write_to_journal = write_to_journal
+        self.writer = None
+
+        if asynchronous:
+            self.writer = AnacondaLogWriter()
+            self.writer.start()
+            atexit.register(self.stop_writer)
+
         # Rename the loglevels so they are the same as in syslog.
         logging.addLevelName(logging.CRITICAL, "CRT")
         logging.addLevelName(logging.ERROR, "ERR")
@@ -271,10 +514,43 @@ class AnacondaLog(object):
             logfile_handler.setLevel(minLevel)
             logfile_handler.setFormatter(logging.Formatter(fmtStr, DATE_FORMAT))
             autoSetLevel(logfile_handler, autoLevel)
-            addToLogger.addHandler(logfile_handler)
+            addToLogger.addHandler(self._get_queue_handler(logfile_handler))
         except IOError:
             pass
 
+    def _get_queue_handler(self, handler):
+        """Get a handler that writes the records asynchronously.
+
+        Streams are not written asynchronously, so the output is not
+        mixed with other output of the process.
+
+        :param handler: a handler of log records
+        :return: a queue handler or the given handler
+        """
+        if not self.writer or isinstance(handler, AnacondaStreamHandler):
+            return handler
+
+        self.writer.add_handler(handler)
+        return AnacondaQueueHandler(handler, self.writer)
+
+    def flush_writer(self):
+        """Wait until the queued log records are written."""
+        if self.writer:
+            self.writer.flush()
+
+    def stop_writer(self):
+        """Write the queued log records and stop the log writer.
+
+        The records logged after the stop are written synchronously.
+        """
+        if not self.writer or not self.writer.running:
+            return
+
+        self.writer.stop()
+        self.anaconda_logger.debug("Asynchronous logging: %d records queued, %d written, "
+                                   "%d dropped.", self.writer.queued, self.writer.written,
+                                   self.writer.dropped)
+
     def forwardToJournal(self, logr, log_formatter=None, log_filter=None):
         """Forward everything that goes in the logger to the journal daemon."""
         # Don't add syslog tag if custom formatter is in use.
@@ -293,7 +569,7 @@ class AnacondaLog(object):
             journal_handler.addFilter(log_filter)
         if log_formatter:
             journal_handler.setFormatter(log_formatter)
-        logr.addHandler(journal_handler)
+        logr.addHandler(self._get_queue_handler(journal_handler))
 
     # pylint: disable=redefined-builtin
     def showwarning(self, message, category, filename, lineno,
@@ -344,9 +620,9 @@ class AnacondaLog(object):
         self.restartSyslog()
 
 
-def init(write_to_journal=False):
+def init(write_to_journal=False, asynchronous=False):
     global logger
-    logger = AnacondaLog(write_to_journal=write_to_journal)
+    logger = AnacondaLog(write_to_journal=write_to_journal, asynchronous=asynchronous)
 
 
 logger = None
@@ -465,6 +465,8 @@ def getArgumentParser(version_string, boot_cmdline=None):
     ap.add_argument("--addrepo", dest="addRepo", default=[], metavar="NAME,ADDITIONAL_REPO_URL",
                     nargs='*', action="append",
                     help=help_parser.help_text("addrepo"))
+    ap.add_argument("--pkgcache", metavar="PATH", default=None,
+                    help=help_parser.help_text("pkgcache"))
     ap.add_argument("--noverifyssl", action="store_true", default=False,
                     help=help_parser.help_text("noverifyssl"))
     ap.add_argument("--liveinst", action="store_true", default=False,
@@ -55,6 +55,22 @@ class AnacondaSection(Section):
         """List of enabled kickstart modules."""
         return self._get_option("kickstart_modules").split()
 
+    @property
+    def progress_rate(self):
+        """Maximal number of progress reports per second.
+
+        The progress reports of tasks are merged, so the main loop and
+        the message bus don't have to process every single report.
+
+        :return: a number of reports or 0 for no limit
+        """
+        return self._get_option("progress_rate", int)
+
+    @property
+    def async_logging(self):
+        """Write the logs asynchronously in a dedicated thread."""
+        return self._get_option("async_logging", bool)
+
 
 class AnacondaConfiguration(Configuration):
     """Representation of the Anaconda configuration."""
@@ -240,6 +256,10 @@ class AnacondaConfiguration(Configuration):
         # Set the security flags.
         self.security._set_option("selinux", opts.selinux)
 
+        # Set the payload flags.
+        if opts.pkgcache:
+            self.payload._set_option("package_cache", opts.pkgcache)
+
         # Set the type of the installation system.
         if opts.liveinst:
             self.system._set_option("type", SystemType.LIVE_OS.value)
@@ -69,3 +69,42 @@ class PayloadSection(Section):
         are supported by the payload?
         """
         return self._get_option("check_supported_locales", bool)
+
+    @property
+    def exact_space_estimation(self):
+        """Calculate the required space from the file lists of packages.
+
+        Should the installer load the file lists of all packages to
+        get the exact number of installed files? Otherwise, the number
+        of files is estimated from the installed size of the packages.
+        """
+        return self._get_option("exact_space_estimation", bool)
+
+    @property
+    def stream_live_image_tarball(self):
+        """Extract a live image tarball during the download.
+
+        Should the installer pipe the downloaded tarball of a live image
+        directly to tar instead of downloading it to the target first?
+        The checksum of the tarball is verified after the extraction.
+        """
+        return self._get_option("stream_live_image_tarball", bool)
+
+    @property
+    def package_cache(self):
+        """Path to a persistent cache of metadata and packages.
+
+        The cache is reused by other installations, so the unchanged
+        metadata and packages don't have to be downloaded again. It can
+        be a local path or a NFS share in the nfs:[options:]server:path
+        format. The cache is disabled if the path is not specified.
+        """
+        return self._get_option("package_cache", str)
+
+    @property
+    def package_cache_size(self):
+        """Maximal size of the persistent package cache.
+
+        For example: 20 GiB
+        """
+        return self._get_option("package_cache_size", str)
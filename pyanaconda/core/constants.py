@@ -99,7 +99,6 @@ GRAPHICAL_TARGET = 'graphical.target'
 
 # Network
 NETWORK_CONNECTION_TIMEOUT = 45  # in seconds
-NETWORK_CONNECTED_CHECK_INTERVAL = 0.1  # in seconds
 
 # DBus
 DEFAULT_DBUS_TIMEOUT = -1       # use default
@@ -113,6 +112,15 @@ THREAD_CUSTOM_STORAGE_INIT = "AnaCustomStorageInit"
 THREAD_WAIT_FOR_CONNECTING_NM = "AnaWaitForConnectingNMThread"
 THREAD_PAYLOAD = "AnaPayloadThread"
 THREAD_PAYLOAD_RESTART = "AnaPayloadRestartThread"
+THREAD_REPO_METADATA = "AnaRepoMetadataThread"
+THREAD_INITRD_BUILDER = "AnaInitrdBuilderThread"
+THREAD_TASK_QUEUE = "AnaTaskQueueThread"
+THREAD_REPO_CHECK = "AnaRepoCheckThread"
+THREAD_STORAGE_CHECKER = "AnaStorageCheckerThread"
+THREAD_KICKSTART_DISTRIBUTION = "AnaKickstartDistributionThread"
+THREAD_MODULES_STOP = "AnaModulesStopThread"
+THREAD_NM_MODEL = "AnaNMModelThread"
+THREAD_LOG_WRITER = "AnaLogWriterThread"
 THREAD_SYNC_TIME_BASENAME = "AnaSyncTime"
 THREAD_EXCEPTION_HANDLING_TEST = "AnaExceptionHandlingTest"
 THREAD_LIVE_PROGRESS = "AnaLiveProgressThread"
@@ -234,6 +242,15 @@ TAR_SUFFIX = (".tar", ".tbz", ".tgz", ".txz", ".tar.bz2", "tar.gz", "tar.xz")
 SCREENSHOTS_DIRECTORY = "/tmp/anaconda-screenshots"
 SCREENSHOTS_TARGET_DIRECTORY = "/root/anaconda-screenshots"
 
+# streamed output of external programs
+PROGRAM_OUTPUT_TAIL_LINES = 1000
+PROGRAM_OUTPUT_LINE_SIZE = 64 * 1024
+
+# timing traces
+TIMING_TRACE_PATH = "/tmp/anaconda-timing"
+BOSS_TIMING_TRACE_PATH = "/tmp/anaconda-boss-timing"
+TIMING_TRACE_TARGET_DIRECTORY = "/var/log/anaconda"
+
 CMDLINE_FILES = [
     "/proc/cmdline",
     "/run/install/cmdline",
@@ -0,0 +1,159 @@
+#
+# A channel for coalescing progress reports.
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import time
+from threading import Lock
+
+from pyanaconda.core.configuration.anaconda import conf
+from pyanaconda.core.timer import Timer
+from pyanaconda.threading import threadMgr
+
+__all__ = ["ProgressChannel"]
+
+
+class ProgressChannel(object):
+    """A channel for coalescing progress reports.
+
+    The channel keeps only the latest state reported by other threads
+    and delivers it to the callback in the main loop, at most once per
+    interval. States reported in between replace each other, but the
+    latest state is always delivered. Only one delivery is scheduled
+    at a time, so the main loop doesn't have to process a callback for
+    every report.
+
+    States reported from the main thread don't have to be scheduled,
+    so they are delivered immediately.
+
+    A channel without the main loop delivers the states in the thread
+    that reports them, if the interval has passed. Otherwise, the state
+    waits for the next report or for an explicit flush, so the callback
+    has to be thread safe and the receiver should flush the channel
+    before it processes the delivered states.
+
+    Example:
+
+        channel = ProgressChannel(callback)
+        channel.send(1, "Installing packages")
+        channel.send(2, "Configuring the system")
+
+    """
+
+    def __init__(self, callback, rate=None, main_loop=True):
+        """Create a new channel.
+
+        :param callback: a function called with the reported state
+        :param rate: a maximal number of deliveries per second, 0 for
+                     no limit or None for the configured rate
+        :param main_loop: should be the states delivered in the main loop?
+        """
+        if rate is None:
+            rate = conf.anaconda.progress_rate
+
+        self._callback = callback
+        self._main_loop = main_loop
+        self._interval = 1 / rate if rate else 0
+        self._lock = Lock()
+        self._pending = None
+        self._scheduled = False
+        self._delivered = None
+
+    @property
+    def interval(self):
+        """The minimal interval between two deliveries in seconds."""
+        return self._interval
+
+    def send(self, *state):
+        """Report a new state.
+
+        This is a thread safe method.
+
+        :param state: arguments of the callback
+        """
+        if not self._main_loop:
+            with self._lock:
+                self._pending = state
+                state = self._take_pending() if not self._get_delay() else None
+
+            if state is not None:
+                self._callback(*state)
+
+            return
+
+        if threadMgr.in_main_thread():
+            with self._lock:
+                self._pending = state
+                state = self._take_pending()
+
+            self._callback(*state)
+            return
+
+        with self._lock:
+            self._pending = state
+
+            if self._scheduled:
+                return
+
+            self._scheduled = True
+            delay = self._get_delay()
+
+        if delay:
+            Timer().timeout_msec(int(delay * 1000), self._scheduled_flush)
+        else:
+            Timer().timeout_now(self._scheduled_flush)
+
+    def flush(self):
+        """Deliver the pending state now.
+
+        Call this method before you report anything that should follow
+        the latest state, for example the end of the task. Call it in
+        the main loop, unless the channel works without the main loop.
+        """
+        with self._lock:
+            state = self._take_pending()
+
+        if state is not None:
+            self._callback(*state)
+
+    def _get_delay(self):
+        """Get a number of seconds until the next delivery."""
+        if self._delivered is None:
+            return 0
+
+        return max(0, self._delivered + self._interval - time.monotonic())
+
+    def _take_pending(self):
+        """Take the pending state and mark it as delivered."""
+        state = self._pending
+        self._pending = None
+
+        if state is not None:
+            self._delivered = time.monotonic()
+
+        return state
+
+    def _scheduled_flush(self):
+        """Deliver the pending state from the main loop."""
+        with self._lock:
+            self._scheduled = False
+            state = self._take_pending()
+
+        if state is not None:
+            self._callback(*state)
+
+        return False
@@ -0,0 +1,251 @@
+#
+# Timing trace of the installation.
+#
+# Copyright (C) 2019 Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import json
+import os
+import threading
+import time
+from collections import namedtuple, deque
+
+from pyanaconda.anaconda_loggers import get_module_logger
+log = get_module_logger(__name__)
+
+__all__ = ["TimingEvent", "TimingTrace", "timing_trace",
+           "CATEGORY_QUEUE", "CATEGORY_TASK", "CATEGORY_DBUS_TASK", "CATEGORY_COMMAND"]
+
+# Categories of the timing events.
+CATEGORY_QUEUE = "queue"
+CATEGORY_TASK = "task"
+CATEGORY_DBUS_TASK = "dbus task"
+CATEGORY_COMMAND = "command"
+
+# A maximal number of recorded events. The oldest events are dropped.
+MAX_TIMING_EVENTS = 10000
+
+# Categories of events that can be on the critical path.
+CRITICAL_PATH_CATEGORIES = (CATEGORY_TASK, CATEGORY_DBUS_TASK)
+
+
+class TimingEvent(namedtuple("TimingEvent", ["name", "category", "start", "end",
+                                             "thread_id", "thread_name", "args"])):
+    """A finished timed event.
+
+    The start and the end are timestamps in seconds.
+    """
+
+    __slots__ = ()
+
+    @property
+    def duration(self):
+        """Duration of the event in seconds."""
+        return self.end - self.start
+
+
+class TimingTrace(object):
+    """A thread-safe collection of timed events.
+
+    The trace can be saved in JSON and in the Chrome trace event format
+    that can be loaded to chrome://tracing or to the Perfetto UI.
+
+    The trace keeps only the latest max_events events.
+    """
+
+    def __init__(self, max_events=MAX_TIMING_EVENTS):
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=max_events)
+        self._started = {}
+
+    @property
+    def events(self):
+        """A list of recorded events ordered by their start."""
+        with self._lock:
+            return sorted(self._events, key=lambda e: (e.start, -e.end))
+
+    def clear(self):
+        """Remove all recorded events."""
+        with self._lock:
+            self._events.clear()
+            self._started = {}
+
+    def record(self, name, category, start, end, args=None):
+        """Record a finished event of the current thread.
+
+        :param name: a name of the event
+        :param category: a category of the event
+        :param start: a timestamp of the start
+        :param end: a timestamp of the end
+        :param args: a dictionary with additional data or None
+        """
+        thread = threading.current_thread()
+        event = TimingEvent(name, category, start, end, thread.ident, thread.name, args or {})
+
+        with self._lock:
+            self._events.append(event)
+
+    def start(self, key):
+        """Remember when the event identified by the key started."""
+        with self._lock:
+            self._started[key] = time.time()
+
+    def stop(self, key, name, category, args=None):
+        """Record the event identified by the key that was started before."""
+        with self._lock:
+            start = self._started.pop(key, None)
+
+        if start is not None:
+            self.record(name, category, start, time.time(), args)
+
+    def watch_task_queue(self, queue):
+        """Record the top-level task queue and all its nested queues and tasks.
+
+        :param queue: an instance of TaskQueue
+        """
+        queue.started.connect(lambda q: self.start(id(q)))
+        queue.completed.connect(lambda q: self.stop(id(q), q.name, CATEGORY_QUEUE))
+        queue.queue_started.connect(lambda q: self.start(id(q)))
+        queue.queue_completed.connect(lambda q: self.stop(id(q), q.name, CATEGORY_QUEUE))
+        queue.task_started.connect(lambda t: self.start(id(t)))
+        queue.task_completed.connect(lambda t: self.stop(id(t), t.name, CATEGORY_TASK))
+
+    def critical_path(self):
+        """Find the critical path of the recorded tasks.
+
+        The path is the chain of tasks that ends with the last finished
+        task, where every task is preceded by the last task finished
+        before it started. Any other task could run faster without
+        making the installation shorter.
+
+        :return: a list of events ordered by their start
+        """
+        events = [e for e in self.events if e.category in CRITICAL_PATH_CATEGORIES]
+        path = []
+
+        if not events:
+            return path
+
+        current = max(events, key=lambda e: e.end)
+        path.append(current)
+
+        while True:
+            previous = [e for e in events if e.end <= current.start]
+
+            if not previous:
+                break
+
+            current = max(previous, key=lambda e: e.end)
+            path.append(current)
+
+        path.reverse()
+        return path
+
+    def slowest(self, count=10):
+        """Get the slowest tasks and commands.
+
+        :param count: a maximal number of returned events
+        :return: a list of events ordered by their duration
+        """
+        events = [e for e in self.events if e.category != CATEGORY_QUEUE]
+        return sorted(events, key=lambda e: e.duration, reverse=True)[:count]
+
+    def summary(self, count=10):
+        """Generate a human readable summary of the trace.
+
+        :param count: a maximal number of the slowest steps
+        :return: a multi-line string
+        """
+        path = self.critical_path()
+        total = path[-1].end - path[0].start if path else 0.0
+
+        message = "Critical path (%1.1f s):\n" % total
+        for event in path:
+            message += " %8.1f s  %s: %s\n" % (event.duration, event.category, event.name)
+
+        message += "Slowest steps:\n"
+        for event in self.slowest(count):
+            message += " %8.1f s  %s: %s\n" % (event.duration, event.category, event.name)
+
+        return message.rstrip("\n")
+
+    def to_json(self):
+        """Get the trace as a JSON serializable object.
+
+        :return: a list of dictionaries
+        """
+        return [{
+            "name": e.name,
+            "category": e.category,
+            "start": e.start,
+            "end": e.end,
+            "duration": e.duration,
+            "thread": e.thread_name,
+            "args": e.args
+        } for e in self.events]
+
+    def to_chrome_trace(self):
+        """Get the trace in the Chrome trace event format.
+
+        :return: a JSON serializable dictionary
+        """
+        events = self.events
+        origin = events[0].start if events else 0.0
+        pid = os.getpid()
+        trace_events = []
+        threads = {}
+
+        for e in events:
+            threads[e.thread_id] = e.thread_name
+            trace_events.append({
+                "name": e.name,
+                "cat": e.category,
+                "ph": "X",
+                "ts": int((e.start - origin) * 1000000),
+                "dur": int(e.duration * 1000000),
+                "pid": pid,
+                "tid": e.thread_id,
+                "args": e.args
+            })
+
+        for thread_id, thread_name in threads.items():
+            trace_events.append({
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": thread_id,
+                "args": {"name": thread_name}
+            })
+
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def save(self, path_prefix):
+        """Save the trace in the JSON and Chrome trace event formats.
+
+        :param path_prefix: a path to the files without the suffix
+        :return: a list of paths to the created files
+        """
+        paths = [path_prefix + ".json", path_prefix + ".trace.json"]
+
+        for path, data in zip(paths, (self.to_json(), self.to_chrome_trace())):
+            with open(path, "w") as f:
+                json.dump(data, f, indent=1)
+
+        return paths
+
+
+# The timing trace of this process.
+timing_trace = TimingTrace()
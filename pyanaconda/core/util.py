@@ -33,6 +33,10 @@ from urllib.parse import quote, unquote
 import gettext
 import signal
 import sys
+import time
+import codecs
+import collections
+import threading
 import imp
 import types
 import inspect
@@ -50,6 +54,8 @@ from pyanaconda.core.constants import DRACUT_SHUTDOWN_EJECT, TRANSLATIONS_UPDATE
     WARNING_HARDWARE_UNSUPPORTED, WARNING_SUPPORT_REMOVED
 from pyanaconda.core.constants import SCREENSHOTS_DIRECTORY, SCREENSHOTS_TARGET_DIRECTORY
 from pyanaconda.core.regexes import URL_PARSE
+from pyanaconda.core.timing import timing_trace, CATEGORY_COMMAND
+from pyanaconda.core.constants import PROGRAM_OUTPUT_TAIL_LINES, PROGRAM_OUTPUT_LINE_SIZE
 from pyanaconda.errors import RemovedModuleError, ExitError
 
 from pyanaconda.core.i18n import _
@@ -264,13 +270,98 @@ def startX(argv, output_redirect=None, timeout=X_TIMEOUT):
         signal.signal(signal.SIGALRM, old_sigalrm_handler)
 
 
+def _stream_program_output(proc, stdout=None, log_output=True, binary_output=False,
+                           tail_size=PROGRAM_OUTPUT_TAIL_LINES):
+    """ Read the output of a running program line by line.
+
+        The lines are logged and written to the file object as they arrive.
+        Only the last lines are kept in memory. A filtered stderr is read
+        and logged by a separate thread.
+
+        :param proc: The Popen object of the running program
+        :param stdout: Optional file object to write the output to.
+        :param log_output: whether to log the output of command
+        :param binary_output: whether to treat the output of command as binary data
+        :param tail_size: how many last lines of the output should be returned
+        :return: The last lines of the output
+    """
+    err_thread = None
+    if proc.stderr:
+        err_thread = threading.Thread(target=_log_program_stream,
+                                      args=(proc.stderr, log_output),
+                                      daemon=True)
+        err_thread.start()
+
+    tail = collections.deque(maxlen=tail_size)
+    decoder = None if binary_output else codecs.getincrementaldecoder("utf-8")()
+    last_data = None
+
+    try:
+        for chunk in iter(lambda: proc.stdout.readline(PROGRAM_OUTPUT_LINE_SIZE), b""):
+            data = chunk if binary_output else decoder.decode(chunk)
+
+            if not data:
+                continue
+
+            if log_output:
+                with program_log_lock:
+                    if binary_output:
+                        program_log.info(data.decode("utf-8", "replace").strip())
+                    else:
+                        program_log.info(data.strip())
+
+            if stdout:
+                stdout.write(data)
+
+            tail.append(data)
+            last_data = data
+
+        if not binary_output:
+            # Raise UnicodeDecodeError for incomplete characters at the end.
+            decoder.decode(b"", final=True)
+
+            if last_data and last_data[-1] != "\n":
+                if tail:
+                    tail[-1] += "\n"
+
+                if stdout:
+                    stdout.write("\n")
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+        if err_thread:
+            err_thread.join()
+
+    return (b"" if binary_output else "").join(tail)
+
+
+def _log_program_stream(stream, log_output):
+    """ Read and log the lines of the given stream until the end.
+
+        :param stream: a binary file object
+        :param log_output: whether to log the lines
+    """
+    for chunk in iter(lambda: stream.readline(PROGRAM_OUTPUT_LINE_SIZE), b""):
+        if log_output:
+            with program_log_lock:
+                program_log.info(chunk.decode("utf-8", "replace").strip())
+
+    stream.close()
+
+
 def _run_program(argv, root='/', stdin=None, stdout=None, env_prune=None, log_output=True,
-                 binary_output=False, filter_stderr=False):
+                 binary_output=False, filter_stderr=False, stream_output=False,
+                 tail_size=PROGRAM_OUTPUT_TAIL_LINES):
     """ Run an external program, log the output and return it to the caller
 
         NOTE/WARNING: UnicodeDecodeError will be raised if the output of the of the
                       external command can't be decoded as UTF-8.
 
+        In the streaming mode, the output is logged and written to stdout as
+        it arrives and only the last tail_size lines of it are returned, so
+        the memory usage doesn't depend on the size of the output.
+
         :param argv: The command to run and argument
         :param root: The directory to chroot to before running command.
         :param stdin: The file object to read stdin from.
@@ -279,8 +370,11 @@ def _run_program(argv, root='/', stdin=None, stdout=None, env_prune=None, log_ou
         :param log_output: whether to log the output of command
         :param binary_output: whether to treat the output of command as binary data
         :param filter_stderr: whether to exclude the contents of stderr from the returned output
+        :param stream_output: whether to process the output incrementally
+        :param tail_size: how many last lines of the output are returned in the streaming mode
         :return: The return code of the command and the output
     """
+    start_time = time.time()
     try:
         if filter_stderr:
             stderr = subprocess.PIPE
@@ -290,6 +384,12 @@ def _run_program(argv, root='/', stdin=None, stdout=None, env_prune=None, log_ou
         proc = startProgram(argv, root=root, stdin=stdin, stdout=subprocess.PIPE, stderr=stderr,
                             env_prune=env_prune)
 
+        if stream_output:
+            output_string = _stream_program_output(proc, stdout=stdout, log_output=log_output,
+                                                   binary_output=binary_output,
+                                                   tail_size=tail_size)
+            return _finish_program(argv, root, proc, output_string, start_time)
+
         (output_string, err_string) = proc.communicate()
         if not binary_output:
             output_string = output_string.decode("utf-8")
@@ -328,9 +428,20 @@ def _run_program(argv, root='/', stdin=None, stdout=None, env_prune=None, log_ou
             program_log.error("Error running %s: %s", argv[0], e.strerror)
         raise
 
+    return _finish_program(argv, root, proc, output_string, start_time)
+
+
+def _finish_program(argv, root, proc, output_string, start_time):
+    """ Log the return code of a finished program and record its timing.
+
+        :return: The return code of the command and the output
+    """
     with program_log_lock:
         program_log.debug("Return code: %d", proc.returncode)
 
+    timing_trace.record(os.path.basename(argv[0]), CATEGORY_COMMAND, start_time, time.time(),
+                        {"argv": " ".join(argv), "root": root, "returncode": proc.returncode})
+
     return (proc.returncode, output_string)
 
 
@@ -361,7 +472,8 @@ def execWithRedirect(command, argv, stdin=None, stdout=None,
     """
     argv = [command] + argv
     return _run_program(argv, stdin=stdin, stdout=stdout, root=root, env_prune=env_prune,
-                        log_output=log_output, binary_output=binary_output)[0]
+                        log_output=log_output, binary_output=binary_output,
+                        stream_output=True, tail_size=0)[0]
 
 
 def execWithCapture(command, argv, stdin=None, root='/', log_output=True, filter_stderr=False):
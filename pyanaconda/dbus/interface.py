@@ -29,6 +29,7 @@ from inspect import Parameter
 from typing import get_type_hints
 from pydbus.generic import signal
 
+from pyanaconda.dbus.specification_cache import get_specification_cache
 from pyanaconda.dbus.typing import get_dbus_type
 from pyanaconda.dbus.xml import XMLGenerator
 
@@ -73,10 +74,17 @@ def dbus_interface(interface_name):
 
     The XML specification is accessible as:
         Interface.dbus
+
+    The specification is taken from the cache of DBus specifications
+    generated at build time if it is valid for the class. Otherwise,
+    it is generated from the class.
     """
     def decorated(cls):
         generator = DBusSpecification()
-        cls.dbus = generator.generate_specification(cls, interface_name)
+        cls.dbus = get_specification_cache().get_specification(
+            cls, interface_name,
+            lambda: generator.generate_specification(cls, interface_name)
+        )
         return cls
     return decorated
 
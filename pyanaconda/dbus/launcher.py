@@ -29,6 +29,7 @@ import time
 from subprocess import TimeoutExpired
 
 from pyanaconda.core.configuration.anaconda import conf
+from pyanaconda.core.glib import create_main_loop, timeout_add_seconds, source_remove
 from pyanaconda.core.util import startProgram
 from pyanaconda.core.constants import ANACONDA_BUS_ADDR_FILE, ANACONDA_CONFIG_TMP,\
     ANACONDA_BUS_CONF_FILE
@@ -182,18 +183,41 @@ class AnacondaDBusLauncher(object):
         boss_proxy.StartModules()
 
     def _wait_for_modules(self, timeout):
-        """Wait for the modules to start."""
+        """Wait for the modules to start.
+
+        The boss emits the ModulesReady signal when all modules are
+        ready. The signal is received by a temporary event loop that
+        is stopped by the signal or by the timeout.
+        """
         boss = BOSS.get_proxy()
+        start = time.monotonic()
+        loop = create_main_loop()
 
-        while not boss.AllModulesAvailable and timeout > 0:
-            log.info("Waiting %d sec for modules to be started.", timeout)
-            time.sleep(1)
-            timeout = timeout - 1
+        def on_timeout():
+            loop.quit()
+            # The source is removed below.
+            return True
 
-        if not timeout:
+        # Subscribe to the signal before the first check.
+        subscription = boss.ModulesReady.connect(loop.quit)
+        source_id = timeout_add_seconds(timeout, on_timeout)
+
+        try:
+            if not boss.AllModulesAvailable:
+                loop.run()
+        finally:
+            source_remove(source_id)
+            subscription.disconnect()
+
+        if not boss.AllModulesAvailable:
             log.error("Waiting for modules to be started timed out.")
             raise TimeoutError("Anaconda DBus modules failed to start on time.")
 
+        log.info("Modules were started in %.2f sec.", time.monotonic() - start)
+
+        for service_name, duration in sorted(boss.ModulesStartupTimings.items()):
+            log.debug("%s was ready in %.2f sec.", service_name, duration)
+
     def _stop_boss_and_modules(self):
         """Stop the boss and the kickstart modules."""
         boss_proxy = BOSS.get_proxy()
@@ -26,6 +26,7 @@ from abc import ABC
 from functools import wraps
 
 from pyanaconda.dbus.interface import dbus_signal, DBusSpecification
+from pyanaconda.dbus.specification_cache import get_specification_cache
 from pyanaconda.dbus.typing import *  # pylint: disable=wildcard-import
 
 __all__ = ["emits_properties_changed", "PropertiesException", "PropertiesInterface"]
@@ -83,7 +84,9 @@ class PropertiesChanges(object):
                                       .format(type(publishable).__name__))
 
         generator = DBusSpecification()
-        return generator.generate_properties_mapping(specification)
+        return get_specification_cache().get_properties_mapping(
+            specification, generator.generate_properties_mapping
+        )
 
     def flush(self):
         """Flush the cache.
@@ -0,0 +1,325 @@
+#
+# Cache of DBus specifications.
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+# The specifications of the DBus interfaces are generated at build time:
+#
+#   python3 -m pyanaconda.dbus.specification_cache --output dbus_specifications.json
+#
+import argparse
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import sys
+from threading import Lock
+
+from pyanaconda.anaconda_loggers import get_module_logger
+log = get_module_logger(__name__)
+
+__all__ = ["DBusSpecificationCache", "get_specification_cache", "set_specification_cache",
+           "generate_specification_cache"]
+
+# The default location of the cache.
+DBUS_SPECIFICATIONS_FILE = os.path.join(os.path.dirname(__file__), "dbus_specifications.json")
+
+# Packages with DBus interfaces.
+DBUS_INTERFACES_PACKAGES = ["pyanaconda.modules", "pyanaconda.dbus_addons"]
+
+
+class DBusSpecificationCache(object):
+    """Cache of DBus specifications.
+
+    The cache maps DBus classes to their XML specifications and to the
+    mappings of their properties to interfaces. Every entry is valid only
+    for the source of the module that defines the class and for the
+    specifications the class inherits, so a changed class is not served
+    from the cache and its specification is generated again.
+
+    The properties mappings are cached for every specification, because
+    they are needed for every published object.
+    """
+
+    def __init__(self, entries=None, recording=False):
+        """Create a new cache.
+
+        :param entries: a dictionary of entries
+        :param recording: should be the generated specifications recorded?
+        """
+        self._entries = entries or {}
+        self._recording = recording
+        self._conflicts = set()
+        self._digests = {}
+        self._mappings = {}
+        self._lock = Lock()
+
+        for entry in self._entries.values():
+            if entry["properties"] is not None:
+                self._mappings[entry["specification"]] = entry["properties"]
+
+    @classmethod
+    def from_file(cls, path):
+        """Load the cache from a file.
+
+        If the file doesn't exist or cannot be read, the cache is empty.
+
+        :param path: a path to the file
+        :return: an instance of DBusSpecificationCache
+        """
+        if not os.path.exists(path):
+            log.debug("The cache of DBus specifications doesn't exist.")
+            return cls()
+
+        try:
+            with open(path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning("Failed to load the cache of DBus specifications: %s", e)
+            return cls()
+
+        return cls(entries)
+
+    def to_file(self, path):
+        """Save the cache to a file.
+
+        :param path: a path to the file
+        """
+        with open(path, "w") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+
+    @property
+    def entries(self):
+        """Entries of the cache.
+
+        Classes with conflicting specifications are not included.
+
+        :return: a dictionary of entries
+        """
+        return {k: v for k, v in self._entries.items() if k not in self._conflicts}
+
+    def get_key(self, cls):
+        """Get a key of the class.
+
+        Classes defined in functions cannot be identified by their
+        names, so they have no key.
+
+        :param cls: a class object
+        :return: a string or None
+        """
+        if "<locals>" in cls.__qualname__:
+            return None
+
+        return "{}:{}".format(cls.__module__, cls.__qualname__)
+
+    def get_token(self, cls, interface_name):
+        """Get a token of the class.
+
+        The token identifies the source of the module that defines
+        the class, the interface name and the inherited specifications.
+
+        :param cls: a class object
+        :param interface_name: a name of the interface defined by the class
+        :return: a string or None
+        """
+        digest = self._get_module_digest(cls.__module__)
+
+        if not digest:
+            return None
+
+        token = hashlib.sha256(digest.encode())
+        token.update(str(interface_name).encode())
+
+        for member in inspect.getmro(cls)[1:]:
+            token.update((getattr(member, "dbus", None) or "").encode())
+
+        return token.hexdigest()
+
+    def _get_module_digest(self, module_name):
+        """Get a digest of the source of the module."""
+        if module_name not in self._digests:
+            module = sys.modules.get(module_name)
+            path = getattr(module, "__file__", None)
+            digest = None
+
+            try:
+                with open(path, "rb") as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+            except (OSError, TypeError):
+                pass
+
+            self._digests[module_name] = digest
+
+        return self._digests[module_name]
+
+    def get_specification(self, cls, interface_name, generate):
+        """Get a specification of the class.
+
+        :param cls: a class object
+        :param interface_name: a name of the interface defined by the class
+        :param generate: a function that generates the specification
+        :return: a specification in XML
+        """
+        key = self.get_key(cls)
+
+        if not key:
+            return generate()
+
+        with self._lock:
+            token = self.get_token(cls, interface_name)
+            entry = self._entries.get(key)
+
+            if not self._recording and entry and token and entry["token"] == token:
+                return entry["specification"]
+
+        specification = generate()
+
+        if self._recording and token:
+            self._record(key, token, interface_name, specification)
+
+        return specification
+
+    def _record(self, key, token, interface_name, specification):
+        """Record the generated specification."""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry and entry["specification"] != specification:
+                log.warning("Class %s has conflicting specifications.", key)
+                self._conflicts.add(key)
+                return
+
+            self._entries[key] = {
+                "token": token,
+                "interface": interface_name,
+                "specification": specification,
+                "properties": None
+            }
+
+    def get_properties_mapping(self, specification, generate):
+        """Get a mapping of properties to interfaces.
+
+        :param specification: a specification in XML
+        :param generate: a function that generates the mapping
+        :return: a mapping of property names to interface names
+        """
+        mapping = self._mappings.get(specification)
+
+        if mapping is None:
+            mapping = generate(specification)
+            self._mappings[specification] = mapping
+
+        return mapping
+
+    def complete(self, generate):
+        """Generate the missing properties mappings of the entries.
+
+        :param generate: a function that generates the mapping
+        """
+        for entry in self._entries.values():
+            if entry["properties"] is None:
+                entry["properties"] = self.get_properties_mapping(
+                    entry["specification"], generate
+                )
+
+
+_cache = None
+
+
+def get_specification_cache():
+    """Get the cache of DBus specifications.
+
+    The cache is loaded from the default location on the first call.
+
+    :return: an instance of DBusSpecificationCache
+    """
+    global _cache
+
+    if _cache is None:
+        _cache = DBusSpecificationCache.from_file(DBUS_SPECIFICATIONS_FILE)
+
+    return _cache
+
+
+def set_specification_cache(cache):
+    """Set the cache of DBus specifications.
+
+    :param cache: an instance of DBusSpecificationCache or None
+    """
+    global _cache
+    _cache = cache
+
+
+def generate_specification_cache(package_names=DBUS_INTERFACES_PACKAGES):
+    """Generate the cache of DBus specifications.
+
+    Import all modules with DBus interfaces from the given packages
+    and record the generated specifications. Modules that cannot be
+    imported are skipped, their specifications will be generated at
+    runtime. Call this function in a new process, because the already
+    imported classes are not recorded.
+
+    :param package_names: a list of package names
+    :return: an instance of DBusSpecificationCache
+    """
+    from pyanaconda.dbus.interface import DBusSpecification
+
+    cache = DBusSpecificationCache(recording=True)
+    set_specification_cache(cache)
+
+    try:
+        for package_name in package_names:
+            package = importlib.import_module(package_name)
+            prefix = package_name + "."
+
+            for module_info in pkgutil.walk_packages(package.__path__, prefix, _skip_package):
+                if not module_info.name.endswith("_interface"):
+                    continue
+
+                try:
+                    importlib.import_module(module_info.name)
+                except Exception as e:  # pylint: disable=broad-except
+                    log.warning("Skipping DBus interfaces of %s: %s", module_info.name, e)
+    finally:
+        set_specification_cache(None)
+
+    cache.complete(DBusSpecification().generate_properties_mapping)
+    return cache
+
+
+def _skip_package(package_name):
+    """Skip a package that cannot be imported."""
+    log.warning("Skipping DBus interfaces of %s.", package_name)
+
+
+def main():
+    """Generate the cache of DBus specifications."""
+    parser = argparse.ArgumentParser(description="Generate the cache of DBus specifications.")
+    parser.add_argument("--output", default=DBUS_SPECIFICATIONS_FILE,
+                        help="a path to the generated cache")
+    args = parser.parse_args()
+
+    cache = generate_specification_cache()
+    cache.to_file(args.output)
+
+
+if __name__ == "__main__":
+    # Use the imported module, so the interfaces use the same cache.
+    from pyanaconda.dbus import specification_cache
+    specification_cache.main()
@@ -17,16 +17,23 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 import inspect
-from typing import get_type_hints
+from operator import attrgetter
+from typing import get_type_hints, List
 
-from pyanaconda.dbus.typing import get_variant, Structure
+from pydbus import Variant
 
-__all__ = ["get_structure", "apply_structure", "dbus_structure", "DBusStructureError"]
+from pyanaconda.dbus.typing import get_variant, get_dbus_type, Structure
+
+__all__ = ["get_structure", "get_structures", "apply_structure", "apply_structures",
+           "dbus_structure", "DBusStructureError"]
 
 
 # Class attribute for DBus fields.
 DBUS_FIELDS_ATTRIBUTE = "__dbus_fields__"
 
+# Class attribute for a DBus structure codec.
+DBUS_CODEC_ATTRIBUTE = "__dbus_codec__"
+
 
 class DBusStructureError(Exception):
     """General exception for DBus structure errors."""
@@ -71,6 +78,14 @@ class DBusField(object):
         """
         return self._description
 
+    @property
+    def dbus_type(self):
+        """DBus representation of the type hint.
+
+        :return: a string with DBus representation
+        """
+        return get_dbus_type(self.type_hint)
+
     @property
     def data_name(self):
         """Return name of a data attribute.
@@ -118,6 +133,85 @@ def get_fields(obj):
     return fields
 
 
+class DBusStructureCodec(object):
+    """Codec of DBus structures with the given fields.
+
+    The codec precomputes the DBus types and the names of the data
+    attributes of the fields, so the DBus structures can be created
+    and applied without processing the type hints again.
+    """
+
+    def __init__(self, fields):
+        """Create a codec for the given fields.
+
+        :param fields: a map of DBus fields
+        """
+        self._fields = fields
+        self._getters = [
+            (name, attrgetter(field.data_name), field.dbus_type)
+            for name, field in fields.items()
+        ]
+        self._setters = {
+            name: field.data_name
+            for name, field in fields.items()
+        }
+
+    @property
+    def fields(self):
+        """Fields of the codec.
+
+        :return: a map of DBus fields
+        """
+        return self._fields
+
+    def get_structure(self, obj) -> Structure:
+        """Return a DBus structure of the data object.
+
+        :param obj: a data object
+        :return: a DBus structure
+        """
+        return {
+            name: Variant(dbus_type, getter(obj))
+            for name, getter, dbus_type in self._getters
+        }
+
+    def apply_structure(self, structure, obj):
+        """Set the data object with data from the DBus structure.
+
+        :param structure: an unpacked DBus structure
+        :param obj: a data object
+        :return: a data object
+        """
+        for name, value in structure.items():
+            data_name = self._setters.get(name, None)
+
+            if not data_name:
+                raise DBusStructureError("Field '{}' doesn't exist.".format(name))
+
+            setattr(obj, data_name, value)
+
+        return obj
+
+
+def get_codec(obj):
+    """Return a DBus structure codec of a data object.
+
+    The codec is generated by the dbus_structure decorator. If the
+    codec is missing or the fields of the object were changed since
+    then, a new codec is created.
+
+    :param obj: a data object
+    :return: an instance of DBusStructureCodec
+    """
+    fields = get_fields(obj)
+    codec = getattr(obj, DBUS_CODEC_ATTRIBUTE, None)
+
+    if codec is None or codec.fields is not fields:
+        codec = DBusStructureCodec(fields)
+
+    return codec
+
+
 def get_structure(obj) -> Structure:
     """Return a DBus structure.
 
@@ -126,13 +220,28 @@ def get_structure(obj) -> Structure:
     :param obj: a data object
     :return: a DBus structure
     """
-    structure = {}
-    fields = get_fields(obj)
+    return get_codec(obj).get_structure(obj)
 
-    for name, field in fields.items():
-        structure[name] = field.get_data_variant(obj)
 
-    return structure
+def get_structures(objects) -> List[Structure]:
+    """Return a list of DBus structures.
+
+    The returned DBus structures are ready to be send on DBus.
+    The data objects should be instances of the same class.
+
+    :param objects: a list of data objects
+    :return: a list of DBus structures
+    """
+    structures = []
+    codec = None
+
+    for obj in objects:
+        if codec is None or codec.fields is not get_fields(obj):
+            codec = get_codec(obj)
+
+        structures.append(codec.get_structure(obj))
+
+    return structures
 
 
 def apply_structure(structure, obj):
@@ -144,17 +253,20 @@ def apply_structure(structure, obj):
     :param obj: a data object
     :return: a data object
     """
-    fields = get_fields(obj)
+    return get_codec(obj).apply_structure(structure, obj)
 
-    for name, value in structure.items():
-        field = fields.get(name, None)
 
-        if not field:
-            raise DBusStructureError("Field '{}' doesn't exist.".format(name))
+def apply_structures(structures, data_type):
+    """Create data objects with data from DBus structures.
 
-        field.set_data(obj, value)
+    The given structures are usually a value returned by DBus.
 
-    return obj
+    :param structures: a list of unpacked DBus structures
+    :param data_type: a class of the data objects
+    :return: a list of data objects
+    """
+    codec = get_codec(data_type)
+    return [codec.apply_structure(structure, data_type()) for structure in structures]
 
 
 def generate_fields(cls):
@@ -226,7 +338,8 @@ def dbus_structure(cls):
 
     This decorator will use the class to generate DBus fields from the class
     properties and set the class attribute __dbus_fields__ with the generated
-    fields. It also sets the __repr__ method.
+    fields. It also sets the class attribute __dbus_codec__ with a codec of
+    the fields and the __repr__ method.
 
     Instances of the decorated class can be used to create and apply
     DBus structures with method get_structure and apply_structure.
@@ -234,6 +347,8 @@ def dbus_structure(cls):
     :param cls: a data class
     :return: a data class with generated DBus fields
     """
-    setattr(cls, DBUS_FIELDS_ATTRIBUTE, generate_fields(cls))
+    fields = generate_fields(cls)
+    setattr(cls, DBUS_FIELDS_ATTRIBUTE, fields)
+    setattr(cls, DBUS_CODEC_ATTRIBUTE, DBusStructureCodec(fields))
     setattr(cls, '__repr__', generate_string_from_data)
     return cls
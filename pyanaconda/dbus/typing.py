@@ -23,6 +23,7 @@
 # https://dbus.freedesktop.org/doc/dbus-specification.html#type-system.
 #
 
+from functools import lru_cache
 from typing import Tuple, Dict, List, NewType, IO
 from pydbus import Variant
 
@@ -61,9 +62,12 @@ ObjPath = NewType('ObjPath', str)
 Structure = Dict[Str, Variant]
 
 
+@lru_cache(maxsize=None)
 def get_dbus_type(type_hint):
     """Return DBus representation of a type hint.
 
+    The representation is derived only once for every type hint.
+
     :param type_hint: a type hint
     :return: a string with DBus representation
     """
@@ -33,6 +33,7 @@ from meh import Config
 from meh.dump import ReverseExceptionDump
 from meh.handler import ExceptionHandler
 
+from pyanaconda import anaconda_logging
 from pyanaconda import kickstart
 from pyanaconda.core import util
 from pyanaconda import startup_utils
@@ -134,6 +135,10 @@ class AnacondaExceptionHandler(ExceptionHandler):
         exception_lines = traceback.format_exception(*dump_info.exc_info)
         log.critical("\n".join(exception_lines))
 
+        # Write the queued log records before the logs are collected.
+        if anaconda_logging.logger:
+            anaconda_logging.logger.flush_writer()
+
         ty = dump_info.exc_info.type
         value = dump_info.exc_info.value
 
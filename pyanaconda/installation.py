@@ -18,11 +18,16 @@
 # Red Hat, Inc.
 #
 
+import os
+import shutil
+
 from blivet import callbacks, arch
 from blivet.devices import BTRFSDevice
 
 from pyanaconda.core.configuration.anaconda import conf
-from pyanaconda.core.constants import BOOTLOADER_DISABLED
+from pyanaconda.core.constants import BOOTLOADER_DISABLED, TIMING_TRACE_PATH, \
+    TIMING_TRACE_TARGET_DIRECTORY
+from pyanaconda.core.timing import timing_trace
 from pyanaconda.modules.common.constants.objects import BOOTLOADER, AUTO_PARTITIONING, \
     MANUAL_PARTITIONING, SNAPSHOT
 from pyanaconda.modules.common.constants.services import STORAGE
@@ -49,6 +54,10 @@ from pykickstart.constants import SNAPSHOT_WHEN_POST_INSTALL
 from pyanaconda.anaconda_loggers import get_module_logger
 log = get_module_logger(__name__)
 
+# Resources of the installed system shared by the configuration tasks.
+SYSTEMD_UNITS = "systemd units"
+LOCALIZATION_CONFIG = "localization configuration"
+
 class WriteResolvConfTask(Task):
     """Custom task subclass for handling the resolv.conf copy task.
 
@@ -68,6 +77,27 @@ class WriteResolvConfTask(Task):
         network.copyFileToPath("/etc/resolv.conf", util.getSysroot())
 
 
+def _save_timing_trace(copy_to_target=False):
+    """Save the timing trace of the installation and log its summary.
+
+    :param copy_to_target: should the trace be copied to the installed system?
+    """
+    log.info("Installation timing:\n%s", timing_trace.summary())
+
+    try:
+        paths = timing_trace.save(TIMING_TRACE_PATH)
+
+        if copy_to_target and not flags.flags.nosave_logs:
+            target_path = util.getSysroot() + TIMING_TRACE_TARGET_DIRECTORY
+            util.mkdirChain(target_path)
+
+            for path in paths:
+                target = os.path.join(target_path, os.path.basename(path))
+                shutil.copy(path, target)
+                os.chmod(target, 0o600)
+    except OSError:
+        log.exception("saving the timing trace failed")
+
 def _writeKS(ksdata):
     path = util.getSysroot() + "/root/anaconda-ks.cfg"
 
@@ -93,16 +123,24 @@ def doConfiguration(storage, payload, ksdata):
     configuration_queue.task_completed.connect(lambda x: progress_step(x.name))
 
     # schedule the execute methods of ksdata that require an installed system to be present
-    os_config = TaskQueue("Installed system configuration", N_("Configuring installed system"))
+    # the tasks are independent except for the declared resources, so run them in parallel
+    os_config = TaskQueue("Installed system configuration", N_("Configuring installed system"),
+                          parallel=True)
     os_config.append(Task("Configure authselect", ksdata.authselect.execute))
     os_config.append(Task("Configure SELinux", ksdata.selinux.execute))
-    os_config.append(Task("Configure first boot tasks", ksdata.firstboot.execute))
-    os_config.append(Task("Configure services", ksdata.services.execute))
-    os_config.append(Task("Configure keyboard", ksdata.keyboard.execute))
+    os_config.append(Task("Configure first boot tasks", ksdata.firstboot.execute,
+                          resources=[SYSTEMD_UNITS]))
+    os_config.append(Task("Configure services", ksdata.services.execute,
+                          resources=[SYSTEMD_UNITS]))
+    os_config.append(Task("Configure keyboard", ksdata.keyboard.execute,
+                          resources=[LOCALIZATION_CONFIG]))
     os_config.append(Task("Configure timezone", ksdata.timezone.execute))
-    os_config.append(Task("Configure language", ksdata.lang.execute))
-    os_config.append(Task("Configure firewall", ksdata.firewall.execute))
-    os_config.append(Task("Configure X", ksdata.xconfig.execute))
+    os_config.append(Task("Configure language", ksdata.lang.execute,
+                          resources=[LOCALIZATION_CONFIG]))
+    os_config.append(Task("Configure firewall", ksdata.firewall.execute,
+                          resources=[SYSTEMD_UNITS]))
+    os_config.append(Task("Configure X", ksdata.xconfig.execute,
+                          resources=[SYSTEMD_UNITS]))
     configuration_queue.append(os_config)
 
     # schedule network configuration (if required)
@@ -208,8 +246,14 @@ def doConfiguration(storage, payload, ksdata):
     configuration_queue.task_completed.connect(lambda x: log.debug("Task completed: %s (%s) (%1.1f s)",
                                                                    x.name, next(task_completed_counter),
                                                                    x.elapsed_time))
+    # record the timing of the tasks
+    timing_trace.watch_task_queue(configuration_queue)
     # start the task queue
     configuration_queue.start()
+    # save the timing of the whole installation
+    _save_timing_trace(copy_to_target=True)
+    # the timing trace is complete, release the recorded events
+    timing_trace.clear()
     # done
     progress_complete()
 
@@ -395,7 +439,11 @@ def doInstall(storage, payload, ksdata):
     installation_queue.task_completed.connect(lambda x: log.debug("Task completed: %s (%s) (%1.1f s)",
                                                                   x.name, next(task_completed_counter),
                                                                   x.elapsed_time))
+    # record the timing of the tasks
+    timing_trace.watch_task_queue(installation_queue)
     # start the task queue
     installation_queue.start()
+    # save the timing of the installation
+    _save_timing_trace()
     # done
     progress_complete()
@@ -20,6 +20,8 @@
 from threading import RLock
 from pyanaconda.core.signal import Signal
 from pyanaconda.core.util import synchronized
+from pyanaconda.core.constants import THREAD_TASK_QUEUE
+import concurrent.futures
 import time
 
 from pyanaconda.anaconda_loggers import get_module_logger
@@ -31,8 +33,10 @@ class BaseTask(object):
     It holds shared methods, properties and signals.
     """
 
-    def __init__(self, name):
+    def __init__(self, name, depends_on=None, resources=None):
         self._name = name
+        self._depends_on = frozenset(depends_on or [])
+        self._resources = frozenset(resources or [])
         self._done = False
         self._running = False
         self._lock = RLock()
@@ -51,6 +55,32 @@ class BaseTask(object):
         """
         return self._name
 
+    @property
+    def depends_on(self):
+        """Names of items that have to be done before this one is started.
+
+        The dependencies are resolved only by a parallel task queue
+        and only between items of the same queue.
+
+        :returns: a set of names
+        :rtype: frozenset
+        """
+        return self._depends_on
+
+    @property
+    def resources(self):
+        """Names of resources this item needs exclusively.
+
+        For example "systemd units" for items that enable or disable
+        services in the installed system. A parallel task queue never
+        runs two items that share a resource at the same time and it
+        starts them in the order of the queue.
+
+        :returns: a set of names
+        :rtype: frozenset
+        """
+        return self._resources
+
     @property
     @synchronized
     def running(self):
@@ -97,11 +127,19 @@ class TaskQueue(BaseTask):
     """TaskQueue represents a queue of TaskQueues or Tasks.
 
     TaskQueues and Tasks can be mixed in a single TaskQueue.
+
+    The items of the queue are processed in order by default. If the
+    queue is parallel, the items are processed by a pool of threads.
+    An item is started once the items it depends on are done and its
+    resources are not used by any running or earlier waiting item.
     """
 
-    def __init__(self, name, status_message=None):
-        super().__init__(name=name)
+    def __init__(self, name, status_message=None, parallel=False, max_workers=4,
+                 depends_on=None, resources=None):
+        super().__init__(name=name, depends_on=depends_on, resources=resources)
         self._status_message = status_message
+        self._parallel = parallel
+        self._max_workers = max_workers
         self._current_task_number = None
         self._current_queue_number = None
         # the list backing this TaskQueue instance
@@ -140,6 +178,15 @@ class TaskQueue(BaseTask):
         """
         return self._status_message
 
+    @property
+    def parallel(self):
+        """Are the items of the queue processed in parallel?
+
+        :returns: True if the items are processed in parallel
+        :rtype: bool
+        """
+        return self._parallel
+
     @property
     @synchronized
     def queue_count(self):
@@ -299,9 +346,13 @@ class TaskQueue(BaseTask):
             self.started.emit(self)
             if len(self) == 0:
                 log.warning("The task group %s is empty.", self.name)
-            for item in self:
-                # start the item (TaskQueue/Task)
-                item.start()
+
+            if self._parallel:
+                self._start_parallel()
+            else:
+                for item in self:
+                    # start the item (TaskQueue/Task)
+                    item.start()
 
             # we are done, set the task queue state accordingly
             with self._lock:
@@ -314,6 +365,64 @@ class TaskQueue(BaseTask):
             # trigger the "completed" signals
             self.completed.emit(self)
 
+    def _start_parallel(self):
+        """Start the items of the queue in a pool of threads.
+
+        No more items are started after a failure. The first raised
+        exception is raised again once the running items are finished.
+        """
+        with self._lock:
+            waiting = list(self._list)
+
+        names = {item.name for item in waiting}
+        for item in waiting:
+            for name in item.depends_on - names:
+                log.warning("Task %s depends on an unknown task %s.", item.name, name)
+
+        done = set()
+        used = set()
+        running = {}
+        error = None
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers,
+                                                   thread_name_prefix=THREAD_TASK_QUEUE) as pool:
+            while waiting or running:
+                if error is None:
+                    blocked = set()
+
+                    for item in list(waiting):
+                        ready = not (item.depends_on & names) - done
+                        free = not item.resources & (used | blocked)
+
+                        if ready and free:
+                            waiting.remove(item)
+                            used |= item.resources
+                            running[pool.submit(item.start)] = item
+                        else:
+                            blocked |= item.resources
+
+                if not running:
+                    if error is None:
+                        # The waiting items wait for each other.
+                        raise ValueError("Can't start tasks {} of the task queue {}.".format(
+                            ", ".join(item.name for item in waiting), self.name))
+                    break
+
+                finished, _pending = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+
+                for future in finished:
+                    item = running.pop(future)
+                    used -= item.resources
+                    done.add(item.name)
+
+                    if future.exception() and error is None:
+                        error = future.exception()
+
+        if error is not None:
+            raise error
+
     # implement the Python list "interface" and make sure parent is always
     # set to a correct value
     @synchronized
@@ -384,8 +493,9 @@ class Task(BaseTask):
     Task instances to run.
     """
 
-    def __init__(self, name, task=None, task_args=None, task_kwargs=None):
-        super().__init__(name=name)
+    def __init__(self, name, task=None, task_args=None, task_kwargs=None,
+                 depends_on=None, resources=None):
+        super().__init__(name=name, depends_on=depends_on, resources=resources)
         self._task = task
         if task_args is None:
             task_args = []
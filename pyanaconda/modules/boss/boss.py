@@ -88,14 +88,34 @@ class Boss(MainModule):
         self._module_manager.stop_modules()
         super().stop()
 
+    @property
+    def modules_ready(self):
+        """Signal emitted when all modules are ready.
+
+        FIXME: This is a temporary signal, because it provides
+        an implementation to the AnacondaBossInterface.
+        """
+        return self._module_manager.modules_ready
+
     @property
     def all_modules_available(self):
-        """Are all modules available?
+        """Are all modules available and ready?
+
+        FIXME: This is a temporary method, because it provides
+        an implementation to the AnacondaBossInterface.
+        """
+        return self._module_manager.modules_are_ready
+
+    @property
+    def modules_startup_timings(self):
+        """Return the startup timings of the ready modules.
 
         FIXME: This is a temporary method, because it provides
         an implementation to the AnacondaBossInterface.
+
+        :return: a dictionary of service names and durations in seconds
         """
-        return self._module_manager.check_modules_availability()
+        return self._module_manager.startup_timings
 
     @property
     def unprocessed_kickstart(self):
@@ -18,7 +18,7 @@
 # Red Hat, Inc.
 #
 
-from pyanaconda.dbus.interface import dbus_interface
+from pyanaconda.dbus.interface import dbus_interface, dbus_signal
 from pyanaconda.modules.common.constants.interfaces import BOSS_ANACONDA
 from pyanaconda.modules.common.constants.services import BOSS
 from pyanaconda.dbus.template import InterfaceTemplate
@@ -48,15 +48,33 @@ class AnacondaBossInterface(BossInterface):
     Used for synchronization with anaconda during transition.
     """
 
+    def connect_signals(self):
+        """Connect the signals."""
+        super().connect_signals()
+        self.implementation.modules_ready.connect(self.ModulesReady)
+
     def StartModules(self):
         """Start the kickstart modules."""
         self.implementation.start_modules()
 
     @property
     def AllModulesAvailable(self) -> Bool:
-        """Returns true if all modules are available."""
+        """Returns true if all modules are available and ready."""
         return self.implementation.all_modules_available
 
+    @dbus_signal
+    def ModulesReady(self):
+        """Signal that all modules are ready."""
+        pass
+
+    @property
+    def ModulesStartupTimings(self) -> Dict[Str, Double]:
+        """Returns the startup timings of the ready modules.
+
+        :return: a dictionary of service names and durations in seconds
+        """
+        return self.implementation.modules_startup_timings
+
     @property
     def UnprocessedKickstart(self) -> Str:
         """Returns kickstart containing parts that are not handled by any module."""
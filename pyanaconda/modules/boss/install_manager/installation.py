@@ -17,6 +17,8 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
+from pyanaconda.core.constants import BOSS_TIMING_TRACE_PATH
+from pyanaconda.core.timing import timing_trace, CATEGORY_DBUS_TASK
 from pyanaconda.modules.common.task import AbstractTask
 
 from pyanaconda.anaconda_loggers import get_module_logger
@@ -70,6 +72,7 @@ class SystemInstallationTask(AbstractTask):
 
         if not self._subtasks:
             log.info("Installation is complete.")
+            self._save_timing_trace()
             self._task_succeeded_callback()
             self._task_stopped_callback()
             return
@@ -98,8 +101,23 @@ class SystemInstallationTask(AbstractTask):
             s = self._subscriptions.pop(0)
             s.disconnect()
 
+    def _save_timing_trace(self):
+        """Save the timing of the installation tasks.
+
+        The trace is cleared when it is saved.
+        """
+        log.info("Installation timing:\n%s", timing_trace.summary())
+
+        try:
+            timing_trace.save(BOSS_TIMING_TRACE_PATH)
+        except OSError as e:
+            log.error("Failed to save the timing trace: %s", e)
+
+        timing_trace.clear()
+
     def _subtask_started_callback(self):
         log.info("'%s' has started.", self._current_subtask.Name)
+        timing_trace.start(id(self._current_subtask))
 
     def _subtask_failed_callback(self):
         log.info("'%s' has failed.", self._current_subtask.Name)
@@ -108,6 +126,8 @@ class SystemInstallationTask(AbstractTask):
 
     def _subtask_stopped_callback(self):
         log.info("'%s' has stopped.", self._current_subtask.Name)
+        timing_trace.stop(id(self._current_subtask), self._current_subtask.Name,
+                          CATEGORY_DBUS_TASK)
         self._finished_steps += self._current_subtask.Steps
         self._task_run_callback()
 
@@ -16,6 +16,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
+import concurrent.futures
+
+from pyanaconda.core.constants import THREAD_KICKSTART_DISTRIBUTION
 from pyanaconda.modules.common.errors.kickstart import SplitKickstartSectionParsingError, \
     SplitKickstartMissingIncludeError
 from pyanaconda.modules.boss.kickstart_manager.parser import SplitKickstartParser,\
@@ -36,6 +39,7 @@ class KickstartManager(object):
         self._kickstart_path = None
         self._elements = None
         self._module_observers = []
+        self._capabilities = {}
 
     @property
     def module_observers(self):
@@ -50,6 +54,7 @@ class KickstartManager(object):
         :type modules: list(DBusObjectObserver)
         """
         self._module_observers = modules
+        self._capabilities = {}
 
     @property
     def elements(self):
@@ -76,13 +81,18 @@ class KickstartManager(object):
         self._elements = result
 
     def distribute(self):
-        """Distribute split kickstart to modules synchronously.
+        """Distribute split kickstart to modules.
+
+        The capabilities of the modules are fetched only once and the
+        modules read their kickstarts concurrently. The method returns
+        when all modules have read their kickstarts.
 
         :returns: list of (Line number, Message) errors reported by modules when
                   distributing kickstart
         :rtype: list((int, str))
         """
         errors = []
+        observers = []
 
         for observer in self._module_observers:
 
@@ -90,35 +100,81 @@ class KickstartManager(object):
                 log.warning("distribute kickstart: module %s not available", observer.service_name)
                 continue
 
-            commands = observer.proxy.KickstartCommands
-            sections = observer.proxy.KickstartSections
-            addons = observer.proxy.KickstartAddons
-            log.info("distribute kickstart: %s handles commands %s sections %s addons %s",
-                     observer.service_name, commands, sections, addons)
+            observers.append(observer)
 
-            elements = self._elements.get_and_process_elements(commands=commands,
-                                                               sections=sections,
-                                                               addons=addons)
-            kickstart = self._elements.get_kickstart_from_elements(elements)
+        if not observers:
+            return errors
 
-            if not kickstart:
-                log.info("distribute kickstart: there are no data for %s", observer.service_name)
-                continue
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=len(observers),
+                thread_name_prefix=THREAD_KICKSTART_DISTRIBUTION) as pool:
+
+            # Fetch the capabilities of the modules.
+            capabilities = self._get_capabilities(pool, observers)
+
+            # Split the kickstart and send the parts to the modules.
+            futures = []
+
+            for observer in observers:
+                commands, sections, addons = capabilities[observer]
+                log.info("distribute kickstart: %s handles commands %s sections %s addons %s",
+                         observer.service_name, commands, sections, addons)
+
+                elements = self._elements.get_and_process_elements(commands=commands,
+                                                                   sections=sections,
+                                                                   addons=addons)
+                kickstart = self._elements.get_kickstart_from_elements(elements)
+
+                if not kickstart:
+                    log.info("distribute kickstart: there are no data for %s",
+                             observer.service_name)
+                    continue
 
-            result = observer.proxy.ReadKickstart(kickstart)
+                future = pool.submit(observer.proxy.ReadKickstart, kickstart)
+                futures.append((observer, elements, future))
 
-            if not result["success"]:
-                line_references = self._elements.get_references_from_elements(elements)
-                line_number, file_name = line_references[result["line_number"]]
-                result["line_number"] = line_number
-                result["file_name"] = file_name
-                result["module_name"] = observer.service_name
+            # Collect the results in the order of modules.
+            for observer, elements, future in futures:
+                result = future.result()
 
-                log.error("distribute kickstart: %s", result)
-                errors.append(result)
+                if not result["success"]:
+                    line_references = self._elements.get_references_from_elements(elements)
+                    line_number, file_name = line_references[result["line_number"]]
+                    result["line_number"] = line_number
+                    result["file_name"] = file_name
+                    result["module_name"] = observer.service_name
+
+                    log.error("distribute kickstart: %s", result)
+                    errors.append(result)
 
         return errors
 
+    def _get_capabilities(self, pool, observers):
+        """Get kickstart commands, sections and addons handled by modules.
+
+        The capabilities of a module don't change, so they are fetched
+        only for modules we haven't seen yet.
+
+        :param pool: an executor for fetching the capabilities
+        :param observers: a list of module observers
+        :return: a dictionary of observers and tuples (commands, sections, addons)
+        """
+        futures = {
+            observer: pool.submit(self._fetch_capabilities, observer)
+            for observer in observers if observer not in self._capabilities
+        }
+
+        for observer, future in futures.items():
+            self._capabilities[observer] = future.result()
+
+        return {observer: self._capabilities[observer] for observer in observers}
+
+    @staticmethod
+    def _fetch_capabilities(observer):
+        """Fetch kickstart commands, sections and addons handled by a module."""
+        proxy = observer.proxy
+        return proxy.KickstartCommands, proxy.KickstartSections, proxy.KickstartAddons
+
     def collect(self):
         """Collect kickstarts from configured modules."""
         pass
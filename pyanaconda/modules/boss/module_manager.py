@@ -16,6 +16,11 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
+import time
+import concurrent.futures
+
+from pyanaconda.core.constants import THREAD_MODULES_STOP
+from pyanaconda.core.signal import Signal
 from pyanaconda.dbus import DBus
 from pyanaconda.dbus.constants import DBUS_START_REPLY_SUCCESS, DBUS_FLAG_NONE
 from pyanaconda.dbus.namespace import get_dbus_name, get_namespace_from_name, get_dbus_path
@@ -26,16 +31,38 @@ log = get_module_logger(__name__)
 
 
 class ModuleManager(object):
-    """A class for managing kickstart modules."""
+    """A class for managing kickstart modules.
+
+    All modules are started at once. A module is ready when it is
+    available on the bus and has answered the ping. Once all modules
+    are ready, the modules_ready signal is emitted.
+    """
 
     def __init__(self):
         self._module_observers = []
+        self._start_times = {}
+        self._startup_timings = {}
+        self._ready = False
+        self.modules_ready = Signal()
 
     @property
     def module_observers(self):
         """Return the modules observers."""
         return self._module_observers
 
+    @property
+    def modules_are_ready(self):
+        """Are all started modules ready?"""
+        return self._ready
+
+    @property
+    def startup_timings(self):
+        """Return the startup timings of the ready modules.
+
+        :return: a dictionary of service names and durations in seconds
+        """
+        return dict(self._startup_timings)
+
     def add_module(self, service_name):
         """Add a modules with the given service name."""
         # Get the object path.
@@ -57,12 +84,22 @@ class ModuleManager(object):
                 self.add_module(service_name)
 
     def start_modules(self):
-        """Start anaconda modules (including addons)."""
+        """Start anaconda modules (including addons).
+
+        The modules are started asynchronously. Use the modules_ready
+        signal or the modules_are_ready property to find out when they
+        are ready.
+        """
         log.debug("Start modules.")
         dbus = DBus.get_dbus_proxy()
 
+        self._start_times = {}
+        self._startup_timings = {}
+        self._ready = False
+
         for observer in self.module_observers:
             log.debug("Starting %s", observer)
+            self._start_times[observer.service_name] = time.perf_counter()
             dbus.StartServiceByName(observer.service_name,
                                     DBUS_FLAG_NONE,
                                     callback=self._start_modules_callback,
@@ -73,6 +110,9 @@ class ModuleManager(object):
             observer.service_unavailable.connect(self._process_module_is_unavailable)
             observer.connect_once_available()
 
+        # There might be nothing to wait for.
+        self._check_modules_readiness()
+
     def _start_modules_callback(self, service, returned, error):
         """Callback for start_modules."""
         if error:
@@ -84,37 +124,71 @@ class ModuleManager(object):
         else:
             log.debug("Service %s started successfully.", service)
 
-        if self.check_modules_availability():
-            log.info("All modules are ready now.")
-
     def _process_module_is_available(self, observer):
         """Process the service_available signal."""
         log.debug("%s is available", observer)
-        observer.proxy.Ping()
+        observer.proxy.Ping(callback=self._ping_callback,
+                            callback_args=(observer,))
+
+    def _ping_callback(self, observer, returned, error):
+        """Callback for the ping of a module."""
+        if error:
+            log.error("Service %s failed to answer the ping: %s", observer, error)
+            return
+
+        service_name = observer.service_name
+
+        if service_name not in self._startup_timings and service_name in self._start_times:
+            duration = time.perf_counter() - self._start_times[service_name]
+            self._startup_timings[service_name] = duration
+            log.debug("%s is ready in %.3f s", observer, duration)
+
+        self._check_modules_readiness()
 
     def _process_module_is_unavailable(self, observer):
         """Process the service_unavailable signal."""
         log.debug("%s is unavailable", observer)
 
-    def check_modules_availability(self):
-        """Check if all modules are available.
+    def _check_modules_readiness(self):
+        """Emit the modules_ready signal if all modules are ready."""
+        if self._ready:
+            return
 
-        :returns: True if all modules are available, otherwise False
-        """
         for observer in self.module_observers:
-            if not observer.is_service_available:
-                return False
+            if observer.service_name not in self._startup_timings:
+                return
 
-        return True
+        log.info("All modules are ready now.")
+
+        if self._startup_timings:
+            log.info("Modules startup took %.3f s: %s", max(self._startup_timings.values()),
+                     ", ".join("%s %.3f s" % t for t in sorted(self._startup_timings.items())))
+
+        self._ready = True
+        self.modules_ready.emit()
 
     def stop_modules(self):
-        """Tell all running modules to quit."""
+        """Tell all running modules to quit.
+
+        The modules are asked to quit concurrently. The method
+        returns when all of them have quit.
+        """
         log.debug("Stop modules.")
-        for observer in self.module_observers:
-            if not observer.is_service_available:
-                continue
+        observers = [o for o in self.module_observers if o.is_service_available]
+
+        if not observers:
+            return
 
-            # Call synchronously, because we need to wait for the
-            # modules to quit before the boss can quit itself.
-            observer.proxy.Quit()
-            log.debug("%s has quit.", observer)
+        # Call synchronously, because we need to wait for the
+        # modules to quit before the boss can quit itself.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(observers),
+                                                   thread_name_prefix=THREAD_MODULES_STOP) as pool:
+            futures = [(o, pool.submit(o.proxy.Quit)) for o in observers]
+
+            for observer, future in futures:
+                try:
+                    future.result()
+                except Exception as e:  # pylint: disable=broad-except
+                    log.error("%s has failed to quit: %s", observer, e)
+                else:
+                    log.debug("%s has quit.", observer)
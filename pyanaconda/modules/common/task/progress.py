@@ -18,8 +18,8 @@
 from abc import ABC, abstractmethod
 from threading import Lock
 
+from pyanaconda.core.progress_channel import ProgressChannel
 from pyanaconda.core.signal import Signal
-from pyanaconda.core.async_utils import async_action_nowait
 
 __all__ = ['ProgressReporter']
 
@@ -30,6 +30,7 @@ class ProgressReporter(ABC):
     def __init__(self):
         super().__init__()
         self._progress_changed_signal = Signal()
+        self._progress_channel = ProgressChannel(self._progress_changed_signal.emit)
 
         self.__progress_lock = Lock()
         self.__progress_step = 0
@@ -55,7 +56,6 @@ class ProgressReporter(ABC):
         """Signal emits when the progress of the task changes."""
         return self._progress_changed_signal
 
-    @async_action_nowait
     def report_progress(self, message, step_number=None, step_size=None):
         """Report a progress change.
 
@@ -63,7 +63,9 @@ class ProgressReporter(ABC):
         step will never be higher then self.steps and lower then the current
         step. By default, the step doesn't change.
 
-        This is a thread safe method.
+        This is a thread safe method. The signal is emitted in the main loop.
+        Changes reported from other threads are merged and the signal is
+        emitted only for the latest of them, at most at the configured rate.
 
         :param message: Short description of the actual step.
         :type message: str
@@ -92,4 +94,11 @@ class ProgressReporter(ABC):
             self.__progress_step = step
             self.__progress_msg = message
 
-        self._progress_changed_signal.emit(step, message)
+        self._progress_channel.send(step, message)
+
+    def flush_progress(self):
+        """Emit the progress changed signal for the latest change now.
+
+        Call this method in the main loop.
+        """
+        self._progress_channel.flush()
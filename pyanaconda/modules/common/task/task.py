@@ -23,6 +23,7 @@
 import traceback
 from abc import abstractmethod
 
+from pyanaconda.core.async_utils import async_action_nowait
 from pyanaconda.core.constants import THREAD_DBUS_TASK
 from pyanaconda.modules.common.task.cancellable import Cancellable
 from pyanaconda.modules.common.task.progress import ProgressReporter
@@ -39,6 +40,12 @@ __all__ = ['AbstractTask', 'Task']
 class AbstractTask(Runnable, Cancellable, ProgressReporter, ResultProvider):
     """Abstract class for running a long-term task."""
 
+    @async_action_nowait
+    def _task_stopped_callback(self):
+        """Report the latest progress before the task stops."""
+        self.flush_progress()
+        super()._task_stopped_callback()
+
     @property
     @abstractmethod
     def name(self):
@@ -23,7 +23,7 @@ from pyanaconda.dbus.property import emits_properties_changed
 from pyanaconda.dbus.typing import *  # pylint: disable=wildcard-import
 from pyanaconda.modules.common.base import KickstartModuleInterface
 from pyanaconda.dbus.interface import dbus_interface, dbus_signal
-from pyanaconda.dbus.structure import get_structure
+from pyanaconda.dbus.structure import get_structure, get_structures
 
 
 @dbus_interface(NETWORK.interface_name)
@@ -147,7 +147,7 @@ class NetworkInterface(KickstartModuleInterface):
         their uuid.
         """
         dev_cfgs = self.implementation.get_device_configurations()
-        return [get_structure(dev_cfg) for dev_cfg in dev_cfgs]
+        return get_structures(dev_cfgs)
 
     def _device_configurations_changed(self, changes):
         self.DeviceConfigurationChanged([(get_structure(old), get_structure(new))
@@ -21,6 +21,7 @@ from abc import abstractmethod
 
 from pyanaconda.modules.common.base.base import KickstartBaseModule
 from pyanaconda.modules.common.errors.storage import UnavailableStorageError
+from pyanaconda.storage.snapshot import copy_storage
 from pyanaconda.anaconda_loggers import get_module_logger
 
 log = get_module_logger(__name__)
@@ -50,12 +51,19 @@ class PartitioningModule(KickstartBaseModule):
             raise UnavailableStorageError()
 
         if self._storage_playground is None:
-            self._storage_playground = self._current_storage.copy()
+            self._storage_playground = copy_storage(self._current_storage)
 
         return self._storage_playground
 
     def on_storage_reset(self, storage):
-        """Keep the instance of the current storage."""
+        """Keep the instance of the current storage.
+
+        If the storage model of this module became the current storage,
+        the module will create a new copy when it needs one again.
+        """
+        if storage is self._storage_playground:
+            self._storage_playground = None
+
         self._current_storage = storage
 
     @abstractmethod
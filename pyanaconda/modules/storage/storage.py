@@ -42,6 +42,7 @@ from pyanaconda.modules.storage.snapshot import SnapshotModule
 from pyanaconda.modules.storage.storage_interface import StorageInterface
 from pyanaconda.modules.storage.zfcp import ZFCPModule
 from pyanaconda.storage.initialization import enable_installer_mode, create_storage
+from pyanaconda.storage.snapshot import copy_storage
 
 from pyanaconda.anaconda_loggers import get_module_logger
 log = get_module_logger(__name__)
@@ -182,8 +183,9 @@ class StorageModule(KickstartModule):
 
         :return: a DBus path to a task
         """
-        # Copy the storage.
-        storage = self.storage.copy()
+        # Copy the storage. The devices have to be copied too,
+        # because the reset saves the passphrases of LUKS devices.
+        storage = copy_storage(self.storage)
 
         # Set up the storage.
         storage.ignored_disks = self._disk_selection_module.ignored_disks
@@ -216,8 +218,9 @@ class StorageModule(KickstartModule):
         task = StorageValidateTask(storage)
         task.run()
 
-        # Apply the partitioning.
-        self.set_storage(storage.copy())
+        # Apply the partitioning. The storage model is not copied,
+        # the module will create a new copy when it needs one again.
+        self.set_storage(storage)
         log.debug("Applied the partitioning from %s.", object_path)
 
     def install_with_tasks(self, sysroot):
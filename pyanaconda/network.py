@@ -452,30 +452,25 @@ def wait_for_connected_NM(timeout=constants.NETWORK_CONNECTION_TIMEOUT, only_con
     else:
         log.debug("waiting for connected NM, timeout=%d", timeout)
 
-    i = 0
-    while i < timeout:
-        i += constants.NETWORK_CONNECTED_CHECK_INTERVAL
-        time.sleep(constants.NETWORK_CONNECTED_CHECK_INTERVAL)
-        if network_proxy.Connected:
-            log.debug("NM connected, waited %d seconds", i)
-            return True
-        elif only_connecting:
-            if not network_proxy.IsConnecting():
-                break
+    def nm_finished():
+        state = nm.nm_state()
+        return nm_state_connected(state) or (only_connecting and state != NM.State.CONNECTING)
+
+    start = time.monotonic()
+    nm.nm_wait_for(nm_finished, timeout)
+    waited = time.monotonic() - start
+
+    if nm_state_connected(nm.nm_state()):
+        log.debug("NM connected, waited %d seconds", waited)
+        return True
 
-    log.debug("NM not connected, waited %d seconds", i)
+    log.debug("NM not connected, waited %d seconds", waited)
     return False
 
 def wait_for_network_devices(devices, timeout=constants.NETWORK_CONNECTION_TIMEOUT):
     devices = set(devices)
-    i = 0
     log.debug("waiting for connection of devices %s for iscsi", devices)
-    while i < timeout:
-        if not devices - set(nm.nm_activated_devices()):
-            return True
-        i += 1
-        time.sleep(1)
-    return False
+    return nm.nm_wait_for(lambda: not devices - set(nm.nm_activated_devices()), timeout)
 
 def wait_for_connecting_NM_thread():
     """Wait for connecting NM in thread, do some work and signal connectivity.
@@ -627,6 +622,14 @@ def default_ks_vlan_interface_name(parent, vlanid):
 def is_using_team_device():
     return any(nm.nm_device_type_is_team(d) for d in nm.nm_devices())
 
+def nm_state_connected(state):
+    """Is the state of NetworkManager connected?
+
+    :param state: a state of NetworkManager
+    :return: True if the state is one of the connected states
+    """
+    return state in (NM.State.CONNECTED_LOCAL, NM.State.CONNECTED_SITE, NM.State.CONNECTED_GLOBAL)
+
 def is_libvirt_device(iface):
     return iface and iface.startswith("virbr")
 
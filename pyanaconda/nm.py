@@ -23,9 +23,13 @@ gi.require_version("NM", "1.0")
 
 from gi.repository import Gio
 from gi.repository import NM
-from pyanaconda.core.glib import GError, VariantType
+from pyanaconda.core.glib import GError, Variant, VariantType, MainLoop, create_new_context
 import struct
 import socket
+import threading
+import time
+
+from pyanaconda.core.constants import THREAD_NM_MODEL
 
 from pyanaconda.anaconda_loggers import get_module_logger
 log = get_module_logger(__name__)
@@ -45,6 +49,10 @@ supported_device_types = [
 DEFAULT_PROXY_FLAGS = \
     Gio.DBusProxyFlags.DO_NOT_CONNECT_SIGNALS | Gio.DBusProxyFlags.DO_NOT_LOAD_PROPERTIES
 
+NM_SERVICE = "org.freedesktop.NetworkManager"
+NM_OBJECT_PATH = "/org/freedesktop/NetworkManager"
+NM_OBJECT_MANAGER_PATH = "/org/freedesktop"
+
 class UnknownDeviceError(ValueError):
     """Device of specified name was not found by NM"""
     def __str__(self):
@@ -89,24 +97,344 @@ def _get_proxy(bus_type=Gio.BusType.SYSTEM,
 
     return proxy
 
-def _get_property(object_path, prop, interface_name_suffix=""):
-    interface_name = "org.freedesktop.NetworkManager" + interface_name_suffix
-    proxy = _get_proxy(object_path=object_path, interface_name="org.freedesktop.DBus.Properties")
-    if not proxy:
-        return None
+class NMModel(object):
+    """Cached model of NetworkManager objects.
 
-    try:
-        prop = proxy.Get('(ss)', interface_name, prop)
-    except GError as e:
-        if ("org.freedesktop.DBus.Error.AccessDenied" in e.message or
-            "org.freedesktop.DBus.Error.InvalidArgs" in e.message):
+    The properties of an object are fetched with one GetAll call per
+    interface when they are needed for the first time. The cached
+    properties are kept fresh by the PropertiesChanged signals and
+    dropped when the object is removed or NetworkManager is restarted.
+
+    The signals are dispatched in a separate thread with its own main
+    context, so the model doesn't depend on a running main loop of the
+    user interface.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._generation = 0
+        self._started = False
+        self._connection = None
+        self._properties = {}
+        self._interfaces = {}
+        self._changes = {}
+
+    def _connect(self):
+        """Connect to the system bus.
+
+        :return: a DBus connection or None
+        """
+        try:
+            return Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+        except GError as e:
+            if conf.system.provides_system_bus:
+                raise
+
+            log.error("NM model failed to connect: %s", e)
             return None
-        elif "org.freedesktop.DBus.Error.UnknownMethod" in e.message:
-            raise UnknownMethodGetError
-        else:
-            raise
 
-    return prop
+    def _get_connection(self):
+        """Get a connection to the system bus.
+
+        Start to dispatch the signals on the first call.
+
+        :return: a DBus connection or None
+        """
+        with self._lock:
+            if not self._started:
+                self._connection = self._connect()
+                self._started = True
+
+                if self._connection:
+                    self._start_dispatching(self._connection)
+
+            return self._connection
+
+    def _start_dispatching(self, connection):
+        """Start to dispatch the signals in a new thread."""
+        ready = threading.Event()
+        thread = threading.Thread(name=THREAD_NM_MODEL, target=self._run_dispatching,
+                                  args=(connection, ready), daemon=True)
+        thread.start()
+        ready.wait()
+
+    def _run_dispatching(self, connection, ready):
+        """Subscribe to the signals and dispatch them."""
+        try:
+            context = create_new_context()
+            context.push_thread_default()
+            self._subscribe(connection)
+        finally:
+            ready.set()
+
+        MainLoop(context).run()
+
+    def _subscribe(self, connection):
+        """Subscribe to the signals of NetworkManager."""
+        connection.signal_subscribe(
+            NM_SERVICE, "org.freedesktop.DBus.Properties", "PropertiesChanged",
+            None, None, Gio.DBusSignalFlags.NONE, self._properties_changed_callback
+        )
+        connection.signal_subscribe(
+            NM_SERVICE, "org.freedesktop.DBus.ObjectManager", "InterfacesRemoved",
+            NM_OBJECT_MANAGER_PATH, None, Gio.DBusSignalFlags.NONE,
+            self._interfaces_removed_callback
+        )
+        connection.signal_subscribe(
+            "org.freedesktop.DBus", "org.freedesktop.DBus", "NameOwnerChanged",
+            "/org/freedesktop/DBus", NM_SERVICE, Gio.DBusSignalFlags.NONE,
+            self._name_owner_changed_callback
+        )
+
+    def _properties_changed_callback(self, connection, sender, object_path, interface_name,
+                                     signal_name, parameters):
+        """Update the cached properties of the object."""
+        changed_interface, changed, invalidated = parameters.unpack()
+        key = (object_path, changed_interface)
+
+        with self._lock:
+            self._changes[object_path] = self._changes.get(object_path, 0) + 1
+            self._notify_changed()
+            properties = self._properties.get(key)
+
+            if properties is None:
+                return
+
+            if invalidated:
+                del self._properties[key]
+                return
+
+            properties.update(changed)
+
+    def _interfaces_removed_callback(self, connection, sender, object_path, interface_name,
+                                     signal_name, parameters):
+        """Drop the cached properties of the removed object."""
+        removed_path, removed_interfaces = parameters.unpack()
+
+        with self._lock:
+            self._changes[removed_path] = self._changes.get(removed_path, 0) + 1
+            self._notify_changed()
+            self._interfaces.pop(removed_path, None)
+
+            for removed_interface in removed_interfaces:
+                self._properties.pop((removed_path, removed_interface), None)
+
+    def _name_owner_changed_callback(self, connection, sender, object_path, interface_name,
+                                     signal_name, parameters):
+        """Drop all cached properties if NetworkManager is restarted."""
+        log.debug("NetworkManager owner changed, dropping the NM model.")
+        self.reset()
+
+    def reset(self):
+        """Drop all cached properties."""
+        with self._lock:
+            self._properties = {}
+            self._interfaces = {}
+            self._changes = {}
+            self._notify_changed()
+
+    def _notify_changed(self):
+        """Wake up the threads waiting for a change."""
+        self._generation += 1
+        self._changed.notify_all()
+
+    def wait_for(self, condition, timeout):
+        """Wait for a condition on the state of NetworkManager.
+
+        The condition is checked again every time the model receives
+        a signal about a change, so the waiting thread wakes up as soon
+        as the condition is satisfied. Check the model in the condition.
+
+        :param condition: a function that returns True if satisfied
+        :param timeout: a timeout in seconds
+        :return: True if the condition was satisfied, otherwise False
+        """
+        deadline = time.monotonic() + timeout
+
+        # Subscribe to the signals before the first check.
+        if not self._get_connection():
+            return bool(condition())
+
+        while True:
+            with self._lock:
+                generation = self._generation
+
+            if condition():
+                return True
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            with self._changed:
+                if self._generation == generation:
+                    self._changed.wait(remaining)
+
+    def get_properties(self, object_path, interface_name):
+        """Get the properties of the object.
+
+        :param object_path: a DBus path of the object
+        :param interface_name: a name of the DBus interface
+        :return: a dictionary of unpacked properties or None
+        :raise UnknownMethodGetError: if the object doesn't exist
+        """
+        connection = self._get_connection()
+
+        if not connection:
+            return None
+
+        key = (object_path, interface_name)
+
+        with self._lock:
+            properties = self._properties.get(key)
+            changes = self._changes.get(object_path, 0)
+
+        if properties is not None:
+            return properties
+
+        try:
+            result = connection.call_sync(NM_SERVICE,
+                                          object_path,
+                                          "org.freedesktop.DBus.Properties",
+                                          "GetAll",
+                                          Variant("(s)", (interface_name,)),
+                                          VariantType.new("(a{sv})"),
+                                          Gio.DBusCallFlags.NONE,
+                                          -1,
+                                          None)
+        except GError as e:
+            if ("org.freedesktop.DBus.Error.AccessDenied" in e.message or
+                "org.freedesktop.DBus.Error.InvalidArgs" in e.message):
+                return None
+            elif "org.freedesktop.DBus.Error.UnknownMethod" in e.message:
+                raise UnknownMethodGetError
+            else:
+                raise
+
+        properties = result.unpack()[0]
+
+        with self._lock:
+            # Don't cache the properties if they changed during the call.
+            if self._changes.get(object_path, 0) == changes:
+                self._properties[key] = properties
+
+        return properties
+
+    def get_property(self, object_path, prop, interface_name):
+        """Get a property of the object.
+
+        :param object_path: a DBus path of the object
+        :param prop: a name of the property
+        :param interface_name: a name of the DBus interface
+        :return: an unpacked value of the property or None
+        :raise UnknownMethodGetError: if the object doesn't exist
+        """
+        properties = self.get_properties(object_path, interface_name)
+
+        if not properties:
+            return None
+
+        return properties.get(prop)
+
+    def get_interfaces(self, object_path):
+        """Get names of the interfaces of the object.
+
+        The interfaces of an object don't change, so they are
+        introspected only once.
+
+        :param object_path: a DBus path of the object
+        :return: a list of interface names
+        """
+        with self._lock:
+            interfaces = self._interfaces.get(object_path)
+
+        if interfaces is not None:
+            return interfaces
+
+        connection = self._get_connection()
+
+        if not connection:
+            return []
+
+        res_xml = connection.call_sync(NM_SERVICE,
+                                       object_path,
+                                       "org.freedesktop.DBus.Introspectable",
+                                       "Introspect",
+                                       None,
+                                       VariantType.new("(s)"),
+                                       Gio.DBusCallFlags.NONE,
+                                       -1,
+                                       None)
+        node_info = Gio.DBusNodeInfo.new_for_xml(res_xml.unpack()[0])
+        interfaces = [iface.name for iface in node_info.interfaces]
+
+        with self._lock:
+            self._interfaces[object_path] = interfaces
+
+        return interfaces
+
+    def get_devices(self):
+        """Get DBus paths of the network devices.
+
+        :return: a list of DBus paths
+        """
+        return self.get_property(NM_OBJECT_PATH, "Devices", NM_SERVICE) or []
+
+    def get_device_by_ip_iface(self, name):
+        """Get a DBus path of the network device.
+
+        :param name: an IP interface name of the device
+        :return: a DBus path
+        :raise UnknownDeviceError: if device is not found
+        """
+        for device in self.get_devices():
+            try:
+                properties = self.get_properties(device, NM_SERVICE + ".Device") or {}
+            # the device was removed (racy)
+            except UnknownMethodGetError:
+                continue
+
+            if (properties.get("IpInterface") or properties.get("Interface")) == name:
+                return device
+
+        raise UnknownDeviceError(name)
+
+
+_nm_model = None
+_nm_model_lock = threading.Lock()
+
+
+def get_nm_model():
+    """Get the cached model of NetworkManager objects.
+
+    :return: an instance of NMModel
+    """
+    global _nm_model
+
+    with _nm_model_lock:
+        if _nm_model is None:
+            _nm_model = NMModel()
+
+        return _nm_model
+
+
+def nm_wait_for(condition, timeout):
+    """Wait for a condition on the state of NetworkManager.
+
+    The condition is checked again on every change reported by
+    NetworkManager, not periodically.
+
+    :param condition: a function that returns True if satisfied
+    :param timeout: a timeout in seconds
+    :return: True if the condition was satisfied, otherwise False
+    """
+    return get_nm_model().wait_for(condition, timeout)
+
+
+def _get_property(object_path, prop, interface_name_suffix=""):
+    interface_name = NM_SERVICE + interface_name_suffix
+    return get_nm_model().get_property(object_path, prop, interface_name)
 
 def nm_state():
     """Return state of NetworkManager
@@ -131,13 +459,13 @@ def nm_devices():
 
     interfaces = []
 
-    proxy = _get_proxy()
-    if not proxy:
-        return []
-
-    devices = proxy.GetDevices()
+    devices = get_nm_model().get_devices()
     for device in devices:
-        device_type = _get_property(device, "DeviceType", ".Device")
+        try:
+            device_type = _get_property(device, "DeviceType", ".Device")
+        # the device was removed (racy)
+        except UnknownMethodGetError:
+            continue
         if device_type not in supported_device_types:
             continue
         iface = _get_property(device, "Interface", ".Device")
@@ -175,18 +503,7 @@ def nm_activated_devices():
     return interfaces
 
 def _get_object_iface_names(object_path):
-    connection = Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
-    res_xml = connection.call_sync("org.freedesktop.NetworkManager",
-                                   object_path,
-                                   "org.freedesktop.DBus.Introspectable",
-                                   "Introspect",
-                                   None,
-                                   VariantType.new("(s)"),
-                                   Gio.DBusCallFlags.NONE,
-                                   -1,
-                                   None)
-    node_info = Gio.DBusNodeInfo.new_for_xml(res_xml[0])
-    return [iface.name for iface in node_info.interfaces]
+    return get_nm_model().get_interfaces(object_path)
 
 def _device_type_specific_interface(device):
     ifaces = _get_object_iface_names(device)
@@ -211,14 +528,7 @@ def nm_device_property(name, prop):
 
     retval = None
 
-    proxy = _get_proxy()
-    try:
-        device = proxy.GetDeviceByIpIface('(s)', name)
-    except GError as e:
-        if "org.freedesktop.NetworkManager.UnknownDevice" in e.message:
-            raise UnknownDeviceError(name, e)
-        raise
-
+    device = get_nm_model().get_device_by_ip_iface(name)
     retval = _get_property(device, prop, ".Device")
     if not retval:
         # Look in device type based interface
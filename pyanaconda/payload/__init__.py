@@ -52,6 +52,7 @@ from pyanaconda.core.util import ProxyString, ProxyStringError
 from pyanaconda.threading import threadMgr, AnacondaThread
 from pyanaconda.core.regexes import VERSION_DIGITS
 from pyanaconda.payload.install_tree_metadata import InstallTreeMetadata
+from pyanaconda.payload.initrd_builder import InitrdBuilder
 
 from pykickstart.parser import Group
 
@@ -821,6 +822,10 @@ class Payload(object):
         This needs to be done after all configuration files have been
         written, since dracut depends on some of them.
 
+        The initrds of different kernels are created concurrently if
+        dracut is used. The new-kernel-pkg tool updates the bootloader
+        configuration, so it has to be called for one kernel at a time.
+
         :returns: None
         """
         if os.path.exists(util.getSysroot() + "/usr/sbin/new-kernel-pkg"):
@@ -829,39 +834,47 @@ class Payload(object):
             log.warning("new-kernel-pkg does not exist - grubby wasn't installed?  using dracut instead.")
             useDracut = True
 
+        if useDracut or conf.target.is_image:
+            builder = InitrdBuilder(N_("Generating initramfs for %s"))
+        else:
+            builder = InitrdBuilder(N_("Generating initramfs for %s"), max_workers=1)
+
         for kernel in self.kernelVersionList:
             log.info("recreating initrd for %s", kernel)
             if not conf.target.is_image:
                 if useDracut:
-                    util.execInSysroot("depmod", ["-a", kernel])
-                    util.execInSysroot("dracut",
-                                       ["-H", "--persistent-policy", "by-uuid",
-                                        "-f",
-                                        "/boot/initramfs-%s.img" % kernel,
-                                        kernel])
+                    builder.add_job(kernel, [
+                        ("depmod", ["-a", kernel]),
+                        ("dracut", ["-H", "--persistent-policy", "by-uuid",
+                                    "-f",
+                                    "/boot/initramfs-%s.img" % kernel,
+                                    kernel])
+                    ])
                 else:
-                    util.execInSysroot("new-kernel-pkg",
-                                       ["--mkinitrd", "--dracut", "--depmod",
-                                        "--update", kernel])
-
-                # if the installation is running in fips mode then make sure
-                # fips is also correctly enabled in the installed system
-                if flags.cmdline.get("fips") == "1":
-                    # We use the --no-bootcfg option as we don't want fips-mode-setup to
-                    # modify the bootloader configuration.
-                    # Anaconda already does everything needed & it would require gruby to
-                    # be available on the system.
-                    util.execInSysroot("fips-mode-setup", ["--enable", "--no-bootcfg"])
-
+                    builder.add_job(kernel, [
+                        ("new-kernel-pkg", ["--mkinitrd", "--dracut", "--depmod",
+                                            "--update", kernel])
+                    ])
             else:
                 # hostonly is not sensible for disk image installations
                 # using /dev/disk/by-uuid/ is necessary due to disk image naming
-                util.execInSysroot("dracut",
-                                   ["-N",
-                                     "--persistent-policy", "by-uuid",
-                                     "-f", "/boot/initramfs-%s.img" % kernel,
-                                    kernel])
-
+                builder.add_job(kernel, [
+                    ("dracut", ["-N",
+                                "--persistent-policy", "by-uuid",
+                                "-f", "/boot/initramfs-%s.img" % kernel,
+                                kernel])
+                ])
+
+        builder.run()
+
+        # if the installation is running in fips mode then make sure
+        # fips is also correctly enabled in the installed system
+        if not conf.target.is_image and self.kernelVersionList and flags.cmdline.get("fips") == "1":
+            # We use the --no-bootcfg option as we don't want fips-mode-setup to
+            # modify the bootloader configuration.
+            # Anaconda already does everything needed & it would require gruby to
+            # be available on the system.
+            util.execInSysroot("fips-mode-setup", ["--enable", "--no-bootcfg"])
 
     def _setDefaultBootTarget(self):
         """Set the default systemd target for the system."""
@@ -0,0 +1,155 @@
+# Index of the comps data.
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import locale
+import threading
+
+from pyanaconda.anaconda_loggers import get_packaging_logger
+log = get_packaging_logger()
+
+__all__ = ["CompsIndex"]
+
+
+class CompsIndex(object):
+    """Index of environments and groups of the comps data.
+
+    The index is built once from the comps data, so the lookups don't
+    have to match patterns against all environments and groups. Lookups
+    of anything else than an id or a name fall back to the comps data
+    and their results are remembered.
+
+    The translated names and descriptions depend on the current locale,
+    so they are remembered per locale.
+    """
+
+    def __init__(self, comps):
+        """Create a new index.
+
+        :param comps: an instance of dnf.comps.Comps
+        """
+        self._comps = comps
+        self._lock = threading.Lock()
+
+        self._environments = {}
+        self._environment_ids = []
+        self._environment_names = {}
+        self._options = {}
+
+        self._groups = {}
+        self._group_ids = []
+        self._group_names = {}
+        self._visible = {}
+        self._lang_only = {}
+
+        self._patterns = {}
+        self._descriptions = {}
+
+        for env in comps.environments:
+            self._environments[env.id] = env
+            self._environment_ids.append(env.id)
+            self._environment_names.setdefault(env.name, env)
+            self._options[env.id] = {opt.name: opt.default for opt in env.option_ids}
+
+        for grp in comps.groups_iter():
+            self._groups[grp.id] = grp
+            self._group_ids.append(grp.id)
+            self._group_names.setdefault(grp.name, grp)
+            self._visible[grp.id] = grp.visible
+            self._lang_only[grp.id] = grp.lang_only
+
+        log.debug("Indexed %d environments and %d groups.",
+                  len(self._environment_ids), len(self._group_ids))
+
+    @property
+    def environments(self):
+        """A list of environment ids."""
+        return list(self._environment_ids)
+
+    @property
+    def groups(self):
+        """A list of group ids."""
+        return list(self._group_ids)
+
+    @property
+    def lang_only(self):
+        """A dictionary of group ids and their languages."""
+        return dict(self._lang_only)
+
+    def environment(self, pattern):
+        """Find an environment.
+
+        :param pattern: an id, a name or a pattern of the environment
+        :return: an environment or None
+        """
+        return self._find(pattern, self._environments, self._environment_names,
+                          "environment", self._comps.environment_by_pattern)
+
+    def group(self, pattern):
+        """Find a group.
+
+        :param pattern: an id, a name or a pattern of the group
+        :return: a group or None
+        """
+        return self._find(pattern, self._groups, self._group_names,
+                          "group", self._comps.group_by_pattern)
+
+    def options(self, environment_id):
+        """Get the optional groups of the environment.
+
+        :param environment_id: an id of the environment
+        :return: a dictionary of group ids and their default flags
+        """
+        return self._options.get(environment_id, {})
+
+    def is_visible(self, group_id):
+        """Is the group visible?
+
+        :param group_id: an id of the group
+        :return: True or False
+        """
+        return self._visible[group_id]
+
+    def describe(self, item):
+        """Get the translated name and description of the environment or group.
+
+        :param item: an environment or a group
+        :return: a tuple with the name and the description
+        """
+        key = (locale.getlocale(locale.LC_MESSAGES), type(item).__name__, item.id)
+
+        with self._lock:
+            if key not in self._descriptions:
+                self._descriptions[key] = (item.ui_name, item.ui_description)
+
+            return self._descriptions[key]
+
+    def _find(self, pattern, by_id, by_name, kind, fallback):
+        """Find an item by its id, name or pattern."""
+        if pattern in by_id:
+            return by_id[pattern]
+
+        if pattern in by_name:
+            return by_name[pattern]
+
+        key = (kind, pattern)
+
+        with self._lock:
+            if key not in self._patterns:
+                self._patterns[key] = fallback(pattern)
+
+            return self._patterns[key]
@@ -31,6 +31,8 @@ from pyanaconda.core.configuration.anaconda import conf
 from pyanaconda.modules.common.constants.services import LOCALIZATION
 from pyanaconda.simpleconfig import SimpleConfigFile
 from pyanaconda.kickstart import RepoData
+from pyanaconda.payload.comps_index import CompsIndex
+from pyanaconda.payload.package_cache import PackageCache
 
 import pyanaconda.errors as errors
 import pyanaconda.localization
@@ -38,6 +40,7 @@ import pyanaconda.payload as payload
 
 import configparser
 import collections
+import concurrent.futures
 import multiprocessing
 import operator
 import hashlib
@@ -45,6 +48,7 @@ import shutil
 import sys
 import time
 import threading
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 
 
@@ -81,6 +85,18 @@ REPO_DIRS = ['/etc/yum.repos.d',
              '/tmp/product/anaconda.repos.d']
 YUM_REPOS_DIR = "/etc/yum.repos.d/"
 
+# Maximal number of repositories whose metadata are loaded at the same time.
+REPO_METADATA_WORKERS = 8
+# Minimal download rate in bytes per second of the repository metadata.
+# Downloads that are slower for REPO_METADATA_STALL_TIMEOUT seconds are aborted.
+REPO_METADATA_MINRATE = 1000
+REPO_METADATA_STALL_TIMEOUT = 30
+
+# Maximal number of repository mirrors checked at the same time.
+REPO_CHECK_WORKERS = 16
+# Timeout in seconds for connecting to a mirror and for reading its answer.
+REPO_CHECK_TIMEOUT = (10, 30)
+
 from pyanaconda.product import productName, productVersion
 USER_AGENT = "%s (anaconda)/%s" % (productName, productVersion)
 
@@ -90,6 +106,17 @@ USER_AGENT = "%s (anaconda)/%s" % (productName, productVersion)
 # 6KiB = 4K(max default fragment size) + 2K(rpm db could be taken for a header file)
 BONUS_SIZE_ON_FILE = Size("6 KiB")
 
+# Maximal number of resolved transactions kept for the reuse.
+RESOLUTION_CACHE_SIZE = 4
+
+# Private attributes of dnf.Base that hold the resolved transaction.
+RESOLUTION_ATTRIBUTES = ("_goal", "_transaction", "_comps_trans")
+
+# Average size of an installed file used to estimate the number of files of a package
+# without loading the file lists. The value is lower than the real average size of
+# files in common installations, so the estimated number of files is rather higher.
+ESTIMATED_FILE_SIZE = Size("16 KiB")
+
 
 def _failure_limbo():
     progressQ.send_quit(1)
@@ -168,6 +195,19 @@ def _pick_mpoint(df, download_size, install_size, download_only):
         return sorted_mpoints[0][0]
 
 
+def _estimate_files_count(install_size):
+    """Estimate the number of files installed by a package.
+
+    The file lists of packages are not loaded by default, because
+    they need a lot of memory and time. The number of files is
+    estimated from the installed size of the package instead.
+
+    :param install_size: the installed size of the package in bytes
+    :return: the estimated number of files
+    """
+    return 1 + install_size // int(ESTIMATED_FILE_SIZE)
+
+
 class PayloadRPMDisplay(dnf.callback.TransactionProgress):
     def __init__(self, queue_instance):
         super().__init__()
@@ -299,6 +339,11 @@ class DNFPayload(payload.PackagePayload):
         self._base = None
         self._download_location = None
         self._updates_enabled = True
+        self._package_cache = None
+        self._comps_index = None
+        self._space_required = (None, None)
+        self._sack_generation = 0
+        self._resolution_cache = collections.OrderedDict()
         self._configure()
 
         # Protect access to _base.repos to ensure that the dictionary is not
@@ -317,6 +362,9 @@ class DNFPayload(payload.PackagePayload):
     def unsetup(self):
         super().unsetup()
         self._base = None
+        self._comps_index = None
+        self._resolution_cache.clear()
+        self._space_required = (None, None)
         self._configure()
         self._repoMD_list = []
 
@@ -444,8 +492,8 @@ class DNFPayload(payload.PackagePayload):
         self._fetch_md(ksrepo.name)
         super().addRepo(ksrepo)
 
-    def _enable_modules(self):
-        """Enable modules (if any)."""
+    def _get_module_specs(self):
+        """Get specs of the modules to enable."""
         # convert data from kickstart to module specs
         module_specs = []
         for module in self.data.module.dataList():
@@ -456,6 +504,12 @@ class DNFPayload(payload.PackagePayload):
                 module_spec = module.name
             module_specs.append(module_spec)
 
+        return module_specs
+
+    def _enable_modules(self):
+        """Enable modules (if any)."""
+        module_specs = self._get_module_specs()
+
         # forward the module specs to enable to DNF
         log.debug("enabling modules: %s", module_specs)
         try:
@@ -465,7 +519,11 @@ class DNFPayload(payload.PackagePayload):
             log.debug("ModuleBase.enable(): some packages, groups or modules are missing or broken:\n%s", e)
             self._payload_setup_error(e)
 
-    def _apply_selections(self):
+    def _get_selections(self):
+        """Get the package/group/module selection.
+
+        :return: a tuple with the include list and the exclude list
+        """
         log.debug("applying DNF package/group/module selection")
 
         # note about package/group/module spec formatting:
@@ -558,7 +616,13 @@ class DNFPayload(payload.PackagePayload):
         log.debug("transaction exclude list")
         log.debug(exclude_list)
 
-        # feed it to DNF
+        return include_list, exclude_list
+
+    def _apply_selections(self, include_list, exclude_list):
+        """Feed the selection to DNF.
+
+        :return: False if an error was reported, otherwise True
+        """
         try:
             # install_specs() returns a list of specs that appear to be missing
             self._base.install_specs(install=include_list, exclude=exclude_list)
@@ -570,8 +634,71 @@ class DNFPayload(payload.PackagePayload):
                 log.info("ignoring missing package/group/module specs due to --ingoremissing flag in kickstart")
             else:
                 self._payload_setup_error(e)
+                return False
         except Exception as e:  # pylint: disable=broad-except
             self._payload_setup_error(e)
+            return False
+
+        return True
+
+    def _get_selection_fingerprint(self, include_list, exclude_list):
+        """Get a fingerprint of everything the dependency resolution depends on.
+
+        The metadata of the repositories are identified by the generation
+        of the sack, because they are loaded again only with the sack.
+        """
+        with self._repos_lock:
+            repos = sorted(r.id for r in self._base.repos.iter_enabled())
+
+        data = {
+            "sack": self._sack_generation,
+            "repos": repos,
+            "modules": self._get_module_specs(),
+            "include": include_list,
+            "exclude": exclude_list,
+            "weakdeps": self._base.conf.install_weak_deps,
+            "missing": self.data.packages.handleMissing,
+        }
+
+        m = hashlib.sha256()
+        m.update(repr(sorted(data.items())).encode("utf-8"))
+        return m.hexdigest()
+
+    def _can_cache_resolution(self):
+        """Can the resolved transaction be saved and restored?
+
+        The transaction is kept in private attributes of the dnf base,
+        so they might not be available in every version of dnf.
+        """
+        return all(hasattr(self._base, name) for name in RESOLUTION_ATTRIBUTES)
+
+    def _get_cached_resolution(self, fingerprint):
+        """Restore the resolved transaction of the fingerprint.
+
+        :return: the result of the resolution or None if it is not cached
+        """
+        if fingerprint not in self._resolution_cache or not self._can_cache_resolution():
+            return None
+
+        self._resolution_cache.move_to_end(fingerprint)
+        state, result = self._resolution_cache[fingerprint]
+
+        for name, value in zip(RESOLUTION_ATTRIBUTES, state):
+            setattr(self._base, name, value)
+
+        return result
+
+    def _cache_resolution(self, fingerprint, result):
+        """Remember the resolved transaction of the fingerprint."""
+        if not self._can_cache_resolution():
+            log.debug("The resolved transaction can't be cached.")
+            return
+
+        state = tuple(getattr(self._base, name) for name in RESOLUTION_ATTRIBUTES)
+        self._resolution_cache[fingerprint] = (state, result)
+
+        while len(self._resolution_cache) > RESOLUTION_CACHE_SIZE:
+            self._resolution_cache.popitem(last=False)
 
     def _apply_requirements(self, requirements):
         self._req_groups = set()
@@ -685,7 +812,7 @@ class DNFPayload(payload.PackagePayload):
         # and group properties. Unset reposdir to ensure dnf has nothing it can
         # check automatically
         config.reposdir = []
-        self._base.read_comps()
+        self._read_comps()
 
         config.reposdir = REPO_DIRS
 
@@ -780,16 +907,69 @@ class DNFPayload(payload.PackagePayload):
             langpacks.append("langpacks-" + loc)
         return langpacks
 
-    def _sync_metadata(self, dnf_repo):
-        try:
-            dnf_repo.load()
-        except dnf.exceptions.RepoError as e:
-            id_ = dnf_repo.id
-            log.info('_sync_metadata: addon repo error: %s', e)
-            self.disableRepo(id_)
-            self.verbose_errors.append(str(e))
-        log.debug('repo %s: _sync_metadata success from %s', dnf_repo.id,
-                 dnf_repo.baseurl or dnf_repo.mirrorlist or dnf_repo.metalink)
+    def _load_metadata(self, dnf_repo):
+        """Load metadata of the given repository.
+
+        This method is run in a worker thread of the metadata loader,
+        so it shouldn't touch the state of other repositories.
+
+        :param dnf_repo: DNF repository object
+        :returns: time in seconds spent by loading the metadata
+        """
+        # Let librepo abort the stalled downloads, so the loading always
+        # finishes. The timeout from the kickstart file is respected.
+        if self.data.packages.timeout is None:
+            dnf_repo.timeout = REPO_METADATA_STALL_TIMEOUT
+
+        dnf_repo.minrate = REPO_METADATA_MINRATE
+
+        start_time = time.time()
+        dnf_repo.load()
+        return time.time() - start_time
+
+    def _sync_metadata_failed(self, dnf_repo, error):
+        """Disable the repository that failed to load its metadata."""
+        log.info('_sync_metadata: addon repo error: %s', error)
+        with self._repos_lock:
+            self.disableRepo(dnf_repo.id)
+        self.verbose_errors.append(str(error))
+
+    def _sync_metadata(self, dnf_repos):
+        """Load metadata of the given repositories in parallel.
+
+        The metadata are downloaded by a bounded pool of worker threads.
+        Repositories that fail to load or stall are disabled and the errors
+        are collected in verbose_errors. The method waits for all workers,
+        so the repositories don't change while the sack is filled.
+
+        :param dnf_repos: a list of DNF repository objects
+        """
+        if not dnf_repos:
+            return
+
+        start_time = time.time()
+        workers = min(REPO_METADATA_WORKERS, len(dnf_repos))
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix=constants.THREAD_REPO_METADATA) as executor:
+
+            futures = {executor.submit(self._load_metadata, r): r for r in dnf_repos}
+
+            for future in concurrent.futures.as_completed(futures):
+                dnf_repo = futures[future]
+                try:
+                    elapsed_time = future.result()
+                except dnf.exceptions.RepoError as e:
+                    self._sync_metadata_failed(dnf_repo, e)
+                else:
+                    log.debug('repo %s: _sync_metadata success from %s (%1.1f s)',
+                              dnf_repo.id,
+                              dnf_repo.baseurl or dnf_repo.mirrorlist or dnf_repo.metalink,
+                              elapsed_time)
+
+        log.debug("Metadata of %d repositories loaded in %1.1f s by %d threads.",
+                  len(dnf_repos), time.time() - start_time, workers)
 
     @property
     def baseRepo(self):
@@ -801,14 +981,33 @@ class DNFPayload(payload.PackagePayload):
                     return repo.id
         return None
 
+    @property
+    def _comps(self):
+        """The index of the comps data.
+
+        The index is created when it is needed and it is dropped
+        every time the comps data are read again.
+        """
+        comps_index = self._comps_index
+
+        if comps_index is None:
+            comps_index = CompsIndex(self._base.comps)
+            self._comps_index = comps_index
+
+        return comps_index
+
+    def _read_comps(self):
+        """Read the comps data and drop the old comps index."""
+        self._base.read_comps()
+        self._comps_index = None
+
     @property
     def environments(self):
-        return [env.id for env in self._base.comps.environments]
+        return self._comps.environments
 
     @property
     def groups(self):
-        groups = self._base.comps.groups_iter()
-        return [g.id for g in groups]
+        return self._comps.groups
 
     @property
     def repos(self):
@@ -849,13 +1048,25 @@ class DNFPayload(payload.PackagePayload):
         if transaction is None:
             return Size("3000 MB")
 
+        # The transaction changes only with the transaction id. The ids
+        # start again after a reset, so the cache is cleared with the sack.
+        exact = conf.payload.exact_space_estimation
+        key = (self.txID, exact)
+        cached_key, cached_space = self._space_required
+
+        if self.txID is not None and cached_key == key:
+            return cached_space
+
         size = 0
         files_nm = 0
         for tsi in transaction:
             # space taken by all files installed by the packages
             size += tsi.pkg.installsize
             # number of files installed on the system
-            files_nm += len(tsi.pkg.files)
+            if exact:
+                files_nm += len(tsi.pkg.files)
+            else:
+                files_nm += _estimate_files_count(tsi.pkg.installsize)
 
         # append bonus size depending on number of files
         bonus_size = files_nm * BONUS_SIZE_ON_FILE
@@ -863,15 +1074,18 @@ class DNFPayload(payload.PackagePayload):
         # add another 10% as safeguard
         total_space = (size + bonus_size) * 1.1
         log.debug("Size from DNF: %s", size)
-        log.debug("Bonus size %s by number of files %s", bonus_size, files_nm)
+        log.debug("Bonus size %s by %s number of files %s", bonus_size,
+                  "exact" if exact else "estimated", files_nm)
         log.debug("Total size required %s", total_space)
+
+        self._space_required = (key, total_space)
         return total_space
 
     def _isGroupVisible(self, grpid):
-        grp = self._base.comps.group_by_pattern(grpid)
+        grp = self._comps.group(grpid)
         if grp is None:
             raise payload.NoSuchGroup(grpid)
-        return grp.visible
+        return self._comps.is_visible(grp.id)
 
     def _groupHasInstallableMembers(self, grpid):
         return True
@@ -881,13 +1095,28 @@ class DNFPayload(payload.PackagePayload):
         self._bump_tx_id()
         self._base.reset(goal=True)
         self._enable_modules()
-        self._apply_selections()
+        include_list, exclude_list = self._get_selections()
+        fingerprint = self._get_selection_fingerprint(include_list, exclude_list)
+        result = self._get_cached_resolution(fingerprint)
+
+        if result is not None:
+            log.info("checking dependencies: reusing the resolved transaction %s", fingerprint)
+            log.info("%d packages selected totalling %s",
+                     len(self._base.transaction), self.spaceRequired)
+            return
+
+        selection_applied = self._apply_selections(include_list, exclude_list)
 
         try:
-            if self._base.resolve():
+            result = self._base.resolve()
+
+            if result:
                 log.info("checking dependencies: success")
             else:
                 log.info("empty transaction")
+
+            if selection_applied:
+                self._cache_resolution(fingerprint, result)
         except dnf.exceptions.DepsolveError as e:
             msg = str(e)
             log.warning(msg)
@@ -929,42 +1158,42 @@ class DNFPayload(payload.PackagePayload):
         super().enableRepo(repo_id)
 
     def environmentDescription(self, environmentid):
-        env = self._base.comps.environment_by_pattern(environmentid)
+        env = self._comps.environment(environmentid)
         if env is None:
             raise payload.NoSuchGroup(environmentid)
-        return (env.ui_name, env.ui_description)
+        return self._comps.describe(env)
 
     def environmentId(self, environment):
         """Return environment id for the environment specified by id or name."""
         # the enviroment must be string or else DNF >=3 throws an assert error
         if not isinstance(environment, str):
             log.warning("environmentId() called with non-string argument: %s", environment)
-        env = self._base.comps.environment_by_pattern(environment)
+        env = self._comps.environment(environment)
         if env is None:
             raise payload.NoSuchGroup(environment)
         return env.id
 
     def environmentHasOption(self, environmentid, grpid):
-        env = self._base.comps.environment_by_pattern(environmentid)
+        env = self._comps.environment(environmentid)
         if env is None:
             raise payload.NoSuchGroup(environmentid)
-        return grpid in (id_.name for id_ in env.option_ids)
+        return grpid in self._comps.options(env.id)
 
     def environmentOptionIsDefault(self, environmentid, grpid):
-        env = self._base.comps.environment_by_pattern(environmentid)
+        env = self._comps.environment(environmentid)
         if env is None:
             raise payload.NoSuchGroup(environmentid)
 
         # Look for a group in the optionlist that matches the group_id and has
         # default set
-        return any(grp for grp in env.option_ids if grp.name == grpid and grp.default)
+        return self._comps.options(env.id).get(grpid, False)
 
     def groupDescription(self, grpid):
         """Return name/description tuple for the group specified by id."""
-        grp = self._base.comps.group_by_pattern(grpid)
+        grp = self._comps.group(grpid)
         if grp is None:
             raise payload.NoSuchGroup(grpid)
-        return (grp.ui_name, grp.ui_description)
+        return self._comps.describe(grp)
 
     def groupId(self, group_name):
         """Translate group name to group ID.
@@ -974,17 +1203,25 @@ class DNFPayload(payload.PackagePayload):
         :raise NoSuchGroup: If group_name doesn't exists.
         :raise PayloadError: When Yum's groups are not available.
         """
-        grp = self._base.comps.group_by_pattern(group_name)
+        grp = self._comps.group(group_name)
         if grp is None:
             raise payload.NoSuchGroup(group_name)
         return grp.id
 
     def gatherRepoMetadata(self):
         with self._repos_lock:
-            for repo in self._base.repos.iter_enabled():
-                self._sync_metadata(repo)
+            enabled_repos = list(self._base.repos.iter_enabled())
+
+        self._sync_metadata(enabled_repos)
+
+        package_cache = self._get_package_cache()
+        if package_cache:
+            self._run_package_cache_action(package_cache.store_metadata, DNF_CACHE_DIR)
         self._base.fill_sack(load_system_repo=False)
-        self._base.read_comps()
+        self._sack_generation += 1
+        self._resolution_cache.clear()
+        self._space_required = (None, None)
+        self._read_comps()
         self._refreshEnvironmentAddons()
 
     def install(self):
@@ -1008,6 +1245,15 @@ class DNFPayload(payload.PackagePayload):
             log.info("Removing existing package download location: %s", self._download_location)
             shutil.rmtree(self._download_location)
         pkgs_to_download = self._base.transaction.install_set
+
+        package_cache = self._get_package_cache()
+        if package_cache:
+            cached_pkgs = [p for p in pkgs_to_download
+                           if p.localPkg().startswith(self._download_location)]
+            self._run_package_cache_action(package_cache.restore_packages, cached_pkgs)
+
+        # The RPM transaction reads the headers of all packages before it
+        # starts, so the packages can't be installed during the download.
         log.info('Downloading packages to %s.', self._download_location)
         progressQ.send_message(_('Downloading packages'))
         progress = DownloadProgress()
@@ -1022,6 +1268,11 @@ class DNFPayload(payload.PackagePayload):
 
         log.info('Downloading packages finished.')
 
+        if package_cache:
+            self._run_package_cache_action(package_cache.store_packages, cached_pkgs)
+            self._run_package_cache_action(package_cache.evict)
+            package_cache.log_statistics()
+
         pre_msg = (N_("Preparing transaction from installation source"))
         progress_message(pre_msg)
 
@@ -1072,6 +1323,46 @@ class DNFPayload(payload.PackagePayload):
             # we don't have to care about clearing the download location ourselves.
             log.warning("Can't delete nonexistent download location: %s", self._download_location)
 
+    def _get_package_cache(self):
+        """Get the persistent package cache.
+
+        The package cache is enabled by the package_cache option in the
+        Payload section of the configuration. NFS shares are specified as
+        nfs:[options:]server:path and mounted on the first use.
+
+        :returns: an instance of PackageCache or None
+        """
+        if self._package_cache or not conf.payload.package_cache:
+            return self._package_cache
+
+        path = conf.payload.package_cache
+
+        try:
+            if path.startswith("nfs:"):
+                options, server, remote_path = util.parseNfsUrl(path)
+                path = constants.MOUNT_DIR + "/pkgcache.nfs"
+                self._setupNFS(path, server, remote_path, options)
+
+            package_cache = PackageCache(path, Size(conf.payload.package_cache_size))
+            package_cache.setup()
+        except (OSError, payload.PayloadSetupError) as e:
+            log.error("Failed to set up the package cache %s: %s", path, e)
+            return None
+
+        self._package_cache = package_cache
+        return self._package_cache
+
+    def _run_package_cache_action(self, action, *args):
+        """Run an action of the package cache.
+
+        The package cache is only an optimization, so its
+        failures shouldn't break the installation.
+        """
+        try:
+            action(*args)
+        except OSError as e:
+            log.error("Package cache action %s has failed: %s", action.__name__, e)
+
     def getRepo(self, repo_id):
         """Return the yum repo object."""
         return self._base.repos[repo_id]
@@ -1087,8 +1378,10 @@ class DNFPayload(payload.PackagePayload):
         if not self._repoMD_list:
             return False
 
+        responses = download_repoMDs(self._repoMD_list, conditional=True)
+
         for repo in self._repoMD_list:
-            if not repo.verify_repoMD():
+            if not repo.verify_response(responses[repo]):
                 log.debug("Can't reach repo %s", repo.id)
                 return False
         return True
@@ -1098,7 +1391,7 @@ class DNFPayload(payload.PackagePayload):
         locales = [localization_proxy.Language] + localization_proxy.LanguageSupport
         match_fn = pyanaconda.localization.langcode_matches_locale
         gids = set()
-        gl_tuples = ((g.id, g.lang_only) for g in self._base.comps.groups_iter())
+        gl_tuples = self._comps.lang_only.items()
         for (gid, lang) in gl_tuples:
             for locale in locales:
                 if match_fn(lang, locale):
@@ -1113,10 +1406,19 @@ class DNFPayload(payload.PackagePayload):
         self._base.reset(sack=True, repos=True)
         self._configure_proxy()
         self._repoMD_list = []
+        self._comps_index = None
+        self._resolution_cache.clear()
+        self._space_required = (None, None)
 
     def updateBaseRepo(self, fallback=True, checkmount=True):
         log.info('configuring base repo')
         self.reset()
+
+        package_cache = self._get_package_cache()
+        if package_cache:
+            os.makedirs(DNF_CACHE_DIR, exist_ok=True)
+            self._run_package_cache_action(package_cache.restore_metadata, DNF_CACHE_DIR)
+
         install_tree_url, mirrorlist, metalink = self._setupInstallDevice(self.storage, checkmount)
 
         # Fallback to installation root
@@ -1357,11 +1659,11 @@ class DNFPayload(payload.PackagePayload):
         Save repomd hash to test if the repositories can be reached.
         """
         super().postSetup()
-        self._repoMD_list = []
-        for repo in self._base.repos.iter_enabled():
-            repoMD = RepoMDMetaHash(self, repo)
-            repoMD.store_repoMD_hash()
-            self._repoMD_list.append(repoMD)
+        self._repoMD_list = [RepoMDMetaHash(self, repo) for repo in self._base.repos.iter_enabled()]
+        responses = download_repoMDs(self._repoMD_list)
+
+        for repoMD in self._repoMD_list:
+            repoMD.store_response(responses[repoMD])
 
     def postInstall(self):
         """Perform post-installation tasks."""
@@ -1389,6 +1691,117 @@ class DNFPayload(payload.PackagePayload):
         super().postInstall()
 
 
+# A downloaded repomd.xml file. The text is None if the file was not modified.
+RepoMDResponse = collections.namedtuple("RepoMDResponse", ["url", "text", "validators"])
+
+_repo_check_session = None
+_repo_check_session_lock = threading.Lock()
+
+
+def _get_repo_check_session():
+    """Get the shared session for the repository checks.
+
+    The session keeps the connections to the mirrors alive, so the
+    next check doesn't have to connect again.
+    """
+    global _repo_check_session
+
+    with _repo_check_session_lock:
+        if not _repo_check_session:
+            session = util.requests_session()
+            adapter = HTTPAdapter(pool_connections=REPO_CHECK_WORKERS,
+                                  pool_maxsize=REPO_CHECK_WORKERS)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _repo_check_session = session
+
+        return _repo_check_session
+
+
+def download_repoMDs(repos, conditional=False):
+    """Download repomd.xml files of the given repositories.
+
+    All mirrors of all repositories are probed at once. The first mirror
+    that answers is used for each repository and the remaining requests
+    for the repository are cancelled. The function returns as soon as
+    every repository has an answer or all its requests have failed.
+
+    The conditional requests are sent to the mirror of the stored file
+    first, because mirrors are often out of sync. Other mirrors are
+    probed only if this mirror doesn't answer.
+
+    :param repos: a list of RepoMDMetaHash instances
+    :param conditional: should we send conditional requests?
+    :return: a dictionary of repositories and RepoMDResponse or None
+    """
+    results = {repo: None for repo in repos}
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=REPO_CHECK_WORKERS,
+        thread_name_prefix=constants.THREAD_REPO_CHECK
+    )
+
+    try:
+        preferred = {}
+
+        if conditional:
+            preferred = {repo: repo.stored_url for repo in repos if repo.stored_url}
+            _probe_mirrors(executor, {r: [url] for r, url in preferred.items()},
+                           results, conditional)
+
+        mirrors = {}
+
+        for repo in repos:
+            if results[repo] is None:
+                mirrors[repo] = [url for url in repo.urls if url != preferred.get(repo)]
+
+        _probe_mirrors(executor, mirrors, results, conditional)
+    finally:
+        # Don't wait for the running requests of the answered repositories.
+        executor.shutdown(wait=False)
+
+    return results
+
+
+def _probe_mirrors(executor, mirrors, results, conditional):
+    """Download repomd.xml files from the first mirrors that answer.
+
+    :param executor: an executor of the requests
+    :param mirrors: a dictionary of repositories and lists of their URLs
+    :param results: a dictionary of repositories and RepoMDResponse to update
+    :param conditional: should we send conditional requests?
+    """
+    futures = {}
+
+    try:
+        for repo, urls in mirrors.items():
+            for url in urls:
+                future = executor.submit(repo.download_repoMD, url, conditional)
+                futures[future] = repo
+
+        pending = {repo for repo, urls in mirrors.items() if urls}
+
+        for future in concurrent.futures.as_completed(futures):
+            repo = futures[future]
+            response = future.result()
+
+            if repo not in pending or response is None:
+                continue
+
+            results[repo] = response
+            pending.discard(repo)
+
+            # Cancel requests for other mirrors of this repository.
+            for other, other_repo in futures.items():
+                if other_repo is repo:
+                    other.cancel()
+
+            if not pending:
+                break
+    finally:
+        for future in futures:
+            future.cancel()
+
+
 class RepoMDMetaHash(object):
     """Class that holds hash of a repomd.xml file content from a repository.
     This class can test availability of this repository by comparing hashes.
@@ -1398,6 +1811,8 @@ class RepoMDMetaHash(object):
         self._method = dnf_payload.data.method
         self._urls = repo.baseurl
         self._repomd_hash = ""
+        self._stored_url = None
+        self._validators = {}
 
     @property
     def repoMD_hash(self):
@@ -1409,27 +1824,62 @@ class RepoMDMetaHash(object):
         """Name of the repository."""
         return self._repoId
 
+    @property
+    def urls(self):
+        """URLs of the repository."""
+        return self._urls
+
+    @property
+    def stored_url(self):
+        """URL of the mirror of the stored repomd.xml file or None."""
+        return self._stored_url
+
     def store_repoMD_hash(self):
         """Download and store hash of the repomd.xml file content."""
-        repomd = self._download_repoMD(self._method)
-        self._repomd_hash = self._calculate_hash(repomd)
+        self.store_response(download_repoMDs([self])[self])
 
     def verify_repoMD(self):
         """Download and compare with stored repomd.xml file."""
-        new_repomd = self._download_repoMD(self._method)
-        new_repomd_hash = self._calculate_hash(new_repomd)
-        return new_repomd_hash == self._repomd_hash
+        return self.verify_response(download_repoMDs([self], conditional=True)[self])
+
+    def store_response(self, response):
+        """Store hash of the downloaded repomd.xml file.
+
+        :param response: an instance of RepoMDResponse or None
+        """
+        self._validators = {}
+        self._stored_url = None
+
+        if response is None:
+            self._repomd_hash = self._calculate_hash("")
+            return
+
+        self._repomd_hash = self._calculate_hash(response.text)
+        self._stored_url = response.url
+        self._validators[response.url] = response.validators
+
+    def verify_response(self, response):
+        """Compare the downloaded repomd.xml file with the stored one.
+
+        :param response: an instance of RepoMDResponse or None
+        :return: True if the file hasn't changed
+        """
+        if response is None:
+            return self._calculate_hash("") == self._repomd_hash
+
+        if response.text is None:
+            log.debug("The repomd.xml of %s was not modified.", self.id)
+            return True
+
+        return self._calculate_hash(response.text) == self._repomd_hash
 
     def _calculate_hash(self, data):
         m = hashlib.sha256()
         m.update(data.encode('ascii', 'backslashreplace'))
         return m.digest()
 
-    def _download_repoMD(self, method):
+    def _get_proxies(self, method):
         proxies = {}
-        repomd = ""
-        headers = {"user-agent": USER_AGENT}
-        sslverify = not flags.noverifyssl
 
         if hasattr(method, "proxy"):
             proxy_url = method.proxy
@@ -1441,20 +1891,47 @@ class RepoMDMetaHash(object):
                 log.info("Failed to parse proxy for test if repo available %s: %s",
                          proxy_url, e)
 
-        session = util.requests_session()
+        return proxies
 
-        # Test all urls for this repo. If any of these is working it is enough.
-        for url in self._urls:
-            try:
-                result = session.get("%s/repodata/repomd.xml" % url, headers=headers,
-                                     proxies=proxies, verify=sslverify)
-                if result.ok:
-                    repomd = result.text
-                    break
-                else:
-                    log.debug("Server returned %i code when downloading repomd", result.status_code)
-                    continue
-            except RequestException as e:
-                log.debug("Can't download new repomd.xml from %s with proxy: %s. Error: %s", url, proxies, e)
+    def download_repoMD(self, url, conditional=False):
+        """Download the repomd.xml file from the given URL.
+
+        The conditional request uses the ETag and Last-Modified headers
+        of the stored file, so the server doesn't have to send the file
+        again if it wasn't modified.
+
+        :param url: a base URL of the repository
+        :param conditional: should we send a conditional request?
+        :return: an instance of RepoMDResponse or None on failure
+        """
+        proxies = self._get_proxies(self._method)
+        headers = {"user-agent": USER_AGENT}
+        sslverify = not flags.noverifyssl
+        validators = self._validators.get(url, {})
+
+        if conditional and "ETag" in validators:
+            headers["If-None-Match"] = validators["ETag"]
 
-        return repomd
+        if conditional and "Last-Modified" in validators:
+            headers["If-Modified-Since"] = validators["Last-Modified"]
+
+        try:
+            result = _get_repo_check_session().get(
+                "%s/repodata/repomd.xml" % url, headers=headers, proxies=proxies,
+                verify=sslverify, timeout=REPO_CHECK_TIMEOUT
+            )
+        except RequestException as e:
+            log.debug("Can't download new repomd.xml from %s with proxy: %s. Error: %s",
+                      url, proxies, e)
+            return None
+
+        if result.status_code == 304 and validators:
+            return RepoMDResponse(url, None, validators)
+
+        if not result.ok:
+            log.debug("Server returned %i code when downloading repomd", result.status_code)
+            return None
+
+        new_validators = {name: result.headers[name] for name in ("ETag", "Last-Modified")
+                          if name in result.headers}
+        return RepoMDResponse(url, result.text, new_validators)
@@ -0,0 +1,121 @@
+# Concurrent builder of initramfs images.
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import concurrent.futures
+import io
+import os
+import time
+
+from pyanaconda.core import util
+from pyanaconda.core.constants import THREAD_INITRD_BUILDER
+from pyanaconda.anaconda_logging import program_log_lock
+from pyanaconda.anaconda_loggers import get_packaging_logger, get_program_logger
+from pyanaconda.progress import progress_message
+
+log = get_packaging_logger()
+program_log = get_program_logger()
+
+__all__ = ["InitrdBuilder"]
+
+# The maximal number of kernels processed at once. Every job runs
+# a dracut instance that is I/O heavy and uses a lot of memory.
+MAX_INITRD_WORKERS = 4
+
+
+class InitrdBuilder(object):
+    """Run per-kernel jobs in a bounded pool of workers.
+
+    A job is a list of commands that are run one by one in the
+    target system. Jobs of different kernels are run concurrently.
+    The output of the commands is collected and written to the
+    program log at once when the job is finished, so the logs of
+    different kernels are not interleaved.
+    """
+
+    def __init__(self, message, max_workers=MAX_INITRD_WORKERS):
+        """Create a new builder.
+
+        :param message: a progress message with a placeholder for the kernel version
+        :param max_workers: a maximal number of concurrent jobs
+        """
+        self._message = message
+        self._max_workers = max_workers
+        self._jobs = []
+
+    def add_job(self, kernel, commands):
+        """Add a job for the given kernel.
+
+        :param kernel: a kernel version
+        :param commands: a list of (command, arguments) pairs
+        """
+        self._jobs.append((kernel, commands))
+
+    def run(self):
+        """Run all jobs and wait for them to finish.
+
+        :return: a dictionary of kernel versions and return codes of their jobs
+        """
+        if not self._jobs:
+            return {}
+
+        workers = max(1, min(self._max_workers, len(self._jobs), os.cpu_count() or 1))
+        log.debug("Running %d initrd jobs with %d workers.", len(self._jobs), workers)
+        results = {}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers,
+                                                   thread_name_prefix=THREAD_INITRD_BUILDER) as pool:
+            futures = {pool.submit(self._run_job, kernel, commands): kernel
+                       for kernel, commands in self._jobs}
+
+            for future in concurrent.futures.as_completed(futures):
+                kernel = futures[future]
+                results[kernel] = future.result()
+
+        self._jobs = []
+        return results
+
+    def _run_job(self, kernel, commands):
+        """Run the commands of one kernel.
+
+        :return: a return code of the first failed command or 0
+        """
+        progress_message(self._message % kernel)
+        start_time = time.time()
+        output = io.StringIO()
+        rc = 0
+
+        try:
+            for command, argv in commands:
+                output.write("$ {} {}\n".format(command, " ".join(argv)))
+                ret = util.execWithRedirect(command, argv, stdout=output,
+                                            root=util.getSysroot(), log_output=False)
+                rc = rc or ret
+        finally:
+            self._log_output(kernel, output.getvalue())
+
+        log.info("Initrd job for %s finished with code %d in %.2f s.",
+                 kernel, rc, time.time() - start_time)
+        return rc
+
+    def _log_output(self, kernel, output):
+        """Write the output of a job to the program log."""
+        with program_log_lock:
+            program_log.info("Output of the initrd job for %s:", kernel)
+
+            for line in output.splitlines():
+                program_log.info(line.strip())
@@ -29,6 +29,9 @@
 """
 import os
 import stat
+import subprocess
+import tempfile
+import time
 from time import sleep
 from threading import Lock
 import requests
@@ -54,8 +57,84 @@ from pyanaconda.progress import progressQ
 from blivet.size import Size
 import blivet.util
 from pyanaconda.threading import threadMgr, AnacondaThread
-from pyanaconda.core.i18n import _
+from pyanaconda.core.i18n import _, N_
 from pyanaconda.payload import versionCmp
+from pyanaconda.payload.initrd_builder import InitrdBuilder
+
+# Size of chunks of the downloaded image.
+IMAGE_CHUNK_SIZE = 1024 * 1024
+# Size of the write buffer of the downloaded image.
+IMAGE_WRITE_BUFFER_SIZE = 16 * 1024 * 1024
+
+# Supported hash algorithms of the image checksum.
+# The sha256 algorithm is used if the checksum has no prefix.
+IMAGE_CHECKSUM_ALGORITHMS = {
+    "sha256": hashlib.sha256,
+    "sha512": hashlib.sha512,
+    "blake2b": hashlib.blake2b,
+    "blake2s": hashlib.blake2s,
+}
+
+
+# Options of tar for compressed archives read from a pipe.
+TAR_COMPRESSION_OPTIONS = {
+    ".tbz": "--bzip2",
+    ".tar.bz2": "--bzip2",
+    ".tgz": "--gzip",
+    ".tar.gz": "--gzip",
+    ".txz": "--xz",
+    ".tar.xz": "--xz",
+}
+
+# Options of tar for extracting the live image.
+# preserve: ACL's, xattrs, and SELinux context
+TAR_EXTRACT_OPTIONS = [
+    "--selinux", "--acls", "--xattrs", "--xattrs-include", "*",
+    "--exclude", "/dev/", "--exclude", "/proc/",
+    "--exclude", "/sys/", "--exclude", "/run/", "--exclude", "/boot/*rescue*",
+    "--exclude", "/etc/machine-id"
+]
+
+
+def get_tar_compression_options(url):
+    """Get tar options for decompression of the given archive.
+
+    Tar can't detect the compression of an archive read from a pipe,
+    so it has to be derived from the suffix of the archive.
+
+    :param url: an url of the archive
+    :return: a list of tar options
+    """
+    for suffix, option in TAR_COMPRESSION_OPTIONS.items():
+        if url.endswith(suffix):
+            return [option]
+
+    return []
+
+
+def get_image_checksum(checksum):
+    """Parse the checksum of the image.
+
+    The checksum is specified as a hex digest with an optional
+    prefix that defines the hash algorithm, for example sha512:<digest>.
+    The sha512 algorithm is also detected by the length of the digest.
+
+    :param checksum: a string with the checksum
+    :return: a tuple with a new hash object and the expected hex digest
+    :raise: PayloadInstallError if the algorithm is not supported
+    """
+    algorithm, _sep, digest = checksum.rpartition(":")
+    algorithm = util.lowerASCII(algorithm)
+    digest = util.lowerASCII(digest)
+
+    if not algorithm:
+        algorithm = "sha512" if len(digest) == 128 else "sha256"
+
+    if algorithm not in IMAGE_CHECKSUM_ALGORITHMS:
+        raise PayloadInstallError("Unsupported checksum algorithm: %s" % algorithm)
+
+    return IMAGE_CHECKSUM_ALGORITHMS[algorithm](), digest
+
 
 class LiveImagePayload(ImagePayload):
     """ A LivePayload copies the source image onto the target system. """
@@ -237,6 +316,7 @@ class DownloadProgress(object):
         self.url = url
         self.size = size
         self._pct = -1
+        self._start_time = time.time()
 
     def update(self, bytes_read):
         """ Download update
@@ -251,7 +331,8 @@ class DownloadProgress(object):
         if pct == self._pct:
             return
         self._pct = pct
-        progressQ.send_message(_("Downloading %(url)s (%(pct)d%%)") % {"url": self.url, "pct": pct})
+        progressQ.send_message(_("Downloading %(url)s (%(pct)d%%, %(rate).1f MB/s)")
+                               % {"url": self.url, "pct": pct, "rate": self.rate(bytes_read)})
 
     def end(self, bytes_read):
         """ Download complete
@@ -259,7 +340,21 @@ class DownloadProgress(object):
             :param bytes_read: Bytes read so far
             :type bytes_read:  int
         """
-        progressQ.send_message(_("Downloading %(url)s (%(pct)d%%)") % {"url": self.url, "pct": 100})
+        rate = self.rate(bytes_read)
+        log.info("Downloaded %d bytes from %s (%.1f MB/s)", bytes_read, self.url, rate)
+        progressQ.send_message(_("Downloading %(url)s (%(pct)d%%, %(rate).1f MB/s)")
+                               % {"url": self.url, "pct": 100, "rate": rate})
+
+    def rate(self, bytes_read):
+        """ Return the download throughput in MB/s
+
+            :param bytes_read: Bytes read so far
+            :type bytes_read:  int
+        """
+        elapsed = time.time() - self._start_time
+        if elapsed <= 0:
+            return 0.0
+        return bytes_read / elapsed / 1000 / 1000
 
 class LiveImageKSPayload(LiveImagePayload):
     """ Install using a live filesystem image from the network """
@@ -267,6 +362,7 @@ class LiveImageKSPayload(LiveImagePayload):
         super().__init__(*args, **kwargs)
         self._min_size = 0
         self._proxies = {}
+        self._image_digest = None
         self.image_path = util.getSysroot() + "/disk.img"
 
     @property
@@ -274,6 +370,13 @@ class LiveImageKSPayload(LiveImagePayload):
         """ Return True if the url ends with a tar suffix """
         return any(self.data.method.url.endswith(suffix) for suffix in TAR_SUFFIX)
 
+    @property
+    def is_streamed_tarfile(self):
+        """ Return True if the tarball is extracted during the download """
+        return self.is_tarfile \
+            and conf.payload.stream_live_image_tarball \
+            and not self.data.method.url.startswith("file://")
+
     def _setup_url_image(self):
         """ Check to make sure the url is available and estimate the space
             needed to download and install it.
@@ -295,8 +398,10 @@ class LiveImageKSPayload(LiveImagePayload):
             # At this point we know we can get the image and what its size is
             # Make a guess as to minimum size needed:
             # Enough space for image and image * 3
+            # The streamed image isn't stored, so only image * 3 is needed.
             if response.headers.get('content-length'):
-                self._min_size = int(response.headers.get('content-length')) * 4
+                multiplier = 3 if self.is_streamed_tarfile else 4
+                self._min_size = int(response.headers.get('content-length')) * multiplier
         except IOError as e:
             log.error("Error opening liveimg: %s", e)
             error = e
@@ -339,13 +444,23 @@ class LiveImageKSPayload(LiveImagePayload):
         ImagePayload.unsetup(self)
 
     def _preInstall_url_image(self):
-        """ Download the image using Requests with progress reporting"""
+        """ Download the image using Requests with progress reporting
+
+            If the checksum of the image is requested, it is computed
+            during the download, so the image doesn't have to be read again.
+        """
 
         error = None
         progress = DownloadProgress()
+        checksum = None
+        self._image_digest = None
+
+        if self.data.method.checksum:
+            checksum, _digest = get_image_checksum(self.data.method.checksum)
+
         try:
             log.info("Starting image download")
-            with open(self.image_path, "wb") as f:
+            with open(self.image_path, "wb", buffering=IMAGE_WRITE_BUFFER_SIZE) as f:
                 ssl_verify = not self.data.method.noverifyssl
                 response = self._session.get(self.data.method.url, proxies=self._proxies, verify=ssl_verify, stream=True)
                 total_length = response.headers.get('content-length')
@@ -353,7 +468,10 @@ class LiveImageKSPayload(LiveImagePayload):
                     # just download the file in one go and fake the progress reporting once done
                     log.warning("content-length header is missing for the installation image, "
                                 "download progress reporting will not be available")
-                    f.write(response.content)
+                    data = response.content
+                    f.write(data)
+                    if checksum:
+                        checksum.update(data)
                     size = f.tell()
                     progress.start(self.data.method.url, size)
                     progress.end(size)
@@ -361,10 +479,11 @@ class LiveImageKSPayload(LiveImagePayload):
                     # requests return headers as strings, so convert total_length to int
                     progress.start(self.data.method.url, int(total_length))
                     bytes_read = 0
-                    for buf in response.iter_content(1024 * 1024):  # 1 MB chunks
+                    for buf in response.iter_content(IMAGE_CHUNK_SIZE):
                         if buf:
                             f.write(buf)
-                            f.flush()
+                            if checksum:
+                                checksum.update(buf)
                             bytes_read += len(buf)
                             progress.update(bytes_read)
                     progress.end(bytes_read)
@@ -376,9 +495,47 @@ class LiveImageKSPayload(LiveImagePayload):
             if not os.path.exists(self.image_path):
                 error = "Failed to download %s, file doesn't exist" % self.data.method.url
                 log.error(error)
+            elif checksum:
+                self._image_digest = checksum.hexdigest()
 
         return error
 
+    def _compute_image_digest(self):
+        """ Compute the checksum of the local image
+
+            :return: a hex digest of the image
+        """
+        checksum, _digest = get_image_checksum(self.data.method.checksum)
+
+        with open(self.image_path, "rb") as f:
+            while True:
+                data = f.read(IMAGE_CHUNK_SIZE)
+                if not data:
+                    break
+                checksum.update(data)
+
+        return checksum.hexdigest()
+
+    def _verify_image_checksum(self):
+        """ Verify the checksum of the image
+
+            Use the checksum computed during the download if available.
+
+            :raise: PayloadInstallError if the checksum doesn't match
+        """
+        _checksum, expected_digest = get_image_checksum(self.data.method.checksum)
+        filesum = self._image_digest
+
+        if filesum is None:
+            progressQ.send_message(_("Checking image checksum"))
+            filesum = self._compute_image_digest()
+
+        log.debug("checksum of %s is %s", self.data.method.url, filesum)
+
+        if expected_digest != filesum:
+            log.error("%s does not match checksum.", self.data.method.checksum)
+            raise PayloadInstallError("Checksum of image does not match")
+
     def preInstall(self):
         """ Get image and loopback mount it.
 
@@ -389,11 +546,20 @@ class LiveImageKSPayload(LiveImagePayload):
 
             If it is a file:// source then use the file directly.
         """
+        # The tarball will be downloaded and extracted at once
+        if self.is_streamed_tarfile:
+            log.info("The image will be extracted during the download.")
+            return
+
         error = None
-        if self.data.method.url.startswith("file://"):
-            self.image_path = self.data.method.url[7:]
-        else:
-            error = self._preInstall_url_image()
+        try:
+            if self.data.method.url.startswith("file://"):
+                self.image_path = self.data.method.url[7:]
+                self._image_digest = None
+            else:
+                error = self._preInstall_url_image()
+        except PayloadInstallError as e:
+            error = e
 
         if error:
             exn = PayloadInstallError(str(error))
@@ -404,22 +570,11 @@ class LiveImageKSPayload(LiveImagePayload):
         self._adj_size = os.stat(self.image_path)[stat.ST_SIZE]
 
         if self.data.method.checksum:
-            progressQ.send_message(_("Checking image checksum"))
-            sha256 = hashlib.sha256()
-            with open(self.image_path, "rb") as f:
-                while True:
-                    data = f.read(1024 * 1024)
-                    if not data:
-                        break
-                    sha256.update(data)
-            filesum = sha256.hexdigest()
-            log.debug("sha256 of %s is %s", self.data.method.url, filesum)
-
-            if util.lowerASCII(self.data.method.checksum) != filesum:
-                log.error("%s does not match checksum.", self.data.method.checksum)
-                exn = PayloadInstallError("Checksum of image does not match")
-                if errorHandler.cb(exn) == ERROR_RAISE:
-                    raise exn
+            try:
+                self._verify_image_checksum()
+            except PayloadInstallError as e:
+                if errorHandler.cb(e) == ERROR_RAISE:
+                    raise e
 
         # If this looks like a tarfile, skip trying to mount it
         if self.is_tarfile:
@@ -479,6 +634,11 @@ class LiveImageKSPayload(LiveImagePayload):
             super().install()
             return
 
+        if self.is_streamed_tarfile:
+            self._install_streamed_tarfile()
+            self._create_rescue_images()
+            return
+
         # Use 2x the archive's size to estimate the size of the install
         # This is used to drive the progress display
         self.source_size = os.stat(self.image_path)[stat.ST_SIZE] * 2
@@ -489,11 +649,7 @@ class LiveImageKSPayload(LiveImagePayload):
                                      target=self.progress))
 
         cmd = "tar"
-        # preserve: ACL's, xattrs, and SELinux context
-        args = ["--selinux", "--acls", "--xattrs", "--xattrs-include", "*",
-                "--exclude", "/dev/", "--exclude", "/proc/",
-                "--exclude", "/sys/", "--exclude", "/run/", "--exclude", "/boot/*rescue*",
-                "--exclude", "/etc/machine-id", "-xaf", self.image_path, "-C", util.getSysroot()]
+        args = TAR_EXTRACT_OPTIONS + ["-xaf", self.image_path, "-C", util.getSysroot()]
         try:
             rc = util.execWithRedirect(cmd, args)
         except (OSError, RuntimeError) as e:
@@ -515,11 +671,141 @@ class LiveImageKSPayload(LiveImagePayload):
             self.pct = 100
         threadMgr.wait(THREAD_LIVE_PROGRESS)
 
+        self._create_rescue_images()
+
+    def _create_rescue_images(self):
+        """ Create the rescue images of the installed kernels
+
+            The kernel scripts share one rescue image and update the
+            bootloader configuration, so the kernels are processed one
+            at a time.
+        """
         # Live needs to create the rescue image before bootloader is written
+        builder = InitrdBuilder(N_("Generating rescue image for %s"), max_workers=1)
+
         for kernel in self.kernelVersionList:
             log.info("Generating rescue image for %s", kernel)
-            util.execInSysroot("new-kernel-pkg",
-                               ["--rpmposttrans", kernel])
+            builder.add_job(kernel, [("new-kernel-pkg", ["--rpmposttrans", kernel])])
+
+        builder.run()
+
+    def _install_streamed_tarfile(self):
+        """ Download the tarball and extract it at once
+
+            The downloaded data are piped to tar, so the archive is never
+            stored on the target. The progress is based on the number of
+            downloaded bytes. The checksum of the archive is computed on
+            the fly and verified once the archive is extracted.
+        """
+        checksum = None
+        expected_digest = None
+        error = None
+        rc = None
+
+        try:
+            if self.data.method.checksum:
+                checksum, expected_digest = get_image_checksum(self.data.method.checksum)
+
+            log.info("Starting image download and extraction")
+            ssl_verify = not self.data.method.noverifyssl
+            response = self._session.get(self.data.method.url, proxies=self._proxies,
+                                         verify=ssl_verify, stream=True)
+            response.raise_for_status()
+
+            total_length = int(response.headers.get('content-length') or 0)
+            args = TAR_EXTRACT_OPTIONS + get_tar_compression_options(self.data.method.url) \
+                + ["-xf", "-", "-C", util.getSysroot()]
+
+            with tempfile.TemporaryFile() as output:
+                proc = util.startProgram(["tar"] + args, stdin=subprocess.PIPE,
+                                         stdout=output, stderr=subprocess.STDOUT)
+                try:
+                    bytes_read = self._pipe_image(response, proc.stdin, checksum, total_length)
+                    rc = proc.wait()
+                finally:
+                    self._stop_extraction(proc)
+
+                output.seek(0)
+                for line in output.read().decode("utf-8", "replace").splitlines():
+                    log.info(line)
+
+            log.info("Image extraction finished, %d bytes read, tar exited with code %d",
+                     bytes_read, rc)
+        except (requests.exceptions.RequestException, OSError) as e:
+            log.error("Error extracting liveimg: %s", e)
+            error = str(e)
+        except PayloadInstallError as e:
+            error = str(e)
+        else:
+            if rc != 0:
+                error = "tar exited with code %d" % rc
+            elif checksum and checksum.hexdigest() != expected_digest:
+                log.error("%s does not match checksum.", self.data.method.checksum)
+                error = "Checksum of image does not match"
+
+        if error:
+            exn = PayloadInstallError(error)
+            if errorHandler.cb(exn) == ERROR_RAISE:
+                raise exn
+
+    def _stop_extraction(self, proc):
+        """ Make sure that tar isn't running anymore
+
+            If the download has failed, tar is terminated, so it
+            doesn't keep writing to the sysroot.
+
+            :param proc: a running tar process
+        """
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+
+        if proc.poll() is None:
+            log.error("Terminating the unfinished image extraction")
+            proc.terminate()
+
+        proc.wait()
+
+    def _pipe_image(self, response, pipe, checksum, total_length):
+        """ Write the downloaded image to the pipe
+
+            :param response: a streamed response with the image
+            :param pipe: a pipe to write the data to
+            :param checksum: a hash object or None
+            :param total_length: an expected length of the image or 0
+            :return: a number of read bytes
+        """
+        bytes_read = 0
+        last_pct = -1
+
+        try:
+            for buf in response.iter_content(IMAGE_CHUNK_SIZE):
+                if not buf:
+                    continue
+
+                pipe.write(buf)
+                bytes_read += len(buf)
+
+                if checksum:
+                    checksum.update(buf)
+
+                if not total_length:
+                    continue
+
+                pct = min(100, int(100 * bytes_read / total_length))
+                if pct != last_pct:
+                    last_pct = pct
+                    progressQ.send_message(_("Installing software") + (" %d%%") % (pct,))
+        except BrokenPipeError:
+            log.error("tar has stopped reading the image")
+        finally:
+            try:
+                pipe.close()
+            except BrokenPipeError:
+                pass
+
+        return bytes_read
 
     def postInstall(self):
         """ Unmount and remove image
@@ -552,6 +838,13 @@ class LiveImageKSPayload(LiveImagePayload):
         if not self.is_tarfile:
             return super().kernelVersionList
 
+        # The streamed tarball is not stored, so look at the installed kernels
+        if self.is_streamed_tarfile:
+            files = glob.glob(util.getSysroot() + "/boot/vmlinuz-*")
+            return sorted((f.split("/")[-1][8:] for f in files
+                           if os.path.isfile(f) and "-rescue-" not in f),
+                          key=functools.cmp_to_key(versionCmp))
+
         import tarfile
         with tarfile.open(self.image_path) as archive:
             names = archive.getnames()
@@ -0,0 +1,323 @@
+# Persistent cache of repository metadata and packages.
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import hashlib
+import os
+import shutil
+import tempfile
+
+from pyanaconda.anaconda_loggers import get_packaging_logger
+log = get_packaging_logger()
+
+__all__ = ["PackageCache"]
+
+# Names of the files and directories in the DNF cache of a repository
+# that are stored in the package cache.
+REPO_METADATA_FILES = ["repodata", "metalink.xml", "mirrorlist"]
+
+
+class PackageCache(object):
+    """Persistent cache of repository metadata and packages.
+
+    The cache is stored in a directory that survives the installation,
+    for example on a local disk or on a NFS share. It has the following
+    structure:
+
+        metadata/<checksum>/   metadata of a repository identified by
+                               a SHA256 checksum of its repomd.xml
+        repos/<name>           a link to the latest metadata of a repository
+                               with the given name of its DNF cache directory
+        packages/<nevra>-<checksum>.rpm
+                               a package identified by its NEVRA and checksum
+
+    The least recently used items are removed if the size of the cache
+    exceeds the maximal size.
+    """
+
+    def __init__(self, path, max_size):
+        """Create a new package cache.
+
+        :param path: a path to the cache directory
+        :param max_size: a maximal size of the cache in bytes
+        """
+        self._path = path
+        self._max_size = max_size
+        self._restored_metadata = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.hit_size = 0
+        self.miss_size = 0
+
+    @property
+    def path(self):
+        """A path to the cache directory."""
+        return self._path
+
+    @property
+    def _metadata_dir(self):
+        return os.path.join(self._path, "metadata")
+
+    @property
+    def _repos_dir(self):
+        return os.path.join(self._path, "repos")
+
+    @property
+    def _packages_dir(self):
+        return os.path.join(self._path, "packages")
+
+    def setup(self):
+        """Create the directories of the cache."""
+        for path in (self._metadata_dir, self._repos_dir, self._packages_dir):
+            os.makedirs(path, exist_ok=True)
+
+        log.info("Using the package cache at %s.", self._path)
+
+    def restore_metadata(self, dnf_cache_dir):
+        """Restore the cached metadata of repositories.
+
+        DNF verifies the restored metadata by comparing them with the
+        remote repomd.xml, so the metadata are downloaded again only
+        if they have changed.
+
+        :param dnf_cache_dir: a path to the DNF cache directory
+        """
+        self._restored_metadata = {}
+
+        for name in os.listdir(self._repos_dir):
+            link = os.path.join(self._repos_dir, name)
+
+            if not os.path.islink(link):
+                continue
+
+            checksum = os.path.basename(os.readlink(link))
+            source = os.path.join(self._metadata_dir, checksum)
+
+            if not os.path.isdir(source):
+                log.debug("Removing broken link to cached metadata of %s.", name)
+                os.unlink(link)
+                continue
+
+            target = os.path.join(dnf_cache_dir, name)
+            shutil.rmtree(target, ignore_errors=True)
+            shutil.copytree(source, target, symlinks=True)
+            self._touch(source)
+            self._restored_metadata[name] = checksum
+
+        log.debug("Restored cached metadata of %d repositories.", len(self._restored_metadata))
+
+    def store_metadata(self, dnf_cache_dir):
+        """Store the metadata of repositories in the cache.
+
+        :param dnf_cache_dir: a path to the DNF cache directory
+        """
+        if not os.path.isdir(dnf_cache_dir):
+            return
+
+        for name in os.listdir(dnf_cache_dir):
+            source = os.path.join(dnf_cache_dir, name)
+            checksum = self._get_repomd_checksum(source)
+
+            if not checksum:
+                continue
+
+            if self._restored_metadata.get(name) == checksum:
+                log.debug("Metadata of %s found in the package cache.", name)
+                self.hits += 1
+                continue
+
+            log.debug("Metadata of %s not found in the package cache.", name)
+            self.misses += 1
+            target = os.path.join(self._metadata_dir, checksum)
+
+            if not os.path.exists(target):
+                self._copy_metadata(source, target)
+
+            self._link(os.path.join(self._repos_dir, name), target)
+
+    def restore_packages(self, packages):
+        """Restore the cached packages.
+
+        The cached packages are linked or copied to their local paths,
+        so DNF will not download them again.
+
+        :param packages: a list of DNF packages
+        """
+        for package in packages:
+            path = os.path.join(self._packages_dir, self._get_package_name(package))
+
+            if not os.path.exists(path):
+                self.misses += 1
+                self.miss_size += package.downloadsize
+                continue
+
+            target = package.localPkg()
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            self._copy_file(path, target)
+            self._touch(path)
+
+            self.hits += 1
+            self.hit_size += package.downloadsize
+
+    def store_packages(self, packages):
+        """Store the downloaded packages in the cache.
+
+        :param packages: a list of DNF packages
+        """
+        for package in packages:
+            path = os.path.join(self._packages_dir, self._get_package_name(package))
+            source = package.localPkg()
+
+            if os.path.exists(path) or not os.path.exists(source):
+                continue
+
+            self._copy_file(source, path)
+
+    def evict(self):
+        """Remove the least recently used items from the cache.
+
+        Remove items until the size of the cache is lower than the
+        maximal size. Metadata linked by the repos are kept.
+        """
+        links = (os.path.join(self._repos_dir, name) for name in os.listdir(self._repos_dir))
+        linked = {os.path.basename(os.readlink(link)) for link in links if os.path.islink(link)}
+
+        items = []
+        total_size = 0
+
+        for name in os.listdir(self._packages_dir):
+            path = os.path.join(self._packages_dir, name)
+            size = os.path.getsize(path)
+            items.append((os.stat(path).st_mtime, path, size))
+            total_size += size
+
+        for name in os.listdir(self._metadata_dir):
+            path = os.path.join(self._metadata_dir, name)
+            size = self._get_dir_size(path)
+            total_size += size
+
+            if name not in linked:
+                items.append((os.stat(path).st_mtime, path, size))
+
+        removed = 0
+        for _mtime, path, size in sorted(items):
+            if total_size <= self._max_size:
+                break
+
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.unlink(path)
+
+            total_size -= size
+            removed += 1
+
+        log.debug("Removed %d items from the package cache, %d bytes left.",
+                  removed, total_size)
+
+    def log_statistics(self):
+        """Log statistics of the cache."""
+        log.info("Package cache statistics: %d hits (%d bytes), %d misses (%d bytes).",
+                 self.hits, self.hit_size, self.misses, self.miss_size)
+
+    def _get_package_name(self, package):
+        """Get a name of the cached package."""
+        _checksum_type, checksum = package.returnIdSum()
+        return "{}-{}.{}-{}.rpm".format(package.name, package.evr, package.arch, checksum)
+
+    def _get_repomd_checksum(self, repo_dir):
+        """Get a checksum of repomd.xml in the given repo directory."""
+        path = os.path.join(repo_dir, "repodata", "repomd.xml")
+
+        if not os.path.isfile(path):
+            return None
+
+        m = hashlib.sha256()
+        with open(path, "rb") as f:
+            m.update(f.read())
+
+        return m.hexdigest()
+
+    def _copy_metadata(self, source, target):
+        """Copy metadata of a repository to a new cache item."""
+        temp_dir = tempfile.mkdtemp(dir=self._metadata_dir)
+
+        for name in REPO_METADATA_FILES:
+            path = os.path.join(source, name)
+
+            if os.path.isdir(path):
+                shutil.copytree(path, os.path.join(temp_dir, name), symlinks=True)
+            elif os.path.isfile(path):
+                shutil.copy2(path, os.path.join(temp_dir, name))
+
+        try:
+            os.rename(temp_dir, target)
+        except OSError:
+            # The metadata were stored by someone else.
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _copy_file(self, source, target):
+        """Link or copy a file.
+
+        The file is copied to a temporary file first, so the
+        target is never seen in a partially copied state.
+        """
+        try:
+            os.link(source, target)
+            return
+        except FileExistsError:
+            return
+        except OSError:
+            pass
+
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target))
+        os.close(fd)
+
+        try:
+            shutil.copyfile(source, temp_path)
+            os.rename(temp_path, target)
+        except OSError:
+            os.unlink(temp_path)
+            raise
+
+    def _link(self, link, target):
+        """Create or replace a symbolic link."""
+        temp_link = link + ".tmp"
+
+        if os.path.lexists(temp_link):
+            os.unlink(temp_link)
+
+        os.symlink(os.path.relpath(target, os.path.dirname(link)), temp_link)
+        os.rename(temp_link, link)
+
+    def _touch(self, path):
+        """Mark the item as recently used."""
+        try:
+            os.utime(path)
+        except OSError as e:
+            log.debug("Failed to update the time of %s: %s", path, e)
+
+    def _get_dir_size(self, path):
+        """Get a size of the directory."""
+        size = 0
+
+        for root, _dirs, files in os.walk(path):
+            for name in files:
+                size += os.path.getsize(os.path.join(root, name))
+
+        return size
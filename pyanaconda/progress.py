@@ -34,7 +34,7 @@ progressQ = QueueFactory("progress")
 
 progressQ.addMessage("init", 1)             # num_steps
 progressQ.addMessage("step", 0)
-progressQ.addMessage("message", 1)          # message
+progressQ.addMessage("message", 1, coalesce=True)  # message
 progressQ.addMessage("complete", 0)
 progressQ.addMessage("quit", 1)             # exit_code
 
@@ -17,6 +17,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import queue
+from pyanaconda.core.progress_channel import ProgressChannel
 from pyanaconda.core.util import lowerASCII, upperASCII
 
 class QueueFactory(object):
@@ -39,30 +40,49 @@ class QueueFactory(object):
        that takes one argument.
 
        Reusing names within the same class is not allowed.
+
+       Messages added with coalesce=True are merged if they are sent in
+       a quick succession, so only the latest of them is put into the queue.
+       Call the flush method before you read the queue to get the latest
+       merged message. Other messages flush the merged messages first,
+       so the order of messages is preserved.
     """
     def __init__(self, name):
         self.name = name
 
         self.__counter = 0
         self.__names = []
+        self.__channels = []
 
         self.q = queue.Queue()
 
-    def _makeMethod(self, constant, methodName, argc):
+    def _makeMethod(self, constant, methodName, argc, channel=None):
         def __method(*args):
             if len(args) != argc:
                 raise TypeError("%s() takes exactly %d arguments (%d given)" %
                                 (methodName, argc, len(args)))
 
+            if channel:
+                channel.send(constant, args)
+                return
+
+            self.flush()
             self.q.put((constant, args))
 
         __method.__name__ = methodName
         return __method
 
-    def addMessage(self, name, argc):
+    def addMessage(self, name, argc, coalesce=False):
         if name in self.__names:
             raise AttributeError("%s queue already has a message named %s" % (self.name, name))
 
+        # Add a channel for merging of the messages.
+        channel = None
+
+        if coalesce:
+            channel = ProgressChannel(self._put, main_loop=False)
+            self.__channels.append(channel)
+
         # Add a constant.
         const_name = upperASCII(self.name) + "_CODE_" + upperASCII(name)
         setattr(self, const_name, self.__counter)
@@ -70,7 +90,15 @@ class QueueFactory(object):
 
         # Add a convenience method for putting things into the queue.
         method_name = "send_" + lowerASCII(name)
-        method = self._makeMethod(getattr(self, const_name), method_name, argc)
+        method = self._makeMethod(getattr(self, const_name), method_name, argc, channel)
         setattr(self, method_name, method)
 
         self.__names.append(name)
+
+    def flush(self):
+        """Put the latest merged messages into the queue."""
+        for channel in self.__channels:
+            channel.flush()
+
+    def _put(self, constant, args):
+        self.q.put((constant, args))
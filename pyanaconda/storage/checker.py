@@ -15,6 +15,10 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
+import copy
+import time
+import concurrent.futures
+
 import gi
 gi.require_version("BlockDev", "2.0")
 from gi.repository import BlockDev as blockdev
@@ -26,7 +30,7 @@ from pyanaconda import isys
 from pyanaconda.core.constants import STORAGE_MIN_ROOT, productName, STORAGE_REFORMAT_BLACKLIST, \
     STORAGE_REFORMAT_WHITELIST, STORAGE_MIN_PARTITION_SIZES, STORAGE_MIN_RAM, \
     STORAGE_SWAP_IS_RECOMMENDED, STORAGE_MUST_BE_ON_ROOT, STORAGE_MUST_BE_ON_LINUXFS, \
-    STORAGE_LUKS2_MIN_RAM
+    STORAGE_LUKS2_MIN_RAM, THREAD_STORAGE_CHECKER
 from pyanaconda.core.i18n import _
 from pyanaconda.platform import platform as _platform
 
@@ -34,6 +38,41 @@ from pyanaconda.anaconda_loggers import get_module_logger
 log = get_module_logger(__name__)
 
 
+def depends_on(*attributes):
+    """ Declare the device attributes the check depends on.
+
+    The incremental storage checking runs the check again only if some
+    of the declared attributes, the name or the id of some device in the
+    storage have changed since the last run. Don't declare checks that
+    depend on anything else, for example on the boot loader or on the
+    state of the system.
+
+    :param attributes: names of the device attributes, for example
+           "size" or "format.mountpoint"
+    """
+    def decorator(check):
+        check.device_attributes = tuple(attributes)
+        return check
+
+    return decorator
+
+
+def get_device_attribute(device, attribute):
+    """ Get a value of the device attribute.
+
+    :param device: a Blivet's device
+    :param str attribute: a name of the attribute, for example "format.type"
+    :return: a value of the attribute or None
+    """
+    value = device
+
+    for name in attribute.split("."):
+        value = getattr(value, name, None)
+
+    return value
+
+
+@depends_on("size", "format.type", "format.exists", "format.mountpoint")
 def verify_root(storage, constraints, report_error, report_warning):
     """ Verify the root.
 
@@ -95,6 +134,7 @@ def verify_s390_constraints(storage, constraints, report_error, report_warning):
                          .format(name="/dev/" + disk.name, busid=disk.busid))
 
 
+@depends_on("format.type", "format.exists", "format.mountpoint")
 def verify_partition_formatting(storage, constraints, report_error, report_warning):
     """ Verify partitions that should be reformatted by default.
 
@@ -116,6 +156,7 @@ def verify_partition_formatting(storage, constraints, report_error, report_warni
                          "%(mount)s partition.") % {'mount': mount})
 
 
+@depends_on("size", "format.mountpoint")
 def verify_partition_sizes(storage, constraints, report_error, report_warning):
     """ Verify the minimal and required partition sizes.
 
@@ -135,6 +176,7 @@ def verify_partition_sizes(storage, constraints, report_error, report_warning):
                               'productName': productName})
 
 
+@depends_on("type", "size", "format.type", "format.mountpoint")
 def verify_partition_format_sizes(storage, constraints, report_error, report_warning):
     """ Verify that the size of the device is allowed by the format used.
 
@@ -230,6 +272,7 @@ def verify_gpt_biosboot(storage, constraints, report_error, report_warning):
                                "'biosboot' type partition."))
 
 
+@depends_on("format.type")
 def verify_swap(storage, constraints, report_error, report_warning):
     """ Verify the existence of swap.
 
@@ -265,6 +308,7 @@ def verify_swap(storage, constraints, report_error, report_warning):
                                  "for most installations."))
 
 
+@depends_on("format.type", "format.exists", "format.uuid")
 def verify_swap_uuid(storage, constraints, report_error, report_warning):
     """ Verify swap uuid.
 
@@ -286,6 +330,7 @@ def verify_swap_uuid(storage, constraints, report_error, report_warning):
                          "circumstances. "))
 
 
+@depends_on("format.mountpoint")
 def verify_mountpoints_on_root(storage, constraints, report_error, report_warning):
     """ Verify mountpoints on the root.
 
@@ -300,6 +345,7 @@ def verify_mountpoints_on_root(storage, constraints, report_error, report_warnin
                            "be on the / file system.") % mountpoint)
 
 
+@depends_on("format.type", "format.mountpoint")
 def verify_mountpoints_on_linuxfs(storage, constraints, report_error, report_warning):
     """ Verify mountpoints on linuxfs.
 
@@ -316,6 +362,7 @@ def verify_mountpoints_on_linuxfs(storage, constraints, report_error, report_war
             report_error(_("The mount point %s must be on a linux file system.") % mountpoint)
 
 
+@depends_on("format.type", "format.exists", "format.has_key")
 def verify_luks_devices_have_key(storage, constraints, report_error, report_warning):
     """ Verify that all non-existant LUKS devices have some way of obtaining a key.
 
@@ -389,6 +436,7 @@ class StorageCheckerReport(object):
         self.info = list()
         self.errors = list()
         self.warnings = list()
+        self.timing = dict()
 
     @property
     def all_errors(self):
@@ -428,6 +476,14 @@ class StorageCheckerReport(object):
         self.add_info("Found sanity warning: %s" % msg)
         self.warnings.append(msg)
 
+    def add_timing(self, name, duration):
+        """ Add a duration of the check.
+
+        :param str name: a name of the check
+        :param float duration: a duration of the check in seconds
+        """
+        self.timing[name] = duration
+
     def log(self, logger, error=True, warning=True, info=True):
         """ Log the messages.
 
@@ -448,6 +504,10 @@ class StorageCheckerReport(object):
             for msg in self.warnings:
                 logger.warning(msg)
 
+        if info and self.timing:
+            logger.debug("Storage check took %.3f s: %s", sum(self.timing.values()),
+                         ", ".join("%s %.3f s" % t for t in self.timing.items()))
+
 
 class StorageChecker(object):
     """Class for advanced storage checking."""
@@ -455,6 +515,7 @@ class StorageChecker(object):
     def __init__(self):
         self.checks = list()
         self.constraints = dict()
+        self._results = dict()
 
     def add_check(self, callback):
         """ Add a callback for storage checking.
@@ -517,17 +578,25 @@ class StorageChecker(object):
         """
         self.constraints[name].update(value)
 
-    def check(self, storage, constraints=None, skip=None):
+    def check(self, storage, constraints=None, skip=None, incremental=False, parallel=False):
         """ Run a series of tests to verify the storage configuration.
 
         This function is called at the end of partitioning so that we can make
         sure you don't have anything silly (like no /, a really small /, etc).
 
+        In the incremental mode, the messages reported by checks declared with
+        the depends_on decorator are remembered together with the constraints
+        and the declared attributes of the devices. The next incremental check
+        reuses the messages of checks whose inputs haven't changed. Other
+        checks always run.
+
         :param storage: an instance of the :class:`pyanaconda.storage.InstallerStorage` class to check
         :param constraints: an dictionary of constraints that will be used by
                checks or None if we want to use the storage checker's constraints
         :param skip: a collection of checks we want to skip or None if we don't
                want to skip any
+        :param incremental: should we reuse results of the previous checks?
+        :param parallel: should we run the checks concurrently?
         :return an instance of StorageCheckerReport with reported errors and warnings
         """
         if constraints is None:
@@ -538,16 +607,62 @@ class StorageChecker(object):
         result.add_info("Storage check started with constraints %s."
                         % constraints)
 
-        # Process checks.
+        # Collect the checks.
+        checks = [c for c in self.checks if not skip or c not in skip]
+
+        # Find the inputs of the checks.
+        keys = {}
+
+        if incremental:
+            keys = self._get_check_keys(storage, constraints, checks)
+
+        # Find the reusable results.
+        outcomes = {}
+
+        for check in checks:
+            cached = self._results.get(check)
+
+            if check in keys and cached and cached[0] == keys[check]:
+                outcomes[check] = (cached[1], 0.0, True)
+
+        # Run the other checks.
+        pending = [c for c in checks if c not in outcomes]
+
+        if parallel and len(pending) > 1:
+            with concurrent.futures.ThreadPoolExecutor(
+                    thread_name_prefix=THREAD_STORAGE_CHECKER) as pool:
+                futures = [pool.submit(self._run_check, c, storage, constraints) for c in pending]
+                outcomes.update(zip(pending, [f.result() for f in futures]))
+        else:
+            for check in pending:
+                outcomes[check] = self._run_check(check, storage, constraints)
+
+        # Remember the results.
+        for check in pending:
+            if check in keys:
+                self._results[check] = (keys[check], outcomes[check][0])
+
+        # Process the results in the order of checks.
         for check in self.checks:
             # Skip this check.
-            if skip and check in skip:
+            if check not in outcomes:
                 result.add_info("Skipped sanity check %s." % check.__name__)
                 continue
 
-            # Run the check.
-            result.add_info("Run sanity check %s." % check.__name__)
-            check(storage, constraints, result.add_error, result.add_warning)
+            messages, duration, cached = outcomes[check]
+
+            if cached:
+                result.add_info("Reused sanity check %s." % check.__name__)
+            else:
+                result.add_info("Run sanity check %s." % check.__name__)
+
+            for is_error, msg in messages:
+                if is_error:
+                    result.add_error(msg)
+                else:
+                    result.add_warning(msg)
+
+            result.add_timing(check.__name__, duration)
 
         # Report the result.
         if result.success:
@@ -557,6 +672,52 @@ class StorageChecker(object):
 
         return result
 
+    def reset_results(self):
+        """Forget the results of the previous incremental checks."""
+        self._results = dict()
+
+    def _get_check_keys(self, storage, constraints, checks):
+        """ Get the inputs of the checks that declare their dependencies.
+
+        :return: a dictionary of checks and their inputs
+        """
+        declared = [c for c in checks if getattr(c, "device_attributes", None) is not None]
+
+        if not declared:
+            return {}
+
+        attributes = sorted({a for c in declared for a in c.device_attributes})
+        devices = [
+            {a: get_device_attribute(d, a) for a in ["id", "name"] + attributes}
+            for d in storage.devices
+        ]
+
+        constraints = copy.deepcopy(constraints)
+        keys = {}
+
+        for check in declared:
+            names = ("id", "name") + check.device_attributes
+            states = tuple(tuple(d[a] for a in names) for d in devices)
+            keys[check] = (constraints, states)
+
+        return keys
+
+    @staticmethod
+    def _run_check(check, storage, constraints):
+        """ Run the check.
+
+        :return: a tuple with a list of reported messages, the duration
+                 of the check in seconds and False
+        """
+        messages = []
+        start = time.perf_counter()
+
+        check(storage, constraints,
+              lambda msg: messages.append((True, msg)),
+              lambda msg: messages.append((False, msg)))
+
+        return messages, time.perf_counter() - start, False
+
     def set_default_constraints(self):
         """Set the default constraints needed by default checks."""
         self.constraints = dict()
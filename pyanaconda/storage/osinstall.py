@@ -21,11 +21,13 @@
 """This module provides storage functions related to OS installation."""
 
 import os
+import weakref
 import parted
 
 from pykickstart.constants import AUTOPART_TYPE_LVM
 
 from blivet.blivet import Blivet
+from blivet.callbacks import callbacks
 from blivet.storage_log import log_exception_info
 from blivet.devices import PartitionDevice, BTRFSSubVolumeDevice
 from blivet.formats import get_format
@@ -68,6 +70,37 @@ class StorageDiscoveryConfig(object):
         self.clear_non_existent = False
 
 
+class DeviceTreeChanges(object):
+
+    """ Counter of changes of the device trees reported by Blivet. """
+
+    # Callbacks of Blivet that report a change of a device tree.
+    CALLBACKS = ["device_added", "device_removed", "format_added", "format_removed",
+                 "action_added", "action_removed", "action_executed", "parent_added",
+                 "parent_removed", "attribute_changed"]
+
+    def __init__(self):
+        self._count = 0
+
+    @property
+    def count(self):
+        """ Number of the reported changes. """
+        return self._count
+
+    def connect(self):
+        """ Connect to the callbacks of Blivet. """
+        for name in self.CALLBACKS:
+            getattr(callbacks, name).add(self.changed)
+
+    def changed(self, **kwargs):
+        """ Count a reported change. """
+        self._count += 1
+
+
+device_tree_changes = DeviceTreeChanges()
+device_tree_changes.connect()
+
+
 class InstallerStorage(Blivet):
     """ Top-level class for managing installer-related storage configuration. """
 
@@ -91,6 +124,10 @@ class InstallerStorage(Blivet):
         self.__luks_devs = {}
         self.fsset = FSSet(self.devicetree)
         self._free_space_snapshot = None
+        self._free_space_token = None
+        self._free_space_devicetree = None
+        self._free_space_devicetree_id = 0
+        self._free_space = {}
 
         self._short_product_name = shortProductName
         self._default_luks_version = DEFAULT_LUKS_VERSION
@@ -392,38 +429,111 @@ class InstallerStorage(Blivet):
         if clear_part_type is None:
             clear_part_type = self.config.clear_part_type
 
+        # Forget the free space if the device tree has changed.
+        token = self._get_free_space_token()
+
+        if token != self._free_space_token:
+            self._free_space_token = token
+            self._free_space = {}
+
+        partitions = None
         free = {}
+
         for disk in disks:
-            should_clear = self.should_clear(disk, clear_part_type=clear_part_type,
-                                             clear_part_disks=[disk.name])
-            if should_clear:
-                free[disk.name] = (disk.size, Size(0))
-                continue
+            key = (disk.id, clear_part_type)
+
+            if key not in self._free_space:
+                if partitions is None:
+                    partitions = self._get_partitions_by_disk()
+
+                self._free_space[key] = self._get_disk_free_space(
+                    disk, partitions.get(disk, []), clear_part_type
+                )
 
-            disk_free = Size(0)
-            fs_free = Size(0)
-            if disk.partitioned:
-                disk_free = disk.format.free
-                for partition in (p for p in self.partitions if p.disk == disk):
-                    # only check actual filesystems since lvm &c require a bunch of
-                    # operations to translate free filesystem space into free disk
-                    # space
-                    should_clear = self.should_clear(partition,
-                                                     clear_part_type=clear_part_type,
-                                                     clear_part_disks=[disk.name])
-                    if should_clear:
-                        disk_free += partition.size
-                    elif hasattr(partition.format, "free"):
-                        fs_free += partition.format.free
-            elif hasattr(disk.format, "free"):
-                fs_free = disk.format.free
-            elif disk.format.type is None:
-                disk_free = disk.size
-
-            free[disk.name] = (disk_free, fs_free)
+            free[disk.name] = self._free_space[key]
 
         return free
 
+    def _get_free_space_token(self):
+        """ Return a token of the state of the device tree.
+
+        The free space of the disks depends on the device tree, the changes
+        of its devices and actions reported by Blivet, and the clearing and
+        protection configuration. The sizes of new partitions can change
+        without any reported change, so they are part of the token.
+
+        The token doesn't keep references to the devices, so it doesn't
+        keep an old device tree alive.
+
+        :returns: a tuple that changes with the free space
+        """
+        devicetree = self._free_space_devicetree and self._free_space_devicetree()
+
+        if devicetree is not self.devicetree:
+            self._free_space_devicetree = weakref.ref(self.devicetree)
+            self._free_space_devicetree_id += 1
+
+        return (
+            self._free_space_devicetree_id,
+            device_tree_changes.count,
+            tuple(
+                (a.device.id, a.device.size) for a in self.devicetree.actions
+                if a.is_create and a.is_device and isinstance(a.device, PartitionDevice)
+            ),
+            self.config.clear_non_existent,
+            self.config.initialize_disks,
+            tuple(self.config.clear_part_devices or []),
+            tuple(self.config.protected_dev_specs or [])
+        )
+
+    def _get_partitions_by_disk(self):
+        """ Return a dict of disks and their partitions.
+
+        :returns: dict with disk keys and lists of partitions
+        :rtype: dict
+        """
+        partitions = {}
+
+        for partition in self.partitions:
+            partitions.setdefault(partition.disk, []).append(partition)
+
+        return partitions
+
+    def _get_disk_free_space(self, disk, partitions, clear_part_type):
+        """ Return the free space info for the disk.
+
+        :param disk: a disk
+        :param partitions: a list of partitions on the disk
+        :param clear_part_type: a clear_part_type value
+        :returns: a tuple (disk_free, fs_free)
+        """
+        should_clear = self.should_clear(disk, clear_part_type=clear_part_type,
+                                         clear_part_disks=[disk.name])
+        if should_clear:
+            return disk.size, Size(0)
+
+        disk_free = Size(0)
+        fs_free = Size(0)
+        if disk.partitioned:
+            disk_free = disk.format.free
+            for partition in partitions:
+                # only check actual filesystems since lvm &c require a bunch of
+                # operations to translate free filesystem space into free disk
+                # space
+                should_clear = self.should_clear(partition,
+                                                 clear_part_type=clear_part_type,
+                                                 clear_part_disks=[disk.name])
+                if should_clear:
+                    disk_free += partition.size
+                elif hasattr(partition.format, "free"):
+                    fs_free += partition.format.free
+        elif hasattr(disk.format, "free"):
+            fs_free = disk.format.free
+        elif disk.format.type is None:
+            disk_free = disk.size
+
+        return disk_free, fs_free
+
     def shutdown(self):
         """ Deactivate all devices. """
         try:
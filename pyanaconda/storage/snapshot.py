@@ -15,6 +15,24 @@
 # License and may only be used or replicated with the express permission of
 # Red Hat, Inc.
 #
+import time
+
+from pyanaconda.anaconda_loggers import get_module_logger
+log = get_module_logger(__name__)
+
+__all__ = ["StorageSnapshot", "on_disk_storage", "copy_storage"]
+
+
+def copy_storage(storage):
+    """Create a copy of the storage model.
+
+    :param storage: an instance of InstallerStorage
+    :return: a new instance of InstallerStorage
+    """
+    start = time.time()
+    new_storage = storage.copy()
+    log.debug("Copied the storage model in %.2f s.", time.time() - start)
+    return new_storage
 
 
 class StorageSnapshot(object):
@@ -27,7 +45,7 @@ class StorageSnapshot(object):
         :type storage: :class:`pyanaconda.storage.InstallerStorage`
         """
         if storage:
-            self._storage_snap = storage.copy()
+            self._storage_snap = copy_storage(storage)
         else:
             self._storage_snap = None
 
@@ -42,7 +60,7 @@ class StorageSnapshot(object):
     def create_snapshot(self, storage):
         """Create (and save) snapshot of storage"""
 
-        self._storage_snap = storage.copy()
+        self._storage_snap = copy_storage(storage)
 
     def dispose_snapshot(self):
         """Dispose (unref) the snapshot
@@ -64,17 +82,20 @@ class StorageSnapshot(object):
         if not self.created:
             raise ValueError("No snapshot created, cannot reset")
 
-        # we need to create a new copy from the snapshot first -- simple
-        # assignment from the snapshot would result in snapshot being modified
-        # by further changes of 'storage'
-        new_copy = self._storage_snap.copy()
+        if dispose:
+            # the snapshot is not needed anymore, so it can be used directly
+            new_copy = self._storage_snap
+            self.dispose_snapshot()
+        else:
+            # we need to create a new copy from the snapshot first -- simple
+            # assignment from the snapshot would result in snapshot being modified
+            # by further changes of 'storage'
+            new_copy = copy_storage(self._storage_snap)
+
         storage.devicetree = new_copy.devicetree
         storage.roots = new_copy.roots
         storage.fsset = new_copy.fsset
 
-        if dispose:
-            self.dispose_snapshot()
-
 
 # A snapshot of early storage as we got it from scanning disks without doing any changes.
 on_disk_storage = StorageSnapshot()
@@ -96,6 +96,9 @@ class ProgressHub(Hub):
 
         q = progressQ.q
 
+        # Get the latest merged message.
+        progressQ.flush()
+
         # Grab all messages may have appeared since last time this method ran.
         while True:
             # Attempt to get a message out of the queue for how we should update
@@ -81,6 +81,7 @@ from pyanaconda.ui.helpers import StorageCheckHandler
 from pyanaconda.ui.gui.spokes.lib.cart import SelectedDisksDialog
 from pyanaconda.ui.gui.spokes.lib.passphrase import PassphraseDialog
 from pyanaconda.ui.gui.spokes.lib.accordion import update_selector_from_device, Accordion, Page, CreateNewPage, UnknownPage
+from pyanaconda.ui.lib.device_changes import DeviceChangeFeed
 from pyanaconda.ui.gui.spokes.lib.refresh import RefreshDialog
 from pyanaconda.ui.gui.spokes.lib.summary import ActionSummaryDialog
 
@@ -94,6 +95,7 @@ from pyanaconda.ui.gui.utils import setViewportBackground, fancy_set_sensitive,
 from pyanaconda.ui.gui.utils import really_hide, really_show, timed_action, escape_markup
 from pyanaconda.ui.categories.system import SystemCategory
 
+from collections import namedtuple
 from functools import wraps
 from itertools import chain
 
@@ -119,6 +121,9 @@ UNRECOVERABLE_ERROR_MSG = N_("Storage configuration reset due to unrecoverable "
 
 DEVICE_TYPE_CONST_UNSUPPORTED = "DEVICE_TYPE_UNSUPPORTED"
 
+# A page of the accordion with a list of (device, mountpoint, root) entries.
+AccordionPage = namedtuple("AccordionPage", ["page_type", "title", "entries", "partitions_to_reuse"])
+
 def dev_type_from_const(dev_type_const):
     """ Return integer corresponding to name for device type defined as
         a constant in blivet.devicefactory.
@@ -190,6 +195,7 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
         self.passphrase = ""
 
         self._devices = []
+        self._device_changes = DeviceChangeFeed()
         self._error = None
         self._hidden_disks = []
         self._fs_types = set()             # set of supported fstypes
@@ -531,19 +537,24 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
                     "view their details here.") % {"name"    : productName,
                                                    "version" : productVersion})
 
-    def _populate_accordion(self):
-        # Make sure we start with a clean state.
-        self._accordion.remove_all_pages()
+    def _get_accordion_content(self):
+        """Get the content of the accordion.
 
+        :return: a list of AccordionPage
+        """
         new_devices = filter_unsupported_disklabel_devices(self.get_new_devices())
         all_devices = filter_unsupported_disklabel_devices(self._devices)
-        unused_devices = filter_unsupported_disklabel_devices(self.unusedDevices)
+        unused = self.unusedDevices
+        unused_devices = filter_unsupported_disklabel_devices(unused)
 
         # Now it's time to populate the accordion.
         log.debug("ui: devices=%s", [d.name for d in all_devices])
         log.debug("ui: unused=%s", [d.name for d in unused_devices])
         log.debug("ui: new_devices=%s", [d.name for d in new_devices])
 
+        all_devices = set(all_devices)
+        content = []
+
         ui_roots = []
         for root in self._storage_playground.roots:
             root_devices = list(chain(root.swaps, root.mounts.values()))
@@ -561,22 +572,17 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
         # If we've not yet run autopart, add an instance of CreateNewPage.  This
         # ensures it's only added once.
         if not new_devices:
-            page = CreateNewPage(translated_new_install_name(),
-                                 self.on_create_clicked,
-                                 self._change_autopart_type,
-                                 partitionsToReuse=bool(ui_roots) or bool(unused_devices))
-            self._accordion.add_page(page, cb=self.on_page_clicked)
-
-            self._partitionsNotebook.set_current_page(NOTEBOOK_LABEL_PAGE)
-            self._set_page_label_text()
+            content.append(AccordionPage(CreateNewPage, translated_new_install_name(), [],
+                                         bool(ui_roots) or bool(unused_devices)))
 
         else:
             swaps = [d for d in new_devices if d.format.type == "swap"]
             mounts = dict((d.format.mountpoint, d) for d in new_devices
                                 if getattr(d.format, "mountpoint", None))
 
+            boot_loader_devices = self.bootLoaderDevices
             for device in new_devices:
-                if device in self.bootLoaderDevices:
+                if device in boot_loader_devices:
                     mounts[device.format.name] = device
 
             new_root = Root(mounts=mounts, swaps=swaps, name=translated_new_install_name())
@@ -584,8 +590,7 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
 
         # Add in all the existing (or autopart-created) operating systems.
         for root in ui_roots:
-            page = Page(root.name)
-            self._accordion.add_page(page, cb=self.on_page_clicked)
+            entries = []
 
             for (mountpoint, device) in root.mounts.items():
                 # by using all_devices we've already accounted for devices on unsupported disklabels
@@ -594,9 +599,7 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
                    (root.name != translated_new_install_name() and not device.format.exists):
                     continue
 
-                selector = page.add_selector(device, self.on_selector_clicked,
-                                            mountpoint=mountpoint)
-                selector.root = root
+                entries.append((device, mountpoint, root))
 
             for device in root.swaps:
                 # by using all_devices we've already accounted for devices on unsupported disklabels
@@ -604,20 +607,94 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
                    (root.name != translated_new_install_name() and not device.format.exists):
                     continue
 
-                selector = page.add_selector(device, self.on_selector_clicked)
-                selector.root = root
+                entries.append((device, "", root))
 
-            page.show_all()
+            content.append(AccordionPage(Page, root.name, entries, False))
 
         # Anything that doesn't go with an OS we understand?  Put it in the Other box.
-        if self.unusedDevices:
-            page = UnknownPage(_("Unknown"))
+        if unused:
+            entries = [(u, "", None) for u in sorted(unused_devices, key=lambda d: d.name)]
+            content.append(AccordionPage(UnknownPage, _("Unknown"), entries, False))
+
+        return content
+
+    def _get_page_key(self, page):
+        """Get a key that identifies the page in the accordion."""
+        return type(page), page.pageTitle, getattr(page, "partitionsToReuse", False)
+
+    def _add_accordion_page(self, content):
+        """Add a new page to the accordion."""
+        if content.page_type is CreateNewPage:
+            page = CreateNewPage(content.title,
+                                 self.on_create_clicked,
+                                 self._change_autopart_type,
+                                 partitionsToReuse=content.partitions_to_reuse)
             self._accordion.add_page(page, cb=self.on_page_clicked)
+            return
+
+        page = content.page_type(content.title)
+        self._accordion.add_page(page, cb=self.on_page_clicked)
+
+        for device, mountpoint, root in content.entries:
+            selector = page.add_selector(device, self.on_selector_clicked, mountpoint=mountpoint)
+
+            if root:
+                selector.root = root
+
+        page.show_all()
+
+    def _update_accordion_page(self, page, content, modified):
+        """Update selectors of a page in the accordion."""
+        if content.page_type is CreateNewPage:
+            return
+
+        entries = [(device, mountpoint) for device, mountpoint, _root in content.entries]
+        selectors = page.update_selectors(entries, modified, self.on_selector_clicked)
+
+        for selector, (_device, _mountpoint, root) in zip(selectors, content.entries):
+            if root:
+                selector.root = root
+
+        page.show_all()
+
+    def _populate_accordion(self):
+        """Populate the accordion with roots and mount points.
+
+        Only the pages and selectors affected by changes of the devices
+        since the last refresh are updated. The accordion is rebuilt if
+        its pages have changed.
+        """
+        changes = self._device_changes.update(self._devices)
+        pages = self._accordion.all_pages
+        content = None
 
-            for u in sorted(unused_devices, key=lambda d: d.name):
-                page.add_selector(u, self.on_selector_clicked)
+        if changes or not pages:
+            content = self._get_accordion_content()
+
+        if content and [self._get_page_key(p) for p in pages] != \
+           [(c.page_type, c.title, c.partitions_to_reuse) for c in content]:
+            # Start with a clean state.
+            self._accordion.remove_all_pages()
+
+            for c in content:
+                self._add_accordion_page(c)
+        else:
+            # Keep the existing pages in the initial state.
+            self._accordion.unselect()
+            self._accordion.collapse_all_pages()
 
-            page.show_all()
+            if content:
+                modified = {d.id for d in changes.modified}
+
+                for page, c in zip(pages, content):
+                    self._update_accordion_page(page, c, modified)
+            else:
+                log.debug("ui: no changes in the devices")
+
+        # If we've not yet run autopart, show how to create the mount points.
+        if isinstance(self._accordion.all_pages[0], CreateNewPage):
+            self._partitionsNotebook.set_current_page(NOTEBOOK_LABEL_PAGE)
+            self._set_page_label_text()
 
     def _do_refresh(self, mountpointToShow=None):
         # block mountpoint selector signal handler for now
@@ -628,7 +705,7 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
         self._removeButton.set_sensitive(False)
         self._configButton.set_sensitive(False)
 
-        # populate the accorion with roots and mount points
+        # populate the accordion with roots and mount points
         self._populate_accordion()
 
         # And then open the first page by default.  Most of the time, this will
@@ -2581,7 +2658,8 @@ class CustomPartitioningSpoke(NormalSpoke, StorageCheckHandler):
             return
 
         report = storage_checker.check(self._storage_playground,
-                                       skip=(verify_luks_devices_have_key,))
+                                       skip=(verify_luks_devices_have_key,),
+                                       incremental=True)
         report.log(log)
 
         if report.errors:
@@ -56,19 +56,21 @@ def update_selector_from_device(selector, device, mountpoint=""):
        allows for specifying the mountpoint if it cannot be determined from
        the device (like for a Root specifying an existing installation).
     """
+    selector.props.name = device.name
+    selector.props.size = str(device.size)
+    selector.props.mountpoint = _get_selector_mountpoint(device, mountpoint)
+    selector.device = device
+
+def _get_selector_mountpoint(device, mountpoint=""):
+    """Get the mount point shown by a selector of the device."""
     if hasattr(device.format, "mountpoint") and device.format.mountpoint is not None:
-        mp = device.format.mountpoint
+        return device.format.mountpoint
     elif mountpoint:
-        mp = mountpoint
+        return mountpoint
     elif device.format.name:
-        mp = device.format.name
+        return device.format.name
     else:
-        mp = _("Unknown")
-
-    selector.props.name = device.name
-    selector.props.size = str(device.size)
-    selector.props.mountpoint = mp
-    selector.device = device
+        return _("Unknown")
 
 def new_selector_from_device(device, mountpoint=""):
     selector = MountpointSelector(device.name, str(device.size))
@@ -316,6 +318,13 @@ class Accordion(Gtk.Box):
         # Then, remove it from the box.
         self.remove(target.get_parent())
 
+    def collapse_all_pages(self):
+        """ Collapse all pages without activating them.
+        """
+        for e in self._expanders:
+            e.set_expanded(False)
+            e.get_child().set_visible(False)
+
     def remove_all_pages(self):
         for e in self._expanders:
             self.remove(e)
@@ -385,6 +394,8 @@ class BasePage(Gtk.Box):
         super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=6)
         self.members = []
         self.pageTitle = title
+        # The mount points requested for the selectors of members.
+        self._requested_mountpoints = {}
         self._selected_members = set()
         self._dataBox = None
         self._systemBox = None
@@ -416,6 +427,7 @@ class BasePage(Gtk.Box):
         selector.connect("focus-in-event", self._on_selector_focus_in, cb)
         selector.set_margin_bottom(6)
         self.members.append(selector)
+        self._requested_mountpoints[selector] = mountpoint
 
         # pylint: disable=no-member
         if self._mountpoint_type(selector.props.mountpoint) == DATA_DEVICE:
@@ -434,6 +446,46 @@ class BasePage(Gtk.Box):
         accordion = self.get_ancestor(Accordion)
         accordion.remove_selection([selector])
         self.members.remove(selector)
+        self._requested_mountpoints.pop(selector, None)
+
+    def update_selectors(self, entries, modified, cb):
+        """ Update the selectors to show the given devices.
+
+            Selectors of unchanged devices are kept, selectors of modified
+            devices are updated and selectors of missing devices are removed.
+            New selectors are added to the end of the page.
+
+            :param entries: a list of (device, mountpoint) pairs to show
+            :param modified: a set of ids of modified devices
+            :param cb: a callback for new selectors
+            :return: a list of selectors in the order of entries
+        """
+        old_selectors = {(s.device.id, self._requested_mountpoints.get(s, "")): s
+                         for s in self.members}
+        selectors = []
+
+        for device, mountpoint in entries:
+            selector = old_selectors.pop((device.id, mountpoint), None)
+
+            if selector and device.id in modified:
+                new_mountpoint = _get_selector_mountpoint(device, mountpoint)
+
+                if self._mountpoint_type(selector.props.mountpoint) == \
+                   self._mountpoint_type(new_mountpoint):
+                    update_selector_from_device(selector, device, mountpoint)
+                else:
+                    self.remove_selector(selector)
+                    selector = None
+
+            if not selector:
+                selector = self.add_selector(device, cb, mountpoint=mountpoint)
+
+            selectors.append(selector)
+
+        for selector in old_selectors.values():
+            self.remove_selector(selector)
+
+        return selectors
 
     def _mountpoint_type(self, mountpoint):
         if not mountpoint or mountpoint in ["/", "/boot", "/boot/efi", "/tmp", "/usr", "/var",
@@ -493,13 +545,18 @@ class UnknownPage(BasePage):
         selector.connect("key-release-event", accordion.process_event, cb)
 
         self.members.append(selector)
+        self._requested_mountpoints[selector] = mountpoint
         self.add(selector)
 
         return selector
 
     def remove_selector(self, selector):
         self.remove(selector)
+
+        accordion = self.get_ancestor(Accordion)
+        accordion.remove_selection([selector])
         self.members.remove(selector)
+        self._requested_mountpoints.pop(selector, None)
 
 
 class CreateNewPage(BasePage):
@@ -511,6 +568,7 @@ class CreateNewPage(BasePage):
     """
     def __init__(self, title, createClickedCB, autopartTypeChangedCB, partitionsToReuse=True):
         super().__init__(title)
+        self.partitionsToReuse = partitionsToReuse
 
         # Create a box where we store the "Here's how you create a new blah" info.
         self._createBox = Gtk.Grid()
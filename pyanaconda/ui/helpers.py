@@ -94,7 +94,7 @@ class StorageCheckHandler(object, metaclass=ABCMeta):
         hubQ.send_message(self._mainSpokeClass, _("Checking storage configuration..."))
 
         self._checking = True
-        report = storage_checker.check(self.storage)
+        report = storage_checker.check(self.storage, incremental=True, parallel=True)
         # Storage spoke and custom spoke communicate errors via StorageCheckHandler,
         # so we need to set errors and warnings class attributes here.
         StorageCheckHandler.errors = report.errors
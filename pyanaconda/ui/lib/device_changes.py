@@ -0,0 +1,120 @@
+# User interface library functions for tracking changes of devices
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+from collections import namedtuple
+
+from pyanaconda.anaconda_loggers import get_module_logger
+log = get_module_logger(__name__)
+
+__all__ = ["DeviceSummary", "DeviceChanges", "DeviceChangeFeed", "get_device_summary"]
+
+DeviceSummary = namedtuple("DeviceSummary", [
+    "name", "size", "exists", "protected", "disks", "direct", "leaf", "partitioned",
+    "media_present", "complete", "format_type", "format_name", "format_exists",
+    "format_supported", "mountpoint"
+])
+
+
+class DeviceChanges(namedtuple("DeviceChanges", ["added", "removed", "modified"])):
+    """Devices added, removed and modified since the last update."""
+
+    __slots__ = ()
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.modified)
+
+
+def get_device_summary(device):
+    """Get a summary of the device.
+
+    The summary contains everything the user interface shows about
+    the device or uses to decide where to show it.
+
+    :param device: a Blivet's device
+    :return: an instance of DeviceSummary
+    """
+    fmt = device.format
+
+    return DeviceSummary(
+        name=device.name,
+        size=device.size,
+        exists=device.exists,
+        protected=device.protected,
+        disks=tuple(d.name for d in device.disks),
+        direct=device.direct,
+        leaf=device.isleaf,
+        partitioned=device.partitioned,
+        media_present=device.media_present,
+        complete=getattr(device, "complete", True),
+        format_type=fmt.type,
+        format_name=fmt.name,
+        format_exists=fmt.exists,
+        format_supported=fmt.supported,
+        mountpoint=getattr(fmt, "mountpoint", None)
+    )
+
+
+class DeviceChangeFeed(object):
+    """A feed of changes of devices in a device tree.
+
+    Every update compares the devices with the summaries remembered
+    by the previous update and reports the devices that were added,
+    removed or modified since then. The devices are identified by
+    their ids, so the devices of a copied device tree are reported
+    as modified.
+    """
+
+    def __init__(self):
+        self._devices = {}
+        self._summaries = {}
+
+    def update(self, devices):
+        """Update the feed with the current devices.
+
+        :param devices: a list of Blivet's devices
+        :return: an instance of DeviceChanges
+        """
+        added = []
+        modified = []
+        devices_by_id = {}
+        summaries = {}
+
+        for device in devices:
+            summary = get_device_summary(device)
+            devices_by_id[device.id] = device
+            summaries[device.id] = summary
+
+            if device.id not in self._devices:
+                added.append(device)
+            elif self._devices[device.id] is not device or self._summaries[device.id] != summary:
+                modified.append(device)
+
+        removed = [d for i, d in self._devices.items() if i not in devices_by_id]
+
+        self._devices = devices_by_id
+        self._summaries = summaries
+
+        changes = DeviceChanges(added, removed, modified)
+        log.debug("Device changes: added=%s, removed=%s, modified=%s",
+                  [d.name for d in added], [d.name for d in removed], [d.name for d in modified])
+        return changes
+
+    def reset(self):
+        """Forget all devices."""
+        self._devices = {}
+        self._summaries = {}
@@ -74,6 +74,7 @@ class ProgressSpoke(StandaloneTUISpoke):
             # throwing an exception)
             while True:
                 try:
+                    progressQ.flush()
                     (code, args) = q.get(timeout=1)
                     break
                 except queue.Empty:
@@ -476,7 +476,7 @@ class StorageSpoke(NormalTUISpoke):
             self._bootloader_observer.proxy.SetDrive(BOOTLOADER_DRIVE_UNSET)
         else:
             print(_("Checking storage configuration..."))
-            report = storage_checker.check(self.storage)
+            report = storage_checker.check(self.storage, incremental=True)
             print("\n".join(report.all_errors))
             report.log(log)
             self.errors = report.errors
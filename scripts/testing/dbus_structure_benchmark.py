@@ -0,0 +1,142 @@
+#!/bin/python3
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+#
+# Compare the time spent by creating DBus structures with the compiled
+# codec and with the type signatures derived for every field.
+#
+# Run it from the root of the repository:
+#
+#   PYTHONPATH=. ./scripts/testing/dbus_structure_benchmark.py --objects 2000
+#
+
+import argparse
+import time
+
+from pyanaconda.dbus.typing import *  # pylint: disable=wildcard-import
+from pyanaconda.dbus.typing import DBusType
+from pyanaconda.dbus.structure import dbus_structure, get_structures, get_fields
+
+
+@dbus_structure
+class DeviceData(object):
+    """A structure with typical fields of the storage data."""
+
+    def __init__(self):
+        self._name = ""
+        self._attrs = {}
+        self._flags = []
+
+    @property
+    def name(self) -> Str:
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+
+    @property
+    def attrs(self) -> Dict[Int, Str]:
+        return self._attrs
+
+    @attrs.setter
+    def attrs(self, value):
+        self._attrs = value
+
+    @property
+    def flags(self) -> List[Bool]:
+        return self._flags
+
+    @flags.setter
+    def flags(self, value):
+        self._flags = value
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the DBus structures.")
+    parser.add_argument("--objects", type=int, default=2000,
+                        help="a number of converted objects")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="a number of repetitions of every measurement")
+    return parser.parse_args()
+
+
+def create_objects(count):
+    """Create objects of the DBus structure."""
+    objects = []
+
+    for i in range(count):
+        data = DeviceData()
+        data.name = "Device {}".format(i)
+        data.attrs = {i: str(i)}
+        data.flags = [True, False]
+        objects.append(data)
+
+    return objects
+
+
+def get_reference_structures(objects):
+    """Create the structures field by field."""
+    structures = []
+
+    for obj in objects:
+        structure = {}
+
+        for name, field in get_fields(obj).items():
+            dbus_type = DBusType.get_dbus_representation(field.type_hint)
+            structure[name] = Variant(dbus_type, field.get_data(obj))
+
+        structures.append(structure)
+
+    return structures
+
+
+def measure(function, repeat):
+    """Return the best time of the function in seconds."""
+    best = None
+
+    for _i in range(repeat):
+        start = time.perf_counter()
+        function()
+        duration = time.perf_counter() - start
+        best = duration if best is None else min(best, duration)
+
+    return best
+
+
+def main():
+    args = parse_args()
+    objects = create_objects(args.objects)
+
+    if get_structures(objects) != get_reference_structures(objects):
+        raise RuntimeError("The structures are not the same.")
+
+    scenarios = [
+        ("compiled codec", lambda: get_structures(objects)),
+        ("field by field", lambda: get_reference_structures(objects)),
+    ]
+
+    print("{} objects, the best of {} runs".format(args.objects, args.repeat))
+    print("{:<20} {:>10}".format("method", "time (s)"))
+
+    for method, function in scenarios:
+        print("{:<20} {:>10.4f}".format(method, measure(function, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/bin/python3
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+#
+# Compare the time and the memory spent by copying the storage model.
+#
+# The storage model is created from fake disks, so the script doesn't
+# touch any real devices. Run it from the root of the repository:
+#
+#   PYTHONPATH=. ./scripts/testing/storage_copy_benchmark.py --devices 2000
+#
+
+import argparse
+import time
+import tracemalloc
+from unittest.mock import patch
+
+from blivet.devices import DiskDevice
+from blivet.formats import get_format
+from blivet.size import Size
+
+from pyanaconda.modules.common.constants.objects import MANUAL_PARTITIONING
+from pyanaconda.modules.storage.storage import StorageModule
+from pyanaconda.storage.osinstall import InstallerStorage
+from pyanaconda.storage.snapshot import StorageSnapshot
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark copies of the storage model.")
+    parser.add_argument("--devices", type=int, default=1000,
+                        help="a number of fake disks in the storage model")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="a number of repetitions of every measurement")
+    return parser.parse_args()
+
+
+def create_storage(count):
+    """Create a storage model with fake disks."""
+    storage = InstallerStorage()
+
+    for i in range(count):
+        name = "sd{}".format(i)
+        fmt = get_format("xfs", device="/dev/" + name, exists=True)
+        disk = DiskDevice(name, fmt=fmt, size=Size("10 GiB"), exists=True)
+        storage.devicetree._add_device(disk)
+
+    return storage
+
+
+def create_storage_module(storage):
+    """Create a storage module with the given storage model."""
+    storage_module = StorageModule()
+    storage_module.set_storage(storage)
+    return storage_module
+
+
+def prepare_partitioning(storage_module):
+    """Create the storage model of the manual partitioning."""
+    partitioning_module = storage_module._partitioning_modules[MANUAL_PARTITIONING.object_path]
+    return partitioning_module.storage
+
+
+def apply_partitioning(storage_module):
+    """Apply the manual partitioning and hand its storage model over."""
+    storage_module.apply_partitioning(MANUAL_PARTITIONING.object_path)
+
+
+def apply_partitioning_copy(storage_module):
+    """Apply a copy of the manual partitioning like the original implementation."""
+    storage = prepare_partitioning(storage_module)
+    storage_module.set_storage(storage.copy())
+
+
+def measure(function, repeat, setup=None):
+    """Measure the best time and the allocated memory of the function.
+
+    :param function: a function to measure
+    :param repeat: a number of repetitions
+    :param setup: a function that returns an argument of the measured function
+    :return: a tuple with the time in seconds and the memory in bytes
+    """
+    best = None
+    size = 0
+
+    for _i in range(repeat):
+        args = [setup()] if setup else []
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = function(*args)
+        duration = time.perf_counter() - start
+        size, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result, args
+
+        best = duration if best is None else min(best, duration)
+
+    return best, size
+
+
+def main():
+    args = parse_args()
+    storage = create_storage(args.devices)
+
+    def reset_to_snapshot(snapshot, dispose):
+        snapshot.reset_to_snapshot(storage, dispose=dispose)
+
+    storage_module = create_storage_module(storage)
+
+    def prepare_storage_module():
+        prepare_partitioning(storage_module)
+        return storage_module
+
+    scenarios = [
+        ("create snapshot", "full copy", lambda: StorageSnapshot(storage), None),
+        ("reset to snapshot", "copy of snapshot", lambda s: reset_to_snapshot(s, False),
+         lambda: StorageSnapshot(storage)),
+        ("reset to snapshot", "disposed snapshot", lambda s: reset_to_snapshot(s, True),
+         lambda: StorageSnapshot(storage)),
+        ("apply partitioning", "full copy", apply_partitioning_copy, prepare_storage_module),
+        ("apply partitioning", "handover", apply_partitioning, prepare_storage_module),
+    ]
+
+    print("{} devices, the best of {} runs".format(args.devices, args.repeat))
+    print("{:<20} {:<20} {:>10} {:>12}".format("operation", "method", "time (s)", "memory (MB)"))
+
+    # The validation is skipped, because the fake disks have
+    # no file systems for the installation.
+    with patch("pyanaconda.modules.storage.storage.StorageValidateTask"):
+        for operation, method, function, setup in scenarios:
+            duration, size = measure(function, args.repeat, setup)
+            print("{:<20} {:<20} {:>10.3f} {:>12.1f}".format(
+                operation, method, duration, size / 2**20
+            ))
+
+
+if __name__ == "__main__":
+    main()
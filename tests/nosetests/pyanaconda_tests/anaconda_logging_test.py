@@ -0,0 +1,152 @@
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import logging
+import os
+import tempfile
+import threading
+import unittest
+
+from pyanaconda.anaconda_logging import AnacondaFileHandler, AnacondaLogWriter, \
+    AnacondaQueueHandler
+
+
+class BlockingHandler(logging.Handler):
+    """Handler that blocks until it is released."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.released = threading.Event()
+        self.records = []
+
+    def emit(self, record):
+        self.started.set()
+        self.released.wait()
+        self.records.append(record.getMessage())
+
+
+class AnacondaLogWriterTestCase(unittest.TestCase):
+    """Test the asynchronous logging."""
+
+    def _create_logger(self, name, handler, writer):
+        logger = logging.getLogger(name)
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(AnacondaQueueHandler(handler, writer))
+        self.addCleanup(logger.handlers.clear)
+        return logger
+
+    def _read_lines(self, path):
+        with open(path) as f:
+            return f.read().splitlines()
+
+    def writer_test(self):
+        """Test the log writer."""
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "test.log")
+            handler = AnacondaFileHandler(path)
+            handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+            self.addCleanup(handler.close)
+
+            writer = AnacondaLogWriter(batch_size=10, sync_interval=0)
+            writer.add_handler(handler)
+            writer.start()
+            self.assertTrue(handler.batched)
+
+            logger = self._create_logger("anaconda.test.writer", handler, writer)
+
+            for i in range(100):
+                logger.debug("Record %s.", i)
+
+            self.assertTrue(writer.flush())
+            lines = self._read_lines(path)
+            self.assertEqual(lines, ["DEBUG Record {}.".format(i) for i in range(100)])
+            self.assertEqual(writer.queued, 100)
+            self.assertEqual(writer.written, 100)
+            self.assertEqual(writer.dropped, 0)
+
+            # Records are written synchronously after the stop.
+            writer.stop()
+            self.assertFalse(writer.running)
+            self.assertFalse(handler.batched)
+
+            logger.info("Last record.")
+            self.assertEqual(self._read_lines(path)[-1], "INFO Last record.")
+            self.assertEqual(writer.queued, 100)
+
+    def exception_test(self):
+        """Test a record with an exception."""
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "test.log")
+            handler = AnacondaFileHandler(path)
+            self.addCleanup(handler.close)
+
+            writer = AnacondaLogWriter()
+            writer.add_handler(handler)
+            writer.start()
+            self.addCleanup(writer.stop)
+
+            logger = self._create_logger("anaconda.test.exception", handler, writer)
+
+            try:
+                raise ValueError("Invalid value.")
+            except ValueError:
+                logger.exception("Failed.")
+
+            writer.flush()
+            content = "\n".join(self._read_lines(path))
+            self.assertIn("Failed.", content)
+            self.assertIn("ValueError: Invalid value.", content)
+
+    def dropped_records_test(self):
+        """Test the dropped records."""
+        handler = BlockingHandler()
+        writer = AnacondaLogWriter(max_size=2)
+        writer.start()
+
+        logger = self._create_logger("anaconda.test.dropped", handler, writer)
+
+        # Block the writer with the first record.
+        logger.info("Record 0.")
+        handler.started.wait()
+
+        for i in range(1, 5):
+            logger.info("Record %s.", i)
+
+        self.assertEqual(writer.queued, 3)
+        self.assertEqual(writer.dropped, 2)
+
+        handler.released.set()
+        writer.stop()
+
+        self.assertEqual(handler.records, ["Record 0.", "Record 1.", "Record 2."])
+        self.assertEqual(writer.written, 3)
+
+    def level_test(self):
+        """Test the level of the queue handler."""
+        handler = AnacondaFileHandler(os.devnull)
+        handler.setLevel(logging.INFO)
+        handler.autoSetLevel = True
+        self.addCleanup(handler.close)
+
+        queue_handler = AnacondaQueueHandler(handler, AnacondaLogWriter())
+        self.assertEqual(queue_handler.level, logging.INFO)
+        self.assertTrue(queue_handler.autoSetLevel)
+
+        queue_handler.setLevel(logging.DEBUG)
+        self.assertEqual(handler.level, logging.DEBUG)
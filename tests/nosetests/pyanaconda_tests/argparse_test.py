@@ -104,6 +104,19 @@ class ArgparseTest(unittest.TestCase):
         self.assertEqual(conf.storage.dmraid, False)
         self.assertEqual(conf.storage.ibft, True)
 
+    def payload_test(self):
+        conf = AnacondaConfiguration.from_defaults()
+
+        opts, _deprecated = self._parseCmdline([])
+        conf.set_from_opts(opts)
+
+        self.assertEqual(conf.payload.package_cache, "")
+
+        opts, _deprecated = self._parseCmdline(['--pkgcache=nfs:server:/cache'])
+        conf.set_from_opts(opts)
+
+        self.assertEqual(conf.payload.package_cache, "nfs:server:/cache")
+
     def target_test(self):
         conf = AnacondaConfiguration.from_defaults()
 
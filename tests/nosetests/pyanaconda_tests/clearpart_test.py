@@ -2,10 +2,11 @@ import unittest
 import mock
 
 import blivet
-from pyanaconda.storage.osinstall import InstallerStorage
+from pyanaconda.storage.osinstall import InstallerStorage, device_tree_changes
 from pyanaconda.core.constants import CLEAR_PARTITIONS_ALL, CLEAR_PARTITIONS_LINUX, CLEAR_PARTITIONS_NONE
 from parted import PARTITION_NORMAL
 from blivet.flags import flags
+from blivet.size import Size
 
 DEVICE_CLASSES = [
     blivet.devices.DiskDevice,
@@ -212,3 +213,81 @@ class ClearPartTestCase(unittest.TestCase):
             protected device at various points in stack
         """
         pass
+
+
+class FreeSpaceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        flags.testing = True
+
+    def tearDown(self):
+        flags.testing = False
+
+    def _create_disk(self, name, free):
+        disk = mock.Mock(spec=blivet.devices.DiskDevice, size=Size("10 GiB"), partitioned=True,
+                         protected=False, id=name)
+        disk.name = name
+        disk.format = mock.Mock(free=free)
+        return disk
+
+    def _create_partition(self, disk, name, size, free):
+        partition = mock.Mock(spec=blivet.devices.PartitionDevice, disk=disk, size=size,
+                              protected=False, id=name)
+        partition.format = mock.Mock(free=free)
+        return partition
+
+    def test_get_free_space(self):
+        """ Test the InstallerStorage.get_free_space method. """
+        b = InstallerStorage()
+        b.should_clear = mock.Mock(return_value=False)
+
+        sda = self._create_disk("sda", Size("1 GiB"))
+        sda1 = self._create_partition(sda, "sda1", Size("2 GiB"), Size("1 GiB"))
+        sda2 = self._create_partition(sda, "sda2", Size("3 GiB"), Size("2 GiB"))
+        sdb = self._create_disk("sdb", Size("4 GiB"))
+
+        disks = [sda, sdb]
+        partitions = [sda1, sda2]
+        b.devicetree = mock.Mock(actions=[], devices=disks + partitions)
+
+        with mock.patch.object(InstallerStorage, "disks", new_callable=mock.PropertyMock) as d, \
+                mock.patch.object(InstallerStorage, "partitions", new_callable=mock.PropertyMock) as p:
+            d.return_value = disks
+            p.return_value = partitions
+
+            expected = {
+                "sda": (Size("1 GiB"), Size("3 GiB")),
+                "sdb": (Size("4 GiB"), Size(0))
+            }
+            self.assertEqual(b.get_free_space(), expected)
+
+            # The free space is computed only once.
+            calls = b.should_clear.call_count
+            self.assertEqual(b.get_free_space(), expected)
+            self.assertEqual(b.get_free_space(disks=[sdb]), {"sdb": expected["sdb"]})
+            self.assertEqual(b.should_clear.call_count, calls)
+
+            # The free space is computed again after a change reported by Blivet.
+            sda2.format.free = Size("3 GiB")
+            device_tree_changes.changed(device=sda2)
+            self.assertEqual(b.get_free_space(disks=[sda]), {"sda": (Size("1 GiB"), Size("4 GiB"))})
+
+            # The free space is computed again if a new partition is resized.
+            b.devicetree.actions.append(mock.Mock(is_create=True, is_device=True, device=sda2))
+            self.assertEqual(b.get_free_space(disks=[sda]), {"sda": (Size("1 GiB"), Size("4 GiB"))})
+            calls = b.should_clear.call_count
+
+            sda1.format.free = Size("2 GiB")
+            sda2.size = Size("4 GiB")
+            self.assertEqual(b.get_free_space(disks=[sda]), {"sda": (Size("1 GiB"), Size("5 GiB"))})
+            self.assertGreater(b.should_clear.call_count, calls)
+
+            # The free space is computed again for a new device tree.
+            sda1.format.free = Size("1 GiB")
+            b.devicetree = mock.Mock(actions=[], devices=disks + partitions)
+            self.assertEqual(b.get_free_space(disks=[sda]), {"sda": (Size("1 GiB"), Size("4 GiB"))})
+
+            # Partitions can be cleared.
+            b.should_clear.side_effect = lambda device, **kwargs: device is sda1
+            self.assertEqual(b.get_free_space(disks=[sda], clear_part_type=CLEAR_PARTITIONS_ALL),
+                             {"sda": (Size("3 GiB"), Size("3 GiB"))})
@@ -0,0 +1,83 @@
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import unittest
+from unittest.mock import PropertyMock, patch
+
+from pyanaconda.dbus.launcher import AnacondaDBusLauncher
+
+
+class DBusLauncherTestCase(unittest.TestCase):
+    """Test the DBus launcher."""
+
+    def setUp(self):
+        self.boss = self._patch("BOSS").get_proxy.return_value
+        self.boss.ModulesStartupTimings = {"A": 0.1}
+        self.loop = self._patch("create_main_loop").return_value
+        self.timeout_add = self._patch("timeout_add_seconds")
+        self.source_remove = self._patch("source_remove")
+
+    def _patch(self, name):
+        """Patch an object of the launcher."""
+        patcher = patch("pyanaconda.dbus.launcher." + name)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def _set_available(self, *available):
+        """Set the values of the AllModulesAvailable property."""
+        type(self.boss).AllModulesAvailable = PropertyMock(side_effect=available)
+
+    def _check_cleanup(self):
+        """Check that the launcher doesn't wait anymore."""
+        subscription = self.boss.ModulesReady.connect.return_value
+        subscription.disconnect.assert_called_once_with()
+        self.source_remove.assert_called_once_with(self.timeout_add.return_value)
+
+    def modules_ready_test(self):
+        """Wait for the modules that are already ready."""
+        self._set_available(True, True)
+        AnacondaDBusLauncher()._wait_for_modules(10)
+
+        self.boss.ModulesReady.connect.assert_called_once_with(self.loop.quit)
+        self.assertEqual(self.timeout_add.call_args[0][0], 10)
+        self.loop.run.assert_not_called()
+        self._check_cleanup()
+
+    def modules_ready_signal_test(self):
+        """Wait for the signal about ready modules."""
+        self._set_available(False, True)
+        AnacondaDBusLauncher()._wait_for_modules(10)
+
+        self.loop.run.assert_called_once_with()
+        self._check_cleanup()
+
+    def modules_timeout_test(self):
+        """Wait for the modules that are not ready on time."""
+        self._set_available(False, False)
+
+        def run():
+            # Call the timeout callback.
+            callback = self.timeout_add.call_args[0][1]
+            self.assertTrue(callback())
+
+        self.loop.run.side_effect = run
+
+        with self.assertRaises(TimeoutError):
+            AnacondaDBusLauncher()._wait_for_modules(10)
+
+        self.loop.quit.assert_called_once_with()
+        self._check_cleanup()
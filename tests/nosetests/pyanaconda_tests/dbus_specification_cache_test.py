@@ -0,0 +1,190 @@
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import importlib
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from mock import Mock
+
+from pyanaconda.dbus.interface import DBusSpecification, dbus_interface
+from pyanaconda.dbus.specification_cache import DBusSpecificationCache, \
+    DBUS_SPECIFICATIONS_FILE
+from pyanaconda.dbus.typing import *  # pylint: disable=wildcard-import
+
+
+class Interface(object):
+
+    def Method(self, x: Int) -> Str:
+        return str(x)
+
+
+class DBusSpecificationCacheTestCase(unittest.TestCase):
+    """Test the cache of DBus specifications."""
+
+    def _get_class(self, key):
+        """Get a class identified by the key."""
+        module_name, class_name = key.split(":")
+        obj = importlib.import_module(module_name)
+
+        for name in class_name.split("."):
+            obj = getattr(obj, name)
+
+        return obj
+
+    def _generate_specification(self, cls, interface_name):
+        """Generate a specification of the decorated class."""
+        generator = DBusSpecification()
+        specification = cls.__dict__["dbus"]
+
+        # Generate the specification as the decorator did.
+        try:
+            del cls.dbus
+            return generator.generate_specification(cls, interface_name)
+        finally:
+            cls.dbus = specification
+
+    def _check_entries(self, cache):
+        """Check the entries against the source."""
+        generator = DBusSpecification()
+        self.assertTrue(cache.entries)
+
+        for key, entry in cache.entries.items():
+            cls = self._get_class(key)
+            specification = self._generate_specification(cls, entry["interface"])
+            mapping = generator.generate_properties_mapping(specification)
+
+            self.assertEqual(entry["specification"], specification, key)
+            self.assertEqual(entry["properties"], mapping, key)
+            self.assertEqual(entry["token"], cache.get_token(cls, entry["interface"]), key)
+
+    def generated_cache_test(self):
+        """Test the generated cache."""
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "dbus_specifications.json")
+            subprocess.check_call([
+                sys.executable, "-m", "pyanaconda.dbus.specification_cache", "--output", path
+            ])
+
+            cache = DBusSpecificationCache.from_file(path)
+
+        self.assertIn("pyanaconda.modules.boss.boss_interface:BossInterface", cache.entries)
+        self._check_entries(cache)
+
+    def built_cache_test(self):
+        """Test the cache generated at build time."""
+        if not os.path.exists(DBUS_SPECIFICATIONS_FILE):
+            self.skipTest("The cache of DBus specifications is not built.")
+
+        self._check_entries(DBusSpecificationCache.from_file(DBUS_SPECIFICATIONS_FILE))
+
+    def cached_specification_test(self):
+        """Test a cached specification."""
+        cache = DBusSpecificationCache()
+        token = cache.get_token(Interface, "I")
+        key = cache.get_key(Interface)
+        generate = Mock(return_value="<node/>")
+
+        cache = DBusSpecificationCache({
+            key: {"token": token, "interface": "I", "specification": "<cached/>",
+                  "properties": {}}
+        })
+
+        self.assertEqual(cache.get_specification(Interface, "I", generate), "<cached/>")
+        generate.assert_not_called()
+
+        # The entry is not valid for a different interface name.
+        self.assertEqual(cache.get_specification(Interface, "J", generate), "<node/>")
+        generate.assert_called_once_with()
+
+    def stale_specification_test(self):
+        """Test a stale specification."""
+        cache = DBusSpecificationCache({
+            "{}:Interface".format(__name__): {
+                "token": "stale", "interface": "I", "specification": "<cached/>",
+                "properties": {}
+            }
+        })
+        generate = Mock(return_value="<node/>")
+
+        self.assertEqual(cache.get_specification(Interface, "I", generate), "<node/>")
+        generate.assert_called_once_with()
+
+    def local_class_test(self):
+        """Test a class defined in a function."""
+        cache = DBusSpecificationCache(recording=True)
+        generate = Mock(return_value="<node/>")
+
+        class LocalInterface(object):
+            pass
+
+        self.assertIsNone(cache.get_key(LocalInterface))
+        self.assertEqual(cache.get_specification(LocalInterface, "I", generate), "<node/>")
+        self.assertEqual(cache.entries, {})
+
+    def recording_test(self):
+        """Test the recording of specifications."""
+        cache = DBusSpecificationCache(recording=True)
+        key = cache.get_key(Interface)
+        generator = DBusSpecification()
+
+        specification = cache.get_specification(
+            Interface, "I", lambda: generator.generate_specification(Interface, "I")
+        )
+        self.assertEqual(specification, generator.generate_specification(Interface, "I"))
+        self.assertIn(key, cache.entries)
+
+        cache.complete(generator.generate_properties_mapping)
+        self.assertEqual(cache.entries[key]["properties"], {})
+
+        # Conflicting specifications are not recorded.
+        cache.get_specification(Interface, "I", lambda: "<node/>")
+        self.assertNotIn(key, cache.entries)
+
+    def properties_mapping_test(self):
+        """Test the cached properties mappings."""
+        cache = DBusSpecificationCache()
+        generate = Mock(return_value={"A": "B"})
+
+        self.assertEqual(cache.get_properties_mapping("<node/>", generate), {"A": "B"})
+        self.assertEqual(cache.get_properties_mapping("<node/>", generate), {"A": "B"})
+        generate.assert_called_once_with("<node/>")
+
+    def invalid_file_test(self):
+        """Test an invalid file with the cache."""
+        with tempfile.NamedTemporaryFile("w") as f:
+            f.write("invalid")
+            f.flush()
+            self.assertEqual(DBusSpecificationCache.from_file(f.name).entries, {})
+
+        self.assertEqual(DBusSpecificationCache.from_file("/nonexistent/path").entries, {})
+
+    def decorator_test(self):
+        """Test the decorator with the cache."""
+        @dbus_interface("I")
+        class LocalInterface(Interface):
+            pass
+
+        self.assertEqual(
+            LocalInterface.dbus,
+            DBusSpecification().generate_specification(Interface, "I").replace(
+                "Specifies Interface", "Specifies LocalInterface"
+            )
+        )
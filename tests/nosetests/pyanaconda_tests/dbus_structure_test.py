@@ -20,8 +20,9 @@
 import unittest
 
 from pyanaconda.dbus.typing import *  # pylint: disable=wildcard-import
+from pyanaconda.dbus.typing import DBusType
 from pyanaconda.dbus.structure import dbus_structure, get_structure, apply_structure, \
-    DBusStructureError
+    DBusStructureError, get_structures, apply_structures, get_fields, DBusField
 
 
 class DBusStructureTestCase(unittest.TestCase):
@@ -288,3 +289,71 @@ class DBusStructureTestCase(unittest.TestCase):
         data.c = [True, False]
 
         self.assertEqual(repr(data), "StringData(a=123, b='HELLO', c=[True, False])")
+
+    def get_structures_test(self):
+        """Test the batch creation of DBus structures."""
+        objects = []
+
+        for i in range(3):
+            data = self.StringData()
+            data.a = i
+            objects.append(data)
+
+        self.assertEqual(get_structures(objects), [get_structure(data) for data in objects])
+        self.assertEqual(get_structures([]), [])
+
+    def apply_structures_test(self):
+        """Test the batch application of DBus structures."""
+        objects = apply_structures([{'a': 1, 'b': "1"}, {'a': 2, 'c': [True]}], self.StringData)
+
+        self.assertEqual(len(objects), 2)
+        self.assertEqual(repr(objects[0]), "StringData(a=1, b='1', c=[])")
+        self.assertEqual(repr(objects[1]), "StringData(a=2, b='', c=[True])")
+
+        with self.assertRaises(DBusStructureError) as cm:
+            apply_structures([{'y': 1}], self.StringData)
+
+        self.assertEqual(str(cm.exception), "Field 'y' doesn't exist.")
+
+    def changed_fields_test(self):
+        """Test a structure with changed fields."""
+        data = self.StringData()
+        data.__dbus_fields__ = {'a': DBusField('a', Int)}
+
+        self.assertEqual(get_structure(data), {'a': get_variant(Int, 1)})
+
+        with self.assertRaises(DBusStructureError) as cm:
+            apply_structure({'b': "B"}, data)
+
+        self.assertEqual(str(cm.exception), "Field 'b' doesn't exist.")
+
+    def dbus_type_test(self):
+        """Test the DBus types of fields."""
+        fields = get_fields(self.ComplicatedData)
+        self.assertEqual(fields['dictionary'].dbus_type, "a{is}")
+        self.assertEqual(fields['bool-list'].dbus_type, "ab")
+        self.assertEqual(fields['very-long-property-name'].dbus_type, "s")
+
+    def reference_structures_test(self):
+        """Compare the codec with the structures created field by field."""
+        objects = []
+
+        for i in range(10):
+            data = self.ComplicatedData()
+            data.dictionary = {i: str(i)}
+            data.bool_list = [True, False]
+            data.very_long_property_name = "Device {}".format(i)
+            objects.append(data)
+
+        structures = []
+
+        for obj in objects:
+            structure = {}
+
+            for name, field in get_fields(obj).items():
+                dbus_type = DBusType.get_dbus_representation(field.type_hint)
+                structure[name] = Variant(dbus_type, field.get_data(obj))
+
+            structures.append(structure)
+
+        self.assertEqual(get_structures(objects), structures)
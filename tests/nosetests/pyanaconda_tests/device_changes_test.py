@@ -0,0 +1,82 @@
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import copy
+import unittest
+from unittest.mock import Mock
+
+from blivet.size import Size
+
+from pyanaconda.ui.lib.device_changes import DeviceChangeFeed, get_device_summary
+
+
+class DeviceChangeFeedTestCase(unittest.TestCase):
+
+    def _create_device(self, device_id, name, mountpoint=None):
+        fmt = Mock(type="xfs", exists=False, supported=True, mountpoint=mountpoint)
+        fmt.name = "xfs"
+
+        device = Mock(id=device_id, size=Size("1 GiB"), exists=False, protected=False,
+                      disks=[], direct=True, isleaf=True, partitioned=False,
+                      media_present=True, complete=True, format=fmt)
+        device.name = name
+        return device
+
+    def summary_test(self):
+        """Test the summary of a device."""
+        device = self._create_device(1, "sda1", "/boot")
+        summary = get_device_summary(device)
+
+        self.assertEqual(summary.name, "sda1")
+        self.assertEqual(summary.size, Size("1 GiB"))
+        self.assertEqual(summary.mountpoint, "/boot")
+        self.assertEqual(summary, get_device_summary(device))
+
+    def changes_test(self):
+        """Test the changes of devices."""
+        feed = DeviceChangeFeed()
+        a = self._create_device(1, "a", "/")
+        b = self._create_device(2, "b", "/home")
+        c = self._create_device(3, "c")
+
+        changes = feed.update([a, b])
+        self.assertTrue(changes)
+        self.assertEqual(changes.added, [a, b])
+        self.assertEqual(changes.removed, [])
+        self.assertEqual(changes.modified, [])
+
+        # no changes
+        self.assertFalse(feed.update([a, b]))
+
+        # a resized device, a removed device and a new device
+        a.size = Size("2 GiB")
+        changes = feed.update([a, c])
+        self.assertEqual(changes.added, [c])
+        self.assertEqual(changes.removed, [b])
+        self.assertEqual(changes.modified, [a])
+
+        # a changed mount point
+        c.format.mountpoint = "/var"
+        self.assertEqual(feed.update([a, c]).modified, [c])
+
+        # a copy of the device
+        a_copy = copy.copy(a)
+        self.assertEqual(feed.update([a_copy, c]).modified, [a_copy])
+
+        # forget the devices
+        feed.reset()
+        self.assertEqual(feed.update([a_copy, c]).added, [a_copy, c])
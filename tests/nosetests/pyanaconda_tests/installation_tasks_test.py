@@ -18,6 +18,7 @@
 # with the express permission of Red Hat, Inc.
 #
 
+import threading
 import unittest
 
 from pyanaconda.installation_tasks import Task
@@ -369,3 +370,63 @@ class InstallTasksTestCase(unittest.TestCase):
         self.assertEqual(self._test_variable1, 3)
         self.assertEqual(self._test_variable2, 2)
         self.assertEqual(self._test_variable3, 1)
+
+    def parallel_task_queue_test(self):
+        """Check that parallel task queue processing works correctly."""
+        events = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(2, timeout=10)
+
+        def record(name):
+            with lock:
+                events.append(name)
+
+        def task_completed_cb(*args):
+            self._task_completed_count += 1
+
+        queue = TaskQueue(name="queue", parallel=True)
+        queue.task_completed.connect(task_completed_cb)
+        # the independent tasks have to run at the same time to pass the barrier
+        queue.append(Task("a", barrier.wait))
+        queue.append(Task("b", barrier.wait))
+        # the dependent task waits for both of them
+        queue.append(Task("c", record, ("c",), depends_on=["a", "b"]))
+        # tasks sharing a resource run in the order of the queue
+        queue.append(Task("d", record, ("d",), depends_on=["c"], resources=["r"]))
+        queue.append(Task("e", record, ("e",), resources=["r"]))
+        group = TaskQueue(name="group", depends_on=["e"])
+        group.append(Task("f", record, ("f",)))
+        queue.append(group)
+
+        queue.start()
+
+        self.assertEqual(events, ["c", "d", "e", "f"])
+        self.assertEqual(self._task_completed_count, 6)
+        self.assertTrue(queue.done)
+        self.assertFalse(queue.running)
+        self.assertIsNone(queue.current_task_number)
+
+    def parallel_task_queue_failure_test(self):
+        """Check that a failure stops a parallel task queue."""
+        def fail():
+            raise RuntimeError("Failed!")
+
+        queue = TaskQueue(name="queue", parallel=True)
+        queue.append(Task("fail", fail))
+        queue.append(Task("next", self._increment_var1, depends_on=["fail"]))
+
+        with self.assertRaises(RuntimeError):
+            queue.start()
+
+        self.assertEqual(self._test_variable1, 0)
+
+    def parallel_task_queue_deadlock_test(self):
+        """Check that waiting tasks can't block a parallel task queue."""
+        queue = TaskQueue(name="queue", parallel=True)
+        queue.append(Task("a", self._increment_var1, depends_on=["b"]))
+        queue.append(Task("b", self._increment_var1, depends_on=["a"]))
+
+        with self.assertRaises(ValueError):
+            queue.start()
+
+        self.assertEqual(self._test_variable1, 0)
@@ -89,6 +89,41 @@ class RunProgramTests(unittest.TestCase):
         self.assertEqual(retcode, 0)
         self.assertEqual(output, b'\xa0\xa1\xa2')
 
+    def run_program_stream_test(self):
+        """Test _run_program with streamed output."""
+        script = "for i in $(seq 1 10); do echo line $i; done; echo -n end"
+
+        # only the tail of the output is returned
+        retcode, output = util._run_program(["/bin/sh", "-c", script],
+                                            stream_output=True, tail_size=2)
+        self.assertEqual(retcode, 0)
+        self.assertEqual(output, "line 10\nend\n")
+
+        # the whole output is written to the file object
+        with tempfile.TemporaryFile(mode="w+t") as f:
+            retcode, output = util._run_program(["/bin/sh", "-c", script], stdout=f,
+                                                stream_output=True, tail_size=0)
+            f.seek(0)
+            self.assertEqual(retcode, 0)
+            self.assertEqual(output, "")
+            self.assertEqual(f.read(), "".join("line %d\n" % i for i in range(1, 11)) + "end\n")
+
+        # stderr is not returned if filtered
+        retcode, output = util._run_program(["/bin/sh", "-c", "echo output; echo error >&2; exit 3"],
+                                            stream_output=True, filter_stderr=True)
+        self.assertEqual(retcode, 3)
+        self.assertEqual(output, "output\n")
+
+        # binary output
+        retcode, output = util._run_program(['echo', '-en', r'\xa0\xa1\xa2'],
+                                            binary_output=True, stream_output=True)
+        self.assertEqual(retcode, 0)
+        self.assertEqual(output, b'\xa0\xa1\xa2')
+
+        # invalid output
+        with self.assertRaises(UnicodeDecodeError):
+            util._run_program(['echo', '-en', r'\xa0\xa1\xa2'], stream_output=True)
+
     def exec_with_redirect_test(self):
         """Test execWithRedirect."""
         # correct calling should return rc==0
@@ -18,6 +18,7 @@
 
 import unittest
 import os
+import threading
 from contextlib import contextmanager
 from mock import Mock
 
@@ -246,6 +247,35 @@ class KickstartManagerTestCase(unittest.TestCase):
 
         self.assertEqual(errors, expected_errors)
 
+    def distribute_concurrently_test(self):
+        """Test the concurrent distribution of kickstart."""
+        manager = KickstartManager()
+        barrier = threading.Barrier(2, timeout=10)
+
+        module1 = TestModule(commands=["network", "firewall"], barrier=barrier)
+        module2 = TestModule(sections=["packages"], barrier=barrier)
+
+        manager.module_observers = [
+            TestModuleObserver("1", "1", module1),
+            TestModuleObserver("2", "2", module2),
+        ]
+
+        for _i in range(2):
+            with self._create_ks_files(self._kickstart_include) as filename:
+                manager.split(filename)
+
+            # The modules wait for each other.
+            errors = manager.distribute()
+
+            self.assertEqual(module1.kickstart, self._m1_kickstart)
+            self.assertEqual(module2.kickstart, self._m3_kickstart)
+            self.assertEqual([e["module_name"] for e in errors], ["1", "2"])
+            self.assertEqual([e["line_number"] for e in errors], [5, 41])
+
+        # The capabilities are fetched only once.
+        self.assertEqual(module1.capability_calls, 3)
+        self.assertEqual(module2.capability_calls, 3)
+
     def unknown_section_split_test(self):
         ks_content = """
 network --device=ens3
@@ -287,22 +317,27 @@ class TestModuleObserver(DBusObjectObserver):
 
 class TestModule(object):
 
-    def __init__(self, commands=None, sections=None, addons=None):
+    def __init__(self, commands=None, sections=None, addons=None, barrier=None):
         self.kickstart_commands = commands or []
         self.kickstart_sections = sections or []
         self.kickstart_addons = addons or []
         self.kickstart = ""
+        self.capability_calls = 0
+        self.barrier = barrier
 
     @property
     def KickstartSections(self):
+        self.capability_calls += 1
         return self.kickstart_sections
 
     @property
     def KickstartAddons(self):
+        self.capability_calls += 1
         return self.kickstart_addons
 
     @property
     def KickstartCommands(self):
+        self.capability_calls += 1
         return self.kickstart_commands
 
     def ReadKickstart(self, kickstart):
@@ -312,6 +347,9 @@ class TestModule(object):
         """
         self.kickstart = kickstart
 
+        if self.barrier:
+            self.barrier.wait()
+
         for lnum, line in enumerate(kickstart.splitlines(), 1):
             if "PARSE_ERROR" in line:
                 return {
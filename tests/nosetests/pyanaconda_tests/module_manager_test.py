@@ -0,0 +1,133 @@
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import threading
+import unittest
+from mock import Mock, patch
+
+from pyanaconda.modules.boss.boss import Boss
+from pyanaconda.modules.boss.boss_interface import AnacondaBossInterface
+from pyanaconda.modules.boss.module_manager import ModuleManager
+
+
+class ModuleManagerTestCase(unittest.TestCase):
+    """Test the module manager."""
+
+    def _create_observer(self, service_name):
+        """Create a module observer."""
+        observer = Mock()
+        observer.service_name = service_name
+        observer.is_service_available = True
+        return observer
+
+    @patch('pyanaconda.dbus.DBus.get_dbus_proxy')
+    def start_no_modules_test(self, proxy_getter):
+        """Start no modules."""
+        manager = ModuleManager()
+        callback = Mock()
+        manager.modules_ready.connect(callback)
+
+        manager.start_modules()
+        self.assertTrue(manager.modules_are_ready)
+        self.assertEqual(manager.startup_timings, {})
+        callback.assert_called_once_with()
+
+    @patch('pyanaconda.dbus.DBus.get_dbus_proxy')
+    def start_modules_test(self, proxy_getter):
+        """Start modules."""
+        manager = ModuleManager()
+        callback = Mock()
+        manager.modules_ready.connect(callback)
+
+        observers = [self._create_observer("A"), self._create_observer("B")]
+        manager.module_observers.extend(observers)
+        manager.start_modules()
+
+        # All modules are started at once.
+        dbus = proxy_getter.return_value
+        self.assertEqual(dbus.StartServiceByName.call_count, 2)
+        self.assertFalse(manager.modules_are_ready)
+
+        # The first module is ready.
+        manager._process_module_is_available(observers[0])
+        observers[0].proxy.Ping.assert_called_once_with(
+            callback=manager._ping_callback, callback_args=(observers[0],)
+        )
+        manager._ping_callback(observers[0], None, None)
+        self.assertEqual(list(manager.startup_timings), ["A"])
+        self.assertFalse(manager.modules_are_ready)
+        callback.assert_not_called()
+
+        # The second module has failed to answer.
+        manager._ping_callback(observers[1], None, Exception("Fake error!"))
+        self.assertFalse(manager.modules_are_ready)
+
+        # The second module is ready.
+        manager._ping_callback(observers[1], None, None)
+        self.assertEqual(sorted(manager.startup_timings), ["A", "B"])
+        self.assertTrue(manager.modules_are_ready)
+        callback.assert_called_once_with()
+
+        # The signal is emitted only once.
+        manager._ping_callback(observers[0], None, None)
+        callback.assert_called_once_with()
+
+    @patch('pyanaconda.dbus.DBus.get_dbus_proxy')
+    def boss_interface_test(self, proxy_getter):
+        """Check the readiness of modules on the Boss interface."""
+        manager = ModuleManager()
+        observer = self._create_observer("A")
+        manager.module_observers.append(observer)
+
+        boss = Boss(module_manager=manager)
+        callback = Mock()
+
+        with patch.object(AnacondaBossInterface, "ModulesReady", callback):
+            interface = AnacondaBossInterface(boss)
+
+        manager.start_modules()
+        self.assertFalse(interface.AllModulesAvailable)
+        self.assertEqual(interface.ModulesStartupTimings, {})
+
+        manager._ping_callback(observer, None, None)
+        self.assertTrue(interface.AllModulesAvailable)
+        self.assertEqual(list(interface.ModulesStartupTimings), ["A"])
+        callback.assert_called_once_with()
+
+    def stop_modules_test(self):
+        """Stop modules."""
+        manager = ModuleManager()
+        barrier = threading.Barrier(2, timeout=10)
+
+        observers = [self._create_observer("A"), self._create_observer("B")]
+        observers.append(self._create_observer("C"))
+        observers[2].is_service_available = False
+
+        def fail():
+            barrier.wait()
+            raise Exception("Fake error!")
+
+        # The available modules quit concurrently.
+        observers[0].proxy.Quit.side_effect = barrier.wait
+        observers[1].proxy.Quit.side_effect = fail
+
+        manager.module_observers.extend(observers)
+        manager.stop_modules()
+
+        observers[0].proxy.Quit.assert_called_once_with()
+        observers[1].proxy.Quit.assert_called_once_with()
+        observers[2].proxy.Quit.assert_not_called()
@@ -97,6 +97,19 @@ class StorageInterfaceTestCase(unittest.TestCase):
         obj.implementation.stopped_signal.emit()
         storage_changed_callback.called_once()
 
+    @patch('pyanaconda.dbus.DBus.publish_object')
+    def reset_with_task_copy_test(self, publisher):
+        """Test that ResetWithTask resets a full copy of the storage."""
+        storage = Mock()
+        self.storage_module.set_storage(storage)
+        self.storage_interface.ResetWithTask()
+
+        # The copy has the devices of the storage, so the reset
+        # can save the passphrases of the unlocked LUKS devices.
+        object_path, obj = publisher.call_args[0]
+        storage.copy.assert_called_once_with()
+        self.assertEqual(obj.implementation._storage, storage.copy.return_value)
+
     @patch('pyanaconda.modules.storage.partitioning.validate.storage_checker')
     def apply_partitioning_test(self, storage_checker):
         """Test ApplyPartitioning."""
@@ -112,7 +125,8 @@ class StorageInterfaceTestCase(unittest.TestCase):
         self.assertEqual(self.storage_module._auto_part_module.storage, storage_2)
 
         self.storage_interface.ApplyPartitioning(AUTO_PARTITIONING.object_path)
-        self.assertEqual(self.storage_module.storage, storage_3)
+        self.assertEqual(self.storage_module.storage, storage_2)
+        self.assertEqual(self.storage_module._auto_part_module.storage, storage_3)
 
         with self.assertRaises(ValueError):
             self.storage_interface.ApplyPartitioning(ObjPath("invalid"))
@@ -19,6 +19,7 @@ import unittest
 from time import sleep
 from mock import Mock, call
 
+from pyanaconda.core.timing import timing_trace
 from pyanaconda.dbus.interface import dbus_class
 from pyanaconda.dbus.typing import *  # pylint: disable=wildcard-import
 from pyanaconda.modules.boss.install_manager.installation import SystemInstallationTask
@@ -423,6 +424,9 @@ class TaskInterfaceTestCase(unittest.TestCase):
         self._check_progress_changed(1, "Simple Task")
         self._check_no_result()
 
+        # The timing trace is cleared after the installation.
+        self.assertEqual(timing_trace.events, [])
+
     def install_with_failing_task_test(self):
         """Install with one failing task."""
         self._set_up_task(
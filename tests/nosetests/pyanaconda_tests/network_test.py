@@ -19,6 +19,9 @@
 from pyanaconda import network
 import unittest
 
+from mock import Mock, patch
+from gi.repository import NM
+
 class NetworkTests(unittest.TestCase):
 
     def default_ks_vlan_interface_name_test(self):
@@ -221,3 +224,42 @@ class NetworkTests(unittest.TestCase):
             self.assertFalse(network.check_ip_address(i))
             self.assertFalse(network.check_ip_address(i, version=6))
             self.assertFalse(network.check_ip_address(i, version=4))
+
+
+class NetworkWaitTests(unittest.TestCase):
+
+    @patch("pyanaconda.network.nm")
+    @patch("pyanaconda.network.NETWORK")
+    def wait_for_connected_NM_test(self, network_service, nm):
+        proxy = Mock(Connected=False)
+        network_service.get_proxy.return_value = proxy
+        nm.nm_state.return_value = NM.State.CONNECTED_GLOBAL
+        nm.nm_wait_for.return_value = True
+
+        self.assertTrue(network.wait_for_connected_NM(timeout=10))
+        condition, timeout = nm.nm_wait_for.call_args[0]
+        self.assertTrue(condition())
+        self.assertEqual(timeout, 10)
+
+        # Wait only for the result of connecting.
+        proxy.IsConnecting.return_value = False
+        self.assertFalse(network.wait_for_connected_NM(only_connecting=True))
+
+        proxy.IsConnecting.return_value = True
+        nm.nm_state.return_value = NM.State.DISCONNECTED
+        self.assertFalse(network.wait_for_connected_NM(timeout=10, only_connecting=True))
+        condition, _timeout = nm.nm_wait_for.call_args[0]
+        self.assertTrue(condition())
+
+        nm.nm_state.return_value = NM.State.CONNECTING
+        self.assertFalse(condition())
+
+    @patch("pyanaconda.network.nm")
+    def wait_for_network_devices_test(self, nm):
+        nm.nm_wait_for.side_effect = lambda condition, timeout: condition()
+
+        nm.nm_activated_devices.return_value = ["ens3", "ens4"]
+        self.assertTrue(network.wait_for_network_devices(["ens3"]))
+
+        nm.nm_activated_devices.return_value = ["ens4"]
+        self.assertFalse(network.wait_for_network_devices(["ens3"]))
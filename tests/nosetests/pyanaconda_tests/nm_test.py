@@ -19,6 +19,11 @@
 from pyanaconda import nm
 import unittest
 import socket
+import threading
+import time
+
+from mock import Mock, patch
+from gi.repository import NM
 
 class UtilityFunctionsTests(unittest.TestCase):
 
@@ -41,3 +46,139 @@ class UtilityFunctionsTests(unittest.TestCase):
         # The result will be 23505088 little-endian or 3232261633 big-endian
         self.assertEqual(nm.nm_ipv4_to_dbus_int("192.168.102.1"),
                          socket.ntohl(3232261633))
+
+
+class NMModelTestCase(unittest.TestCase):
+
+    DEVICE = "/org/freedesktop/NetworkManager/Devices/1"
+    DEVICE_IFACE = "org.freedesktop.NetworkManager.Device"
+
+    def _create_model(self, *properties):
+        connection = Mock()
+        connection.call_sync.side_effect = [
+            Mock(unpack=Mock(return_value=(p,))) for p in properties
+        ]
+
+        model = nm.NMModel()
+        model._connect = Mock(return_value=connection)
+        model._start_dispatching = Mock()
+        return model, connection
+
+    def _properties_changed(self, model, object_path, interface, changed, invalidated=()):
+        parameters = Mock(unpack=Mock(return_value=(interface, changed, list(invalidated))))
+        model._properties_changed_callback(None, nm.NM_SERVICE, object_path,
+                                           "org.freedesktop.DBus.Properties",
+                                           "PropertiesChanged", parameters)
+
+    def cached_properties_test(self):
+        """Test the cached properties."""
+        model, connection = self._create_model(
+            {"State": 100, "Interface": "ens3"},
+            {"State": 30, "Interface": "ens3"}
+        )
+
+        self.assertEqual(model.get_property(self.DEVICE, "State", self.DEVICE_IFACE), 100)
+        self.assertEqual(model.get_property(self.DEVICE, "Interface", self.DEVICE_IFACE), "ens3")
+        self.assertEqual(connection.call_sync.call_count, 1)
+        model._start_dispatching.assert_called_once_with(connection)
+
+        # Update the cache with a signal.
+        self._properties_changed(model, self.DEVICE, self.DEVICE_IFACE, {"State": 20})
+        self.assertEqual(model.get_property(self.DEVICE, "State", self.DEVICE_IFACE), 20)
+        self.assertEqual(connection.call_sync.call_count, 1)
+
+        # Invalidated properties are fetched again.
+        self._properties_changed(model, self.DEVICE, self.DEVICE_IFACE, {}, ["State"])
+        self.assertEqual(model.get_property(self.DEVICE, "State", self.DEVICE_IFACE), 30)
+        self.assertEqual(connection.call_sync.call_count, 2)
+
+    def removed_object_test(self):
+        """Test the properties of a removed object."""
+        model, connection = self._create_model({"State": 100}, {"State": 10})
+        self.assertEqual(model.get_property(self.DEVICE, "State", self.DEVICE_IFACE), 100)
+
+        parameters = Mock(unpack=Mock(return_value=(self.DEVICE, [self.DEVICE_IFACE])))
+        model._interfaces_removed_callback(None, nm.NM_SERVICE, nm.NM_OBJECT_MANAGER_PATH,
+                                           "org.freedesktop.DBus.ObjectManager",
+                                           "InterfacesRemoved", parameters)
+
+        self.assertEqual(model.get_property(self.DEVICE, "State", self.DEVICE_IFACE), 10)
+        self.assertEqual(connection.call_sync.call_count, 2)
+
+    def changed_during_call_test(self):
+        """Test the properties changed during the call."""
+        model, connection = self._create_model({"State": 100}, {"State": 20})
+        result = connection.call_sync.side_effect
+
+        def call_sync(*args):
+            self._properties_changed(model, self.DEVICE, self.DEVICE_IFACE, {"State": 20})
+            return next(result)
+
+        connection.call_sync.side_effect = call_sync
+
+        self.assertEqual(model.get_property(self.DEVICE, "State", self.DEVICE_IFACE), 100)
+        self.assertEqual(model.get_property(self.DEVICE, "State", self.DEVICE_IFACE), 20)
+        self.assertEqual(connection.call_sync.call_count, 2)
+
+    def reset_test(self):
+        """Test the reset of the model."""
+        model, connection = self._create_model({"State": 100}, {"State": 20})
+        self.assertEqual(model.get_property(self.DEVICE, "State", self.DEVICE_IFACE), 100)
+
+        model.reset()
+        self.assertEqual(model.get_property(self.DEVICE, "State", self.DEVICE_IFACE), 20)
+        self.assertEqual(connection.call_sync.call_count, 2)
+
+    def no_connection_test(self):
+        """Test the model without a connection."""
+        model = nm.NMModel()
+        model._connect = Mock(return_value=None)
+        model._start_dispatching = Mock()
+
+        self.assertIsNone(model.get_property(self.DEVICE, "State", self.DEVICE_IFACE))
+        self.assertEqual(model.get_devices(), [])
+        self.assertEqual(model.get_interfaces(self.DEVICE), [])
+        model._start_dispatching.assert_not_called()
+
+    def devices_test(self):
+        """Test the devices of the model."""
+        devices = ["/org/freedesktop/NetworkManager/Devices/{}".format(i) for i in range(3)]
+        model, connection = self._create_model(
+            {"Devices": devices},
+            {"Interface": "lo", "IpInterface": "lo", "DeviceType": NM.DeviceType.GENERIC},
+            {"Interface": "ens3", "IpInterface": "", "DeviceType": NM.DeviceType.ETHERNET},
+            {"Interface": "bond0", "IpInterface": "bond0", "DeviceType": NM.DeviceType.BOND},
+        )
+
+        with patch("pyanaconda.nm.get_nm_model", return_value=model):
+            self.assertEqual(nm.nm_devices(), ["ens3", "bond0"])
+            self.assertEqual(nm.nm_device_type("bond0"), NM.DeviceType.BOND)
+            self.assertEqual(nm.nm_device_property("ens3", "Interface"), "ens3")
+
+            with self.assertRaises(nm.UnknownDeviceError):
+                nm.nm_device_type("eth0")
+
+        # Every object is fetched only once.
+        self.assertEqual(connection.call_sync.call_count, 4)
+
+    def wait_for_test(self):
+        """Test the wait for a change of the state."""
+        model, connection = self._create_model({"State": NM.State.CONNECTING})
+        nm_path = nm.NM_OBJECT_PATH
+
+        def connected():
+            return model.get_property(nm_path, "State", nm.NM_SERVICE) == NM.State.CONNECTED_SITE
+
+        self.assertFalse(model.wait_for(connected, 0.1))
+
+        timer = threading.Timer(0.1, self._properties_changed, args=(
+            model, nm_path, nm.NM_SERVICE, {"State": NM.State.CONNECTED_SITE}
+        ))
+        timer.start()
+
+        # The thread is woken up by the signal, not by the timeout.
+        start = time.monotonic()
+        self.assertTrue(model.wait_for(connected, 60))
+        self.assertLess(time.monotonic() - start, 30)
+        self.assertEqual(connection.call_sync.call_count, 1)
+        timer.join()
@@ -0,0 +1,123 @@
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import os
+import tempfile
+import unittest
+
+from unittest.mock import Mock
+
+from pyanaconda.payload.package_cache import PackageCache
+
+
+class PackageCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self._temp_dir.name, "cache")
+        self.dnf_dir = os.path.join(self._temp_dir.name, "dnf")
+        self.download_dir = os.path.join(self._temp_dir.name, "download")
+
+        self.cache = PackageCache(self.cache_dir, 1000)
+        self.cache.setup()
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _create_file(self, path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, "w") as f:
+            f.write(content)
+
+    def _get_package(self, name, checksum, content=""):
+        package = Mock(downloadsize=len(content), evr="1.0-1", arch="noarch")
+        package.name = name
+        package.returnIdSum.return_value = ("sha256", checksum)
+        package.localPkg.return_value = os.path.join(self.download_dir, name + ".rpm")
+
+        if content:
+            self._create_file(package.localPkg(), content)
+
+        return package
+
+    def metadata_test(self):
+        """Test the cached metadata."""
+        repomd = os.path.join(self.dnf_dir, "fedora-123", "repodata", "repomd.xml")
+        self._create_file(repomd, "<repomd/>")
+
+        self.cache.store_metadata(self.dnf_dir)
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hits, 0)
+
+        # The metadata are restored to an empty DNF cache.
+        os.unlink(repomd)
+        self.cache.restore_metadata(self.dnf_dir)
+
+        with open(repomd) as f:
+            self.assertEqual(f.read(), "<repomd/>")
+
+        # The unchanged metadata are counted as a hit.
+        self.cache.store_metadata(self.dnf_dir)
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hits, 1)
+
+        # The changed metadata are counted as a miss.
+        self._create_file(repomd, "<repomd></repomd>")
+        self.cache.store_metadata(self.dnf_dir)
+        self.assertEqual(self.cache.misses, 2)
+        self.assertEqual(len(os.listdir(os.path.join(self.cache_dir, "metadata"))), 2)
+
+    def packages_test(self):
+        """Test the cached packages."""
+        package = self._get_package("a", "aaa", content="content of a")
+
+        self.cache.restore_packages([package])
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.miss_size, 12)
+
+        self.cache.store_packages([package])
+        os.unlink(package.localPkg())
+
+        self.cache.restore_packages([package])
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.hit_size, 12)
+
+        with open(package.localPkg()) as f:
+            self.assertEqual(f.read(), "content of a")
+
+        # A package with a different checksum is not restored.
+        os.unlink(package.localPkg())
+        package = self._get_package("a", "bbb")
+
+        self.cache.restore_packages([package])
+        self.assertEqual(self.cache.misses, 2)
+        self.assertFalse(os.path.exists(package.localPkg()))
+
+    def evict_test(self):
+        """Test the eviction of the least recently used items."""
+        packages = [self._get_package(name, name, content=name * 400) for name in "abc"]
+        self.cache.store_packages(packages)
+
+        for i, package in enumerate(packages):
+            path = os.path.join(self.cache_dir, "packages", "{}-1.0-1.noarch-{}.rpm"
+                                .format(package.name, package.name))
+            os.utime(path, (i, i))
+
+        self.cache.evict()
+        self.assertEqual(sorted(os.listdir(os.path.join(self.cache_dir, "packages"))),
+                         ["b-1.0-1.noarch-b.rpm", "c-1.0-1.noarch-c.rpm"])
@@ -25,8 +25,20 @@ import tempfile
 import os
 import hashlib
 import shutil
+import time
 
-from pyanaconda.payload.dnfpayload import RepoMDMetaHash
+from unittest.mock import Mock, PropertyMock, patch
+
+import dnf.exceptions
+from requests.exceptions import RequestException
+
+from pyanaconda.payload.dnfpayload import RepoMDMetaHash, download_repoMDs
+from pyanaconda.payload.comps_index import CompsIndex
+from pyanaconda.payload.initrd_builder import InitrdBuilder
+from pyanaconda.payload.livepayload import get_image_checksum, get_tar_compression_options, \
+    LiveImageKSPayload
+from pyanaconda.errors import ERROR_RAISE
+from pyanaconda.payload import PayloadInstallError, DependencyError
 from pyanaconda.payload import PayloadRequirements, PayloadRequirementsMissingApply
 
 
@@ -151,6 +163,708 @@ or it should be. Nah it's just a test!
         self.assertFalse(r.verify_repoMD())
 
 
+    @patch("pyanaconda.payload.dnfpayload._get_repo_check_session")
+    def conditional_request_test(self, get_session):
+        """Test the conditional requests for repomd.xml."""
+        session = get_session.return_value
+        session.get.return_value = Mock(ok=True, status_code=200, text="repomd",
+                                        headers={"ETag": "123"})
+
+        self._dummyRepo.baseurl = ["http://mirror"]
+        r = RepoMDMetaHash(DummyPayload(), self._dummyRepo)
+        r.store_repoMD_hash()
+        self.assertNotIn("If-None-Match", session.get.call_args[1]["headers"])
+
+        # the file was not modified
+        session.get.return_value = Mock(ok=False, status_code=304, headers={})
+        self.assertTrue(r.verify_repoMD())
+        self.assertEqual(session.get.call_args[1]["headers"]["If-None-Match"], "123")
+        self.assertIsNotNone(session.get.call_args[1]["timeout"])
+
+        # the file was modified
+        session.get.return_value = Mock(ok=True, status_code=200, text="changed", headers={})
+        self.assertFalse(r.verify_repoMD())
+
+    @patch("pyanaconda.payload.dnfpayload._get_repo_check_session")
+    def download_mirrors_test(self, get_session):
+        """Test the download of repomd.xml from mirrors."""
+        def get(url, **kwargs):
+            if url.startswith("http://broken"):
+                raise RequestException("Failed!")
+            return Mock(ok=True, status_code=200, text=url, headers={})
+
+        get_session.return_value.get.side_effect = get
+
+        repo_1 = DummyRepo()
+        repo_1.baseurl = ["http://broken", "http://mirror1"]
+        repo_2 = DummyRepo()
+        repo_2.baseurl = ["http://broken"]
+        repo_3 = DummyRepo()
+
+        repos = [RepoMDMetaHash(DummyPayload(), r) for r in (repo_1, repo_2, repo_3)]
+        responses = download_repoMDs(repos)
+
+        self.assertEqual(responses[repos[0]].url, "http://mirror1")
+        self.assertEqual(responses[repos[0]].text, "http://mirror1/repodata/repomd.xml")
+        self.assertIsNone(responses[repos[1]])
+        self.assertIsNone(responses[repos[2]])
+
+    @patch("pyanaconda.payload.dnfpayload._get_repo_check_session")
+    def verify_stored_mirror_test(self, get_session):
+        """Test the verification of repomd.xml with the stored mirror."""
+        broken = set()
+        requested = []
+
+        def get(url, **kwargs):
+            requested.append(url)
+            if url in broken:
+                raise RequestException("Failed!")
+            return Mock(ok=True, status_code=200, text=url, headers={})
+
+        get_session.return_value.get.side_effect = get
+
+        self._dummyRepo.baseurl = ["http://mirror1", "http://mirror2"]
+        r = RepoMDMetaHash(DummyPayload(), self._dummyRepo)
+
+        broken.add("http://mirror1/repodata/repomd.xml")
+        r.store_repoMD_hash()
+        self.assertEqual(r.stored_url, "http://mirror2")
+
+        # only the stored mirror is requested
+        broken.clear()
+        requested.clear()
+        self.assertTrue(r.verify_repoMD())
+        self.assertEqual(requested, ["http://mirror2/repodata/repomd.xml"])
+
+        # other mirrors are requested if the stored mirror fails
+        broken.add("http://mirror2/repodata/repomd.xml")
+        requested.clear()
+        self.assertFalse(r.verify_repoMD())
+        self.assertEqual(sorted(requested), ["http://mirror1/repodata/repomd.xml",
+                                             "http://mirror2/repodata/repomd.xml"])
+
+
+class CompsIndexTestCase(unittest.TestCase):
+
+    def _create_comps(self):
+        comps = Mock()
+
+        env = Mock(id="server", ui_name="Server", ui_description="Server description",
+                   option_ids=[Mock(default=True), Mock(default=False)])
+        env.name = "Server Environment"
+        env.option_ids[0].name = "web"
+        env.option_ids[1].name = "mail"
+        comps.environments = [env]
+
+        groups = []
+        for grp_id, visible, lang in (("web", True, None), ("mail", False, None),
+                                      ("czech", True, "cs")):
+            grp = Mock(id=grp_id, visible=visible, lang_only=lang, ui_name=grp_id.upper(),
+                       ui_description="")
+            grp.name = grp_id.capitalize()
+            groups.append(grp)
+
+        comps.groups_iter.return_value = iter(groups)
+        comps.environment_by_pattern.return_value = env
+        comps.group_by_pattern.return_value = None
+        return comps
+
+    def lookup_test(self):
+        """Test the lookups in the comps index."""
+        comps = self._create_comps()
+        index = CompsIndex(comps)
+
+        self.assertEqual(index.environments, ["server"])
+        self.assertEqual(index.groups, ["web", "mail", "czech"])
+        self.assertEqual(index.lang_only, {"web": None, "mail": None, "czech": "cs"})
+
+        self.assertEqual(index.environment("server").id, "server")
+        self.assertEqual(index.environment("Server Environment").id, "server")
+        self.assertEqual(index.group("Mail").id, "mail")
+        self.assertEqual(index.options("server"), {"web": True, "mail": False})
+        self.assertEqual(index.options("unknown"), {})
+        self.assertTrue(index.is_visible("web"))
+        self.assertFalse(index.is_visible("mail"))
+        comps.environment_by_pattern.assert_not_called()
+        comps.group_by_pattern.assert_not_called()
+
+        # patterns are resolved by the comps data only once
+        self.assertEqual(index.environment("serv*").id, "server")
+        self.assertEqual(index.environment("serv*").id, "server")
+        comps.environment_by_pattern.assert_called_once_with("serv*")
+
+        self.assertIsNone(index.group("unknown"))
+        self.assertIsNone(index.group("unknown"))
+        comps.group_by_pattern.assert_called_once_with("unknown")
+
+    def describe_test(self):
+        """Test the descriptions in the comps index."""
+        index = CompsIndex(self._create_comps())
+        env = index.environment("server")
+        self.assertEqual(index.describe(env), ("Server", "Server description"))
+
+        # the description is remembered
+        env.ui_name = "Changed"
+        self.assertEqual(index.describe(env), ("Server", "Server description"))
+        self.assertEqual(index.describe(index.group("web")), ("WEB", ""))
+
+
+class DNFPayloadMetadataTestCase(unittest.TestCase):
+
+    @patch("pyanaconda.payload.dnfpayload.DNFPayload._configure")
+    def setUp(self, configure):
+        self.payload = dnfpayload.DNFPayload(Mock())
+        self.payload.disableRepo = Mock()
+
+    def _get_repo(self, repo_id, error=None):
+        repo = Mock(id=repo_id, baseurl=["http://" + repo_id])
+
+        if error:
+            repo.load.side_effect = error
+
+        return repo
+
+    def sync_metadata_test(self):
+        """Test the parallel loading of the repo metadata."""
+        repos = [self._get_repo("repo-{}".format(i)) for i in range(20)]
+        self.payload._sync_metadata(repos)
+
+        for repo in repos:
+            repo.load.assert_called_once_with()
+
+        self.payload.disableRepo.assert_not_called()
+        self.assertEqual(self.payload.verbose_errors, [])
+
+    def sync_metadata_failed_test(self):
+        """Test the parallel loading of the invalid repo metadata."""
+        valid_repo = self._get_repo("valid")
+        invalid_repo = self._get_repo("invalid", dnf.exceptions.RepoError("Invalid repo."))
+        self.payload._sync_metadata([valid_repo, invalid_repo])
+
+        valid_repo.load.assert_called_once_with()
+        invalid_repo.load.assert_called_once_with()
+
+        self.payload.disableRepo.assert_called_once_with("invalid")
+        self.assertEqual(self.payload.verbose_errors, ["Invalid repo."])
+
+    def sync_metadata_timeout_test(self):
+        """Test the timeouts of the repo metadata loading."""
+        loaded = []
+
+        def load():
+            time.sleep(0.5)
+            loaded.append(True)
+
+        repo = self._get_repo("slow")
+        repo.load.side_effect = load
+
+        self.payload.data.packages.timeout = None
+        self.payload._sync_metadata([repo])
+
+        # The stalled downloads are aborted by librepo.
+        self.assertEqual(repo.timeout, dnfpayload.REPO_METADATA_STALL_TIMEOUT)
+        self.assertEqual(repo.minrate, dnfpayload.REPO_METADATA_MINRATE)
+
+        # The loading has finished before the method returned.
+        self.assertEqual(loaded, [True])
+        self.payload.disableRepo.assert_not_called()
+
+        # The timeout from the kickstart file is respected.
+        repo = self._get_repo("custom")
+        self.payload.data.packages.timeout = 5
+        self.payload._sync_metadata([repo])
+        self.assertNotEqual(repo.timeout, dnfpayload.REPO_METADATA_STALL_TIMEOUT)
+
+    def sync_metadata_stalled_test(self):
+        """Test the aborted loading of the stalled repo metadata."""
+        repo = self._get_repo("stalled", dnf.exceptions.RepoError("Timeout was reached."))
+        self.payload._sync_metadata([repo])
+
+        self.payload.disableRepo.assert_called_once_with("stalled")
+        self.assertEqual(self.payload.verbose_errors, ["Timeout was reached."])
+
+
+    @patch("pyanaconda.payload.dnfpayload.DNFPayload._configure")
+    def unsetup_test(self, configure):
+        """Test that the unsetup forgets the data of the old sack."""
+        self.payload._comps_index = Mock()
+        self.payload._resolution_cache["fingerprint"] = Mock()
+        self.payload._space_required = (1, Size("1 GiB"))
+
+        self.payload.unsetup()
+        configure.assert_called_once_with()
+
+        self.assertIsNone(self.payload._comps_index)
+        self.assertEqual(len(self.payload._resolution_cache), 0)
+        self.assertEqual(self.payload._space_required, (None, None))
+
+
+class DNFPayloadSpaceTestCase(unittest.TestCase):
+
+    @patch("pyanaconda.payload.dnfpayload.DNFPayload._configure")
+    def setUp(self, configure):
+        self.payload = dnfpayload.DNFPayload(Mock())
+        self.payload._base = Mock()
+        self.payload.txID = 1
+
+        self.package = Mock(installsize=Size("1 MiB"))
+        self.files = PropertyMock(return_value=["/a", "/b"])
+        type(self.package).files = self.files
+        self.payload._base.transaction = [Mock(pkg=self.package)]
+
+    @patch("pyanaconda.payload.dnfpayload.conf")
+    def estimated_space_test(self, conf):
+        """Test the estimation of the required space."""
+        conf.payload.exact_space_estimation = False
+        files = 1 + Size("1 MiB") // Size("16 KiB")
+        expected = (Size("1 MiB") + files * dnfpayload.BONUS_SIZE_ON_FILE) * 1.1
+
+        self.assertEqual(self.payload._spaceRequired(), expected)
+        self.files.assert_not_called()
+
+    @patch("pyanaconda.payload.dnfpayload.conf")
+    def exact_space_test(self, conf):
+        """Test the exact calculation of the required space."""
+        conf.payload.exact_space_estimation = True
+        expected = (Size("1 MiB") + 2 * dnfpayload.BONUS_SIZE_ON_FILE) * 1.1
+
+        self.assertEqual(self.payload._spaceRequired(), expected)
+        self.files.assert_called_once_with()
+
+    @patch("pyanaconda.payload.dnfpayload.conf")
+    def cached_space_test(self, conf):
+        """Test the caching of the required space."""
+        conf.payload.exact_space_estimation = True
+        space = self.payload._spaceRequired()
+
+        # the same transaction
+        self.payload._base.transaction = []
+        self.assertEqual(self.payload._spaceRequired(), space)
+
+        # a new transaction
+        self.payload.txID = 2
+        self.assertEqual(self.payload._spaceRequired(), Size(0))
+
+        # the accuracy mode has changed
+        self.payload._base.transaction = [Mock(pkg=self.package)]
+        conf.payload.exact_space_estimation = False
+        self.assertNotEqual(self.payload._spaceRequired(), Size(0))
+
+        # no transaction
+        self.payload._base.transaction = None
+        self.assertEqual(self.payload._spaceRequired(), Size("3000 MB"))
+
+    @patch("pyanaconda.payload.dnfpayload.shutil")
+    @patch("pyanaconda.payload.dnfpayload.conf")
+    def reset_space_test(self, conf, shutil):
+        """Test the required space after a reset of the payload."""
+        conf.payload.exact_space_estimation = False
+        self.payload._configure_proxy = Mock()
+        space = self.payload._spaceRequired()
+
+        # a new selection after the reset starts with the same id
+        self.payload.reset()
+        self.assertIsNone(self.payload.txID)
+        self.payload._bump_tx_id()
+        self.assertEqual(self.payload.txID, 1)
+
+        self.payload._base.transaction = []
+        self.assertNotEqual(space, Size(0))
+        self.assertEqual(self.payload._spaceRequired(), Size(0))
+
+
+class DNFPayloadPackageCacheTestCase(unittest.TestCase):
+
+    @patch("pyanaconda.payload.dnfpayload.DNFPayload._configure")
+    def setUp(self, configure):
+        self.payload = dnfpayload.DNFPayload(Mock())
+        self.payload._base = Mock()
+        self.payload._base.repos.iter_enabled.return_value = []
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+
+    def _update_base_repo(self):
+        """Configure the base repo."""
+        self.payload.reset = Mock()
+        self.payload._setupInstallDevice = Mock(return_value=(None, None, None))
+        self.payload.setUpdatesEnabled = Mock()
+
+        with patch("pyanaconda.payload.dnfpayload.flags") as flags:
+            flags.askmethod = True
+            self.payload.updateBaseRepo()
+
+    def _gather_repo_metadata(self):
+        """Load the metadata of the repos."""
+        self.payload._sync_metadata = Mock()
+        self.payload._read_comps = Mock()
+        self.payload._refreshEnvironmentAddons = Mock()
+        self.payload.gatherRepoMetadata()
+        self.payload._base.fill_sack.assert_called_once_with(load_system_repo=False)
+
+    def _install(self):
+        """Download and install the packages."""
+        location = os.path.join(self.tmp_dir, "packages")
+        package = Mock()
+        package.localPkg.return_value = os.path.join(location, "package.rpm")
+        self.payload._base.transaction.install_set = [package]
+
+        self.payload.rpmMacros = []
+        self.payload.checkSoftwareSelection = Mock()
+        self.payload._pick_download_location = Mock(return_value=location)
+
+        with patch("pyanaconda.payload.dnfpayload.multiprocessing") as multiprocessing:
+            multiprocessing.Queue.return_value.get.return_value = ("done", None)
+            self.payload.install()
+
+        self.payload._base.download_packages.assert_called_once()
+        return package
+
+    @patch("pyanaconda.payload.dnfpayload.PackageCache")
+    @patch("pyanaconda.payload.dnfpayload.conf")
+    def disabled_package_cache_test(self, conf, cache_class):
+        """Test the installation without the package cache."""
+        conf.payload.package_cache = ""
+
+        self._update_base_repo()
+        self._gather_repo_metadata()
+        self._install()
+
+        cache_class.assert_not_called()
+
+    @patch("pyanaconda.payload.dnfpayload.PackageCache")
+    @patch("pyanaconda.payload.dnfpayload.conf")
+    def enabled_package_cache_test(self, conf, cache_class):
+        """Test the installation with the package cache."""
+        cache_dir = os.path.join(self.tmp_dir, "dnf.cache")
+        conf.payload.package_cache = os.path.join(self.tmp_dir, "cache")
+        conf.payload.package_cache_size = "1 GiB"
+
+        cache = cache_class.return_value
+        cache.store_packages.side_effect = OSError("Fake error!")
+        cache.store_packages.__name__ = "store_packages"
+
+        with patch("pyanaconda.payload.dnfpayload.DNF_CACHE_DIR", cache_dir):
+            self._update_base_repo()
+            cache_class.assert_called_once_with(conf.payload.package_cache, Size("1 GiB"))
+            cache.setup.assert_called_once_with()
+            cache.restore_metadata.assert_called_once_with(cache_dir)
+            self.assertTrue(os.path.isdir(cache_dir))
+
+            self._gather_repo_metadata()
+            cache.store_metadata.assert_called_once_with(cache_dir)
+
+        # The failed action doesn't stop the installation.
+        package = self._install()
+        cache.restore_packages.assert_called_once_with([package])
+        cache.store_packages.assert_called_once_with([package])
+        cache.evict.assert_called_once_with()
+        cache.log_statistics.assert_called_once_with()
+
+        # The cache is set up only once.
+        cache_class.assert_called_once()
+
+    @patch("pyanaconda.payload.dnfpayload.PackageCache")
+    @patch("pyanaconda.payload.dnfpayload.conf")
+    def failed_package_cache_test(self, conf, cache_class):
+        """Test the installation with a package cache that can't be set up."""
+        conf.payload.package_cache = os.path.join(self.tmp_dir, "cache")
+        conf.payload.package_cache_size = "1 GiB"
+        cache_class.return_value.setup.side_effect = OSError("Fake error!")
+
+        self._update_base_repo()
+        self._gather_repo_metadata()
+        self._install()
+
+        cache_class.return_value.restore_metadata.assert_not_called()
+        cache_class.return_value.restore_packages.assert_not_called()
+
+
+class DNFPayloadResolutionTestCase(unittest.TestCase):
+
+    @patch("pyanaconda.payload.dnfpayload.DNFPayload._configure")
+    def setUp(self, configure):
+        self.payload = dnfpayload.DNFPayload(Mock())
+        self.payload._base = Mock(transaction=[])
+        self.payload._base.repos.iter_enabled.return_value = [Mock(id="fedora")]
+        self.payload._enable_modules = Mock()
+        self.payload._get_module_specs = Mock(return_value=[])
+        self.payload._get_selections = Mock(return_value=(["@core"], []))
+        self.payload._apply_selections = Mock(return_value=True)
+        self.payload._spaceRequired = Mock(return_value=Size(0))
+
+    def _check(self):
+        """Check the software selection and return the resolved goal."""
+        self.payload._base._goal = Mock()
+        self.payload.checkSoftwareSelection()
+        return self.payload._base._goal
+
+    def cached_resolution_test(self):
+        """Test the reuse of the resolved transaction."""
+        goal = self._check()
+        self.assertEqual(self._check(), goal)
+        self.assertEqual(self.payload._base.resolve.call_count, 1)
+        self.assertEqual(self.payload._apply_selections.call_count, 1)
+        self.assertEqual(self.payload._base.reset.call_count, 2)
+
+        # a different selection
+        self.payload._get_selections.return_value = (["@core", "vim"], [])
+        self.assertNotEqual(self._check(), goal)
+        self.assertEqual(self.payload._base.resolve.call_count, 2)
+
+        # the original selection
+        self.payload._get_selections.return_value = (["@core"], [])
+        self.assertEqual(self._check(), goal)
+        self.assertEqual(self.payload._base.resolve.call_count, 2)
+
+        # new metadata
+        self.payload._sack_generation += 1
+        self.assertNotEqual(self._check(), goal)
+        self.assertEqual(self.payload._base.resolve.call_count, 3)
+
+    def cache_size_test(self):
+        """Test the size of the cache of resolved transactions."""
+        for i in range(dnfpayload.RESOLUTION_CACHE_SIZE + 1):
+            self.payload._get_selections.return_value = (["package-%d" % i], [])
+            self._check()
+
+        self.assertEqual(len(self.payload._resolution_cache), dnfpayload.RESOLUTION_CACHE_SIZE)
+
+        # the oldest selection was forgotten
+        self.payload._get_selections.return_value = (["package-0"], [])
+        self._check()
+        self.assertEqual(self.payload._base.resolve.call_count,
+                         dnfpayload.RESOLUTION_CACHE_SIZE + 2)
+
+    def _resolve(self):
+        """Resolve the current selection like dnf.Base.resolve."""
+        base = self.payload._base
+        include_list, exclude_list = self.payload._get_selections.return_value
+        base._goal = ("goal", tuple(include_list), tuple(exclude_list))
+        base._transaction = sorted(include_list)
+        base._comps_trans = ("comps", tuple(include_list))
+        return True
+
+    def _get_resolved_state(self):
+        """Get the resolved transaction of the base."""
+        base = self.payload._base
+        return base._goal, base._transaction, base._comps_trans
+
+    def restored_resolution_test(self):
+        """Test that the restored transaction matches a new resolution."""
+        self.payload._base.resolve.side_effect = self._resolve
+
+        # resolve two selections
+        self.payload.checkSoftwareSelection()
+        self.payload._get_selections.return_value = (["@core", "vim"], [])
+        self.payload.checkSoftwareSelection()
+
+        # restore the first selection
+        self.payload._get_selections.return_value = (["@core"], [])
+        self.payload.checkSoftwareSelection()
+        self.assertEqual(self.payload._base.resolve.call_count, 2)
+        restored = self._get_resolved_state()
+
+        # resolve the first selection again
+        self.payload._resolution_cache.clear()
+        self.payload.checkSoftwareSelection()
+        self.assertEqual(self.payload._base.resolve.call_count, 3)
+        self.assertEqual(restored, self._get_resolved_state())
+
+    def unsupported_resolution_cache_test(self):
+        """Test the resolution without the private attributes of dnf."""
+        base = Mock(spec=["reset", "resolve", "transaction", "repos", "conf"], transaction=[])
+        base.repos.iter_enabled.return_value = [Mock(id="fedora")]
+        self.payload._base = base
+
+        self.payload.checkSoftwareSelection()
+        self.payload.checkSoftwareSelection()
+        self.assertEqual(base.resolve.call_count, 2)
+        self.assertEqual(len(self.payload._resolution_cache), 0)
+
+    def failed_resolution_test(self):
+        """Test that failed resolutions are not reused."""
+        self.payload._base.resolve.side_effect = dnf.exceptions.DepsolveError("Failed!")
+
+        with self.assertRaises(DependencyError):
+            self._check()
+
+        self.assertEqual(len(self.payload._resolution_cache), 0)
+
+        # the selection with reported errors
+        self.payload._base.resolve.side_effect = None
+        self.payload._apply_selections.return_value = False
+        self._check()
+        self._check()
+        self.assertEqual(self.payload._base.resolve.call_count, 3)
+        self.assertEqual(len(self.payload._resolution_cache), 0)
+
+
+class LiveImageChecksumTestCase(unittest.TestCase):
+
+    def _check_checksum(self, checksum, name, digest):
+        checksum, expected_digest = get_image_checksum(checksum)
+        self.assertEqual(checksum.name, name)
+        self.assertEqual(expected_digest, digest)
+
+    def image_checksum_test(self):
+        """Test the parsing of the image checksum."""
+        sha256 = hashlib.sha256(b"image").hexdigest()
+        sha512 = hashlib.sha512(b"image").hexdigest()
+
+        self._check_checksum(sha256, "sha256", sha256)
+        self._check_checksum(sha256.upper(), "sha256", sha256)
+        self._check_checksum(sha512, "sha512", sha512)
+        self._check_checksum("sha512:" + sha512, "sha512", sha512)
+        self._check_checksum("SHA256:" + sha256, "sha256", sha256)
+        self._check_checksum("blake2b:abc", "blake2b", "abc")
+        self._check_checksum("blake2s:abc", "blake2s", "abc")
+
+        with self.assertRaises(PayloadInstallError):
+            get_image_checksum("md5:abc")
+
+
+class LiveImageTarballTestCase(unittest.TestCase):
+
+    def tar_compression_options_test(self):
+        """Test the compression options of tar."""
+        self.assertEqual(get_tar_compression_options("http://host/image.tar"), [])
+        self.assertEqual(get_tar_compression_options("http://host/image.tar.xz"), ["--xz"])
+        self.assertEqual(get_tar_compression_options("http://host/image.txz"), ["--xz"])
+        self.assertEqual(get_tar_compression_options("http://host/image.tar.gz"), ["--gzip"])
+        self.assertEqual(get_tar_compression_options("http://host/image.tgz"), ["--gzip"])
+        self.assertEqual(get_tar_compression_options("http://host/image.tar.bz2"), ["--bzip2"])
+        self.assertEqual(get_tar_compression_options("http://host/image.tbz"), ["--bzip2"])
+
+    @patch("pyanaconda.payload.livepayload.progressQ")
+    def pipe_image_test(self, progress_queue):
+        """Test the piping of the streamed image."""
+        response = Mock()
+        response.iter_content.return_value = [b"a" * 10, b"", b"b" * 10]
+        pipe = Mock()
+        checksum = hashlib.sha256()
+
+        bytes_read = LiveImageKSPayload._pipe_image(None, response, pipe, checksum, 20)
+
+        self.assertEqual(bytes_read, 20)
+        self.assertEqual(pipe.write.call_count, 2)
+        pipe.close.assert_called_once_with()
+        self.assertEqual(checksum.hexdigest(), hashlib.sha256(b"a" * 10 + b"b" * 10).hexdigest())
+        self.assertEqual(progress_queue.send_message.call_count, 2)
+
+    def pipe_image_broken_test(self):
+        """Test the piping of the streamed image to a broken pipe."""
+        response = Mock()
+        response.iter_content.return_value = [b"a" * 10, b"b" * 10]
+        pipe = Mock()
+        pipe.write.side_effect = BrokenPipeError()
+
+        bytes_read = LiveImageKSPayload._pipe_image(None, response, pipe, None, 0)
+
+        self.assertEqual(bytes_read, 0)
+        pipe.close.assert_called_once_with()
+
+
+    def _create_payload(self):
+        """Create a payload of a streamed tarball."""
+        payload = LiveImageKSPayload(Mock())
+        payload.data.method.url = "http://host/image.tar.xz"
+        payload.data.method.checksum = None
+        payload.data.method.proxy = None
+        payload._session = Mock()
+
+        response = payload._session.get.return_value
+        response.status_code = 200
+        response.headers = {"content-length": "100"}
+        return payload
+
+    @patch("pyanaconda.payload.livepayload.conf")
+    def streamed_space_test(self, conf):
+        """Test the space required by the streamed tarball."""
+        payload = self._create_payload()
+
+        conf.payload.stream_live_image_tarball = True
+        self.assertIsNone(payload._setup_url_image())
+        self.assertEqual(payload.spaceRequired, Size(300))
+
+        conf.payload.stream_live_image_tarball = False
+        self.assertIsNone(payload._setup_url_image())
+        self.assertEqual(payload.spaceRequired, Size(400))
+
+    @patch("pyanaconda.payload.livepayload.util")
+    def streamed_extraction_test(self, util):
+        """Test the extraction of the streamed tarball."""
+        payload = self._create_payload()
+        response = payload._session.get.return_value
+        response.iter_content.return_value = [b"a" * 10]
+
+        proc = util.startProgram.return_value
+        proc.wait.return_value = 0
+        proc.poll.return_value = 0
+
+        payload._install_streamed_tarfile()
+
+        proc.stdin.close.assert_called_with()
+        proc.terminate.assert_not_called()
+
+    @patch("pyanaconda.payload.livepayload.errorHandler")
+    @patch("pyanaconda.payload.livepayload.util")
+    def streamed_extraction_failed_test(self, util, error_handler):
+        """Test the extraction of the streamed tarball with a failed download."""
+        payload = self._create_payload()
+        response = payload._session.get.return_value
+        response.iter_content.side_effect = RequestException("Fake error!")
+        error_handler.cb.return_value = ERROR_RAISE
+
+        proc = util.startProgram.return_value
+        proc.poll.return_value = None
+
+        with self.assertRaises(PayloadInstallError):
+            payload._install_streamed_tarfile()
+
+        # Tar doesn't keep running.
+        proc.stdin.close.assert_called_with()
+        proc.terminate.assert_called_once_with()
+        proc.wait.assert_called_once_with()
+
+
+class InitrdBuilderTestCase(unittest.TestCase):
+
+    @patch("pyanaconda.payload.initrd_builder.progress_message")
+    @patch("pyanaconda.payload.initrd_builder.program_log")
+    @patch("pyanaconda.payload.initrd_builder.util")
+    def run_test(self, util_mock, program_log, progress_message):
+        """Test the initrd builder."""
+        def execute(command, argv, stdout, **kwargs):
+            stdout.write("{} output\n".format(command))
+            return 1 if argv[-1] == "2.0" and command == "depmod" else 0
+
+        util_mock.execWithRedirect.side_effect = execute
+        builder = InitrdBuilder("Generating initramfs for %s", max_workers=2)
+
+        for kernel in ("1.0", "2.0", "3.0"):
+            builder.add_job(kernel, [("depmod", ["-a", kernel]), ("dracut", [kernel])])
+
+        self.assertEqual(builder.run(), {"1.0": 0, "2.0": 1, "3.0": 0})
+        self.assertEqual(util_mock.execWithRedirect.call_count, 6)
+        self.assertEqual(progress_message.call_count, 3)
+        progress_message.assert_any_call("Generating initramfs for 2.0")
+
+        # The output of every job is logged at once.
+        lines = [c[0][0] % c[0][1:] for c in program_log.info.call_args_list]
+        for kernel in ("1.0", "2.0", "3.0"):
+            start = lines.index("Output of the initrd job for {}:".format(kernel))
+            self.assertEqual(lines[start + 1:start + 5], [
+                "$ depmod -a {}".format(kernel),
+                "depmod output",
+                "$ dracut {}".format(kernel),
+                "dracut output"
+            ])
+
+        # The jobs are removed.
+        self.assertEqual(builder.run(), {})
+
+
 class PayloadRequirementsTestCase(unittest.TestCase):
 
     def requirements_test(self):
@@ -0,0 +1,133 @@
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import queue
+import unittest
+from mock import Mock, patch
+
+from pyanaconda.core.progress_channel import ProgressChannel
+from pyanaconda.queuefactory import QueueFactory
+
+
+class ProgressChannelTestCase(unittest.TestCase):
+    """Test the progress channel."""
+
+    def rate_test(self):
+        """Test the rate of the channel."""
+        self.assertEqual(ProgressChannel(Mock(), rate=0).interval, 0)
+        self.assertEqual(ProgressChannel(Mock(), rate=4).interval, 0.25)
+
+    @patch("pyanaconda.core.progress_channel.threadMgr")
+    def main_thread_test(self, thread_manager):
+        """Test the reports from the main thread."""
+        thread_manager.in_main_thread.return_value = True
+        callback = Mock()
+        channel = ProgressChannel(callback, rate=1)
+
+        channel.send(1, "A")
+        callback.assert_called_once_with(1, "A")
+        callback.reset_mock()
+
+        channel.send(2, "B")
+        callback.assert_called_once_with(2, "B")
+
+    @patch("pyanaconda.core.progress_channel.Timer")
+    @patch("pyanaconda.core.progress_channel.threadMgr")
+    def other_thread_test(self, thread_manager, timer_cls):
+        """Test the reports from other threads."""
+        thread_manager.in_main_thread.return_value = False
+        callback = Mock()
+        channel = ProgressChannel(callback, rate=1)
+        timer = timer_cls.return_value
+
+        # The first delivery is scheduled immediately.
+        channel.send(1, "A")
+        channel.send(2, "B")
+        timer.timeout_now.assert_called_once_with(channel._scheduled_flush)
+        callback.assert_not_called()
+
+        # Only the latest state is delivered.
+        self.assertFalse(channel._scheduled_flush())
+        callback.assert_called_once_with(2, "B")
+        callback.reset_mock()
+
+        # The next delivery is delayed.
+        channel.send(3, "C")
+        channel.send(4, "D")
+        self.assertEqual(timer.timeout_msec.call_count, 1)
+        delay, flush = timer.timeout_msec.call_args[0]
+        self.assertTrue(0 < delay <= 1000)
+        self.assertEqual(flush, channel._scheduled_flush)
+
+        # The final state is never dropped.
+        channel.flush()
+        callback.assert_called_once_with(4, "D")
+        callback.reset_mock()
+
+        self.assertFalse(channel._scheduled_flush())
+        callback.assert_not_called()
+
+    def no_main_loop_test(self):
+        """Test the channel without the main loop."""
+        callback = Mock()
+        channel = ProgressChannel(callback, rate=1, main_loop=False)
+
+        channel.send("A")
+        callback.assert_called_once_with("A")
+        callback.reset_mock()
+
+        channel.send("B")
+        channel.send("C")
+        callback.assert_not_called()
+
+        channel.flush()
+        callback.assert_called_once_with("C")
+        callback.reset_mock()
+
+        channel.flush()
+        callback.assert_not_called()
+
+    @patch("pyanaconda.core.progress_channel.conf")
+    def queue_test(self, conf):
+        """Test the merged messages of a queue."""
+        conf.anaconda.progress_rate = 1
+
+        q = QueueFactory("test")
+        q.addMessage("step", 0)
+        q.addMessage("message", 1, coalesce=True)
+
+        q.send_message("A")
+        q.send_message("B")
+        q.send_message("C")
+        q.send_step()
+        q.send_message("D")
+        q.send_message("E")
+        q.flush()
+
+        messages = []
+        while True:
+            try:
+                messages.append(q.q.get(False))
+            except queue.Empty:
+                break
+
+        self.assertEqual(messages, [
+            (q.TEST_CODE_MESSAGE, ("A",)),
+            (q.TEST_CODE_MESSAGE, ("C",)),
+            (q.TEST_CODE_STEP, ()),
+            (q.TEST_CODE_MESSAGE, ("E",)),
+        ])
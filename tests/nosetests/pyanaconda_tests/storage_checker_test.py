@@ -20,7 +20,9 @@
 #
 
 import unittest
-from pyanaconda.storage.checker import StorageChecker
+from unittest.mock import Mock
+
+from pyanaconda.storage.checker import StorageChecker, depends_on
 
 
 class StorageCheckerTests(unittest.TestCase):
@@ -228,6 +230,115 @@ class StorageCheckerTests(unittest.TestCase):
         self.assertListEqual(report.errors, [])
         self.assertListEqual(report.warnings, [])
 
+    def incremental_test(self):
+        """Run an incremental check."""
+        checker = StorageChecker()
+        calls = []
+
+        @depends_on("size")
+        def size_check(storage, constraints, report_error, report_warning):
+            calls.append("size_check")
+            for device in storage.devices:
+                if device.size < constraints["min"]:
+                    report_warning("%s is too small" % device.name)
+
+        @depends_on("format.mountpoint")
+        def mount_check(storage, constraints, report_error, report_warning):
+            calls.append("mount_check")
+
+        def system_check(storage, constraints, report_error, report_warning):
+            calls.append("system_check")
+
+        checker.add_check(size_check)
+        checker.add_check(mount_check)
+        checker.add_check(system_check)
+        checker.add_new_constraint("min", 2)
+
+        device = Mock(id=1, size=1, format=Mock(mountpoint="/"))
+        device.name = "a"
+        storage = Mock(devices=[device])
+
+        # Run all checks.
+        report = checker.check(storage, incremental=True)
+        self.assertEqual(calls, ["size_check", "mount_check", "system_check"])
+        self.assertEqual(report.warnings, ["a is too small"])
+        self.assertEqual(list(report.timing), ["size_check", "mount_check", "system_check"])
+
+        # Reuse the results of the declared checks.
+        calls.clear()
+        report = checker.check(storage, incremental=True)
+        self.assertEqual(calls, ["system_check"])
+        self.assertEqual(report.warnings, ["a is too small"])
+        self.assertIn("Reused sanity check size_check.", report.info)
+
+        # Run only the affected checks.
+        calls.clear()
+        device.size = 3
+        report = checker.check(storage, incremental=True)
+        self.assertEqual(calls, ["size_check", "system_check"])
+        self.assertEqual(report.warnings, [])
+
+        # Run the checks with changed constraints.
+        calls.clear()
+        checker.add_constraint("min", 4)
+        report = checker.check(storage, incremental=True)
+        self.assertEqual(calls, ["size_check", "mount_check", "system_check"])
+        self.assertEqual(report.warnings, ["a is too small"])
+
+        # Run the checks with a new device.
+        calls.clear()
+        other = Mock(id=2, size=5, format=Mock(mountpoint="/home"))
+        other.name = "b"
+        storage.devices.append(other)
+        checker.check(storage, incremental=True)
+        self.assertEqual(calls, ["size_check", "mount_check", "system_check"])
+
+        # Run all checks in the default mode.
+        calls.clear()
+        checker.check(storage)
+        self.assertEqual(calls, ["size_check", "mount_check", "system_check"])
+
+        # Forget the results.
+        calls.clear()
+        checker.reset_results()
+        checker.check(storage, incremental=True)
+        self.assertEqual(calls, ["size_check", "mount_check", "system_check"])
+
+    def parallel_test(self):
+        """Run checks concurrently."""
+        checker = StorageChecker()
+
+        def error_check(storage, constraints, report_error, report_warning):
+            report_error("error 1")
+            report_warning("warning")
+            report_error("error 2")
+
+        def warning_check(storage, constraints, report_error, report_warning):
+            report_warning("warning")
+
+        def skipped_check(storage, constraints, report_error, report_warning):
+            report_warning("skipped")
+
+        checker.add_check(error_check)
+        checker.add_check(skipped_check)
+        checker.add_check(warning_check)
+
+        report = checker.check(None, skip=(skipped_check,), parallel=True)
+        self.assertListEqual(report.errors, ["error 1", "error 2"])
+        self.assertListEqual(report.warnings, ["warning", "warning"])
+        self.assertListEqual(report.info, [
+            "Storage check started with constraints {}.",
+            "Run sanity check error_check.",
+            "Found sanity error: error 1",
+            "Found sanity warning: warning",
+            "Found sanity error: error 2",
+            "Skipped sanity check skipped_check.",
+            "Run sanity check warning_check.",
+            "Found sanity warning: warning",
+            "Storage check finished with failure(s)."
+        ])
+        self.assertEqual(list(report.timing), ["error_check", "warning_check"])
+
     def default_settings_test(self):
         """Check the default storage checker."""
         checker = StorageChecker()
@@ -0,0 +1,48 @@
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import unittest
+from unittest.mock import Mock
+
+from pyanaconda.storage.snapshot import StorageSnapshot
+
+
+class StorageSnapshotTestCase(unittest.TestCase):
+
+    def reset_to_snapshot_test(self):
+        """Test the reset to the snapshot."""
+        storage = Mock()
+        snapshot = StorageSnapshot(storage)
+        snapshot_storage = storage.copy.return_value
+        self.assertTrue(snapshot.created)
+
+        # Reset to a copy of the snapshot.
+        snapshot.reset_to_snapshot(storage)
+        snapshot_storage.copy.assert_called_once_with()
+        self.assertEqual(storage.devicetree, snapshot_storage.copy.return_value.devicetree)
+        self.assertTrue(snapshot.created)
+
+        # Reset to the disposed snapshot.
+        snapshot.reset_to_snapshot(storage, dispose=True)
+        snapshot_storage.copy.assert_called_once_with()
+        self.assertEqual(storage.devicetree, snapshot_storage.devicetree)
+        self.assertEqual(storage.roots, snapshot_storage.roots)
+        self.assertEqual(storage.fsset, snapshot_storage.fsset)
+        self.assertFalse(snapshot.created)
+
+        with self.assertRaises(ValueError):
+            snapshot.reset_to_snapshot(storage)
@@ -0,0 +1,127 @@
+#
+# Copyright (C) 2019  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+import json
+import os
+import tempfile
+import unittest
+
+from pyanaconda.core.timing import TimingTrace, CATEGORY_TASK, CATEGORY_COMMAND, \
+    CATEGORY_QUEUE
+from pyanaconda.installation_tasks import Task, TaskQueue
+
+
+class TimingTraceTestCase(unittest.TestCase):
+
+    def _create_trace(self):
+        trace = TimingTrace()
+        trace.record("queue", CATEGORY_QUEUE, 0.0, 10.0)
+        trace.record("a", CATEGORY_TASK, 0.0, 2.0)
+        trace.record("b", CATEGORY_TASK, 2.0, 9.0)
+        trace.record("c", CATEGORY_TASK, 2.0, 4.0)
+        trace.record("d", CATEGORY_TASK, 9.0, 10.0)
+        trace.record("dracut", CATEGORY_COMMAND, 3.0, 8.0, {"argv": "dracut -f"})
+        return trace
+
+    def critical_path_test(self):
+        """Test the critical path."""
+        trace = self._create_trace()
+        path = [e.name for e in trace.critical_path()]
+        self.assertEqual(path, ["a", "b", "d"])
+        self.assertEqual(TimingTrace().critical_path(), [])
+
+    def slowest_test(self):
+        """Test the slowest steps."""
+        trace = self._create_trace()
+        slowest = [e.name for e in trace.slowest(3)]
+        self.assertEqual(slowest, ["b", "dracut", "a"])
+
+    def summary_test(self):
+        """Test the summary."""
+        summary = self._create_trace().summary(count=1)
+        self.assertIn("Critical path (10.0 s):", summary)
+        self.assertIn("7.0 s  task: b", summary)
+        self.assertIn("Slowest steps:", summary)
+        self.assertNotIn("command: dracut", summary)
+
+    def chrome_trace_test(self):
+        """Test the Chrome trace event format."""
+        trace = self._create_trace()
+        data = trace.to_chrome_trace()
+        events = [e for e in data["traceEvents"] if e["ph"] == "X"]
+        metadata = [e for e in data["traceEvents"] if e["ph"] == "M"]
+
+        self.assertEqual(len(events), 6)
+        self.assertEqual(len(metadata), 1)
+
+        dracut = [e for e in events if e["name"] == "dracut"][0]
+        self.assertEqual(dracut["cat"], CATEGORY_COMMAND)
+        self.assertEqual(dracut["ts"], 3000000)
+        self.assertEqual(dracut["dur"], 5000000)
+        self.assertEqual(dracut["args"], {"argv": "dracut -f"})
+
+    def save_test(self):
+        """Test the saving of the trace."""
+        trace = self._create_trace()
+
+        with tempfile.TemporaryDirectory() as d:
+            paths = trace.save(os.path.join(d, "timing"))
+            self.assertEqual(paths, [os.path.join(d, "timing.json"),
+                                     os.path.join(d, "timing.trace.json")])
+
+            with open(paths[0]) as f:
+                data = json.load(f)
+
+            self.assertEqual([e["name"] for e in data], ["queue", "a", "b", "c", "dracut", "d"])
+            self.assertEqual(data[2]["duration"], 7.0)
+
+            with open(paths[1]) as f:
+                self.assertIn("traceEvents", json.load(f))
+
+    def max_events_test(self):
+        """Test the maximal number of events."""
+        trace = TimingTrace(max_events=3)
+
+        for i in range(5):
+            trace.record(str(i), CATEGORY_TASK, float(i), float(i + 1))
+
+        self.assertEqual([e.name for e in trace.events], ["2", "3", "4"])
+
+        trace.clear()
+        self.assertEqual(trace.events, [])
+
+    def watch_task_queue_test(self):
+        """Test the timing of a task queue."""
+        trace = TimingTrace()
+
+        group = TaskQueue("group")
+        group.append(Task("task 1", lambda: None))
+        group.append(Task("task 2", lambda: None))
+        queue = TaskQueue("queue")
+        queue.append(group)
+
+        trace.watch_task_queue(queue)
+        queue.start()
+
+        events = [(e.name, e.category) for e in trace.events]
+        self.assertEqual(events, [
+            ("queue", CATEGORY_QUEUE),
+            ("group", CATEGORY_QUEUE),
+            ("task 1", CATEGORY_TASK),
+            ("task 2", CATEGORY_TASK),
+        ])
+        self.assertEqual([e.name for e in trace.critical_path()], ["task 1", "task 2"])